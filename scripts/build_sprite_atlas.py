@@ -0,0 +1,32 @@
+"""
+Packs the .npy sprites of every game into one memory-mappable atlas file per game
+(src/jaxatari/games/sprites/<game>/sprites.atlas), which jr.loadFrame reads from.
+Run it again after adding or editing sprites.
+
+Usage: python scripts/build_sprite_atlas.py [game ...]
+"""
+import argparse
+import os
+
+from jaxatari.rendering.sprite_atlas import build_atlas, SpriteAtlas
+
+SPRITES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "jaxatari", "games", "sprites")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the packed sprite atlas of each game.")
+    parser.add_argument("games", nargs="*", help="Games to build, all games with a sprite directory by default.")
+    parser.add_argument("--sprites-dir", default=SPRITES_DIR, help="Directory containing one sprite directory per game.")
+    args = parser.parse_args()
+
+    games = args.games or sorted(
+        d for d in os.listdir(args.sprites_dir) if os.path.isdir(os.path.join(args.sprites_dir, d))
+    )
+    for game in games:
+        path = build_atlas(os.path.join(args.sprites_dir, game))
+        num_sprites = len(SpriteAtlas(path).index)
+        print(f"{game}: {num_sprites} sprites, {os.path.getsize(path) / 1024:.1f} KiB -> {os.path.relpath(path)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ import sys
 
 from typing import Tuple
 
+from jaxatari.core import list_available_mods, load_mod
 from jaxatari.environment import JaxEnvironment, JAXAtariAction as Action
 from jaxatari.wrappers import JaxatariWrapper
 from jaxatari.renderers import JAXGameRenderer
@@ -190,47 +191,12 @@ def load_game_environment(game: str) -> Tuple[JaxEnvironment, JAXGameRenderer]:
 
 def load_game_mod(game: str, mod: str) -> JaxEnvironment:
     """
-    Dynamically loads a game mod from a .py file.
-    It looks for a class that inherits from JaxEnvironment.
+    Loads a game mod registered in jaxatari (built in or added by a plugin through the "jaxatari.mods" entry points).
+    The mod name is matched case-insensitively and the mod class (a JaxatariWrapper) is returned.
     """
-    # Get the project root directory (parent of scripts directory)
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(script_dir)
-    mod_file_path = os.path.join(project_root, "src", "jaxatari", "games", "mods", f"{game.lower()}_mods.py")
-    
-    if not os.path.exists(mod_file_path):
-        raise FileNotFoundError(f"Mod file not found: {mod_file_path}")
-
-    module_name = os.path.splitext(os.path.basename(mod_file_path))[0]
-
-    # Add the directory of the mod file to sys.path to handle relative imports within the mod file
-    mod_dir = os.path.dirname(os.path.abspath(mod_file_path))
-    if mod_dir not in sys.path:
-        sys.path.insert(0, mod_dir)
-
-    spec = importlib.util.spec_from_file_location(module_name, mod_file_path)
-    if spec is None:
-        raise ImportError(f"Could not load spec for module {module_name} from {mod_file_path}")
-
-    mod_module = importlib.util.module_from_spec(spec)
-    try:
-        spec.loader.exec_module(mod_module)
-    except Exception as e:
-        if mod_dir in sys.path and sys.path[0] == mod_dir:  # Clean up sys.path if we added to it
-            sys.path.pop(0)
-        raise ImportError(f"Could not execute module {module_name}: {e}")
-
-    if mod_dir in sys.path and sys.path[0] == mod_dir:  # Clean up sys.path if we added to it
-        sys.path.pop(0)
-
-    # Find the class that inherits from JaxatariWrapper
-    for name, obj in inspect.getmembers(mod_module):
-        if inspect.isclass(obj) and issubclass(obj, JaxatariWrapper) and obj is not JaxatariWrapper:
-            if name.lower() != mod.lower():
-                continue
+    for name in list_available_mods(game.lower()):
+        if name.lower() == mod.lower():
             print(f"Found game mod: {name}")
-            return obj  # return the mod class
-
-    raise ImportError(f"No class found in {mod_file_path} that inherits from JaxatariWrapper")
-
+            return load_mod(game.lower(), name)
 
+    raise ImportError(f"No mod '{mod}' registered for {game}, available mods: {list_available_mods(game.lower())}")
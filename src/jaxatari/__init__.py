@@ -1 +1 @@
-from jaxatari.core import make, list_available_games
\ No newline at end of file
+from jaxatari.core import make, list_available_games, clear_cache, register_game
\ No newline at end of file
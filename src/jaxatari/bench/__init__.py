@@ -0,0 +1 @@
+"""Benchmarks of jaxatari, each module can be run as a script and writes its results as JSON."""
@@ -0,0 +1,225 @@
+"""
+HLO size report: how large the compiled programs of each game's `step` and `render` are.
+
+Every function is lowered with the state after reset and compiled, then the report counts:
+
+    instructions          instructions of the optimized HLO module, fused computations included
+    conditionals          `conditional` ops left after optimization (`lax.cond`/`lax.switch`)
+    lowered_conditionals  conditionals in the program as traced, before XLA turned some into selects
+    while_loops           `while` ops after optimization (`lax.scan`/`lax.fori_loop`/`lax.while_loop`)
+    fusions               fusion instructions, roughly the number of kernels launched per call
+    flops                 floating point operations XLA estimates for one call
+    bytes_accessed        bytes XLA estimates one call reads and writes
+
+With --batch-size, the functions are lowered under `jax.vmap`, where the conditionals whose predicate is
+batched become selects that evaluate every branch.
+
+`check` compares a report with a stored baseline and fails for every metric that grew by more than the
+tolerance. The counts depend on the JAX version and the backend, so a baseline of another environment
+is not compared. --update writes the report without the compile times, which depend on the machine.
+
+Usage:
+    python -m jaxatari.bench.hlo [games ...] [--batch-size N] [--output report.json]
+    python -m jaxatari.bench.hlo --check tests/hlo_baseline.json [--tolerance 0.05]
+    python -m jaxatari.bench.hlo --update tests/hlo_baseline.json
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from typing import Dict, List, Optional, Sequence
+
+import jax
+import jax.numpy as jnp
+
+import jaxatari
+
+FUNCTIONS = ("step", "render")
+METRICS = (
+    "instructions",
+    "conditionals",
+    "lowered_conditionals",
+    "while_loops",
+    "fusions",
+    "flops",
+    "bytes_accessed",
+)
+
+# an instruction of the HLO text format: "[ROOT] %name = <shape> <opcode>(<operands>), <attributes>"
+_INSTRUCTION = re.compile(r"^\s*(?:ROOT\s+)?%?[\w.\-]+ = .*?\b([a-z][\w\-]*)\(")
+_LOWERED_CONDITIONAL = re.compile(r"\bstablehlo\.(?:case|if)\b")
+
+
+def _count_hlo(hlo_text: str) -> Dict[str, int]:
+    counts = {"instructions": 0, "conditionals": 0, "while_loops": 0, "fusions": 0}
+    for line in hlo_text.splitlines():
+        match = _INSTRUCTION.match(line)
+        if match is None:
+            continue
+        counts["instructions"] += 1
+        opcode = match.group(1)
+        if opcode == "conditional":
+            counts["conditionals"] += 1
+        elif opcode == "while":
+            counts["while_loops"] += 1
+        elif opcode == "fusion":
+            counts["fusions"] += 1
+    return counts
+
+
+def _cost(compiled) -> Dict[str, Optional[float]]:
+    cost = compiled.cost_analysis()
+    # older JAX versions return one dict per device
+    if isinstance(cost, (list, tuple)):
+        cost = cost[0] if cost else None
+    if not cost:
+        return {"flops": None, "bytes_accessed": None}
+    return {"flops": cost.get("flops"), "bytes_accessed": cost.get("bytes accessed")}
+
+
+def analyze(fn, *args) -> Dict[str, Optional[float]]:
+    """
+    Lowers and compiles fn for args and measures the resulting program.
+    Returns: The METRICS of the program and the seconds compiling took.
+    """
+    lowered = jax.jit(fn).lower(*args)
+    start = time.perf_counter()
+    compiled = lowered.compile()
+    compile_seconds = time.perf_counter() - start
+
+    metrics = _count_hlo(compiled.as_text())
+    metrics["lowered_conditionals"] = len(_LOWERED_CONDITIONAL.findall(lowered.as_text()))
+    metrics.update(_cost(compiled))
+    metrics = {metric: metrics[metric] for metric in METRICS}
+    metrics["compile_seconds"] = compile_seconds
+    return metrics
+
+
+def analyze_game(game_name: str, batch_size: Optional[int] = None) -> Dict[str, Dict[str, Optional[float]]]:
+    """
+    Measures the compiled `step` and `render` of one game.
+    Args:
+        game_name: The registered name of the game.
+        batch_size: If given, the functions are lowered under `jax.vmap` for this many environments.
+    Returns: The metrics of every function in FUNCTIONS.
+    """
+    env = jaxatari.make(game_name)
+    step, render = env.step, env.render
+    key = jax.random.PRNGKey(0)
+    action = jnp.array(0, dtype=jnp.int32)
+    if batch_size is None:
+        _, state = env.reset(key)
+    else:
+        step, render = jax.vmap(step), jax.vmap(render)
+        _, state = jax.vmap(env.reset)(jax.random.split(key, batch_size))
+        action = jnp.zeros((batch_size,), dtype=jnp.int32)
+    return {"step": analyze(step, state, action), "render": analyze(render, state)}
+
+
+def run_hlo_report(games: Optional[Sequence[str]] = None, batch_size: Optional[int] = None) -> dict:
+    """
+    Measures the compiled programs of several games.
+    Args:
+        games: The games to measure, all registered games by default.
+        batch_size: If given, the functions are lowered under `jax.vmap` for this many environments.
+    Returns: A JSON-serializable dict with the environment the report was made in and, per game and
+        function, the METRICS and the compile time.
+    """
+    games = list(games) if games else jaxatari.list_available_games()
+    return {
+        "benchmark": "hlo",
+        "jax": jax.__version__,
+        "backend": jax.default_backend(),
+        "batch_size": batch_size,
+        "games": {game_name: analyze_game(game_name, batch_size) for game_name in games},
+    }
+
+
+def check(report: dict, baseline: dict, tolerance: float = 0.05) -> List[str]:
+    """
+    Compares a report with a baseline report.
+    Args:
+        report: The result of run_hlo_report.
+        baseline: An earlier result of run_hlo_report.
+        tolerance: The relative growth of a metric that is still accepted.
+    Returns: A message for every metric that grew past baseline * (1 + tolerance), empty if none did.
+        Games and functions missing from the baseline are not checked.
+    Raises:
+        ValueError: If the baseline was made with another JAX version, backend or batch size.
+    """
+    for field in ("jax", "backend", "batch_size"):
+        if report.get(field) != baseline.get(field):
+            raise ValueError(
+                f"The baseline was made with {field}={baseline.get(field)!r}, the report with "
+                f"{field}={report.get(field)!r}. Their HLO is not comparable, update the baseline instead."
+            )
+
+    failures = []
+    for game_name, functions in report["games"].items():
+        for function, metrics in functions.items():
+            expected = baseline["games"].get(game_name, {}).get(function)
+            if expected is None:
+                continue
+            for metric in METRICS:
+                value, limit = metrics.get(metric), expected.get(metric)
+                if value is None or limit is None:
+                    continue
+                if value > limit * (1 + tolerance):
+                    failures.append(f"{game_name}.{function}: {metric} grew from {limit:g} to {value:g}")
+    return failures
+
+
+def _format_value(value) -> str:
+    if value is None:
+        return "-"
+    return str(value) if isinstance(value, int) else f"{value:.4g}"
+
+
+def format_table(report: dict) -> str:
+    """Formats the results of run_hlo_report as a table."""
+    width = max([len("game")] + [len(game) for game in report["games"]])
+    columns = METRICS + ("compile_seconds",)
+    lines = [" ".join(["game".ljust(width), "function".ljust(8)] + [column.rjust(12) for column in columns])]
+    for game_name, functions in report["games"].items():
+        for function, metrics in functions.items():
+            cells = [_format_value(metrics[column]).rjust(12) for column in columns]
+            lines.append(" ".join([game_name.ljust(width), function.ljust(8)] + cells))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description="Report the size of the compiled step and render of jaxatari games.")
+    parser.add_argument("games", nargs="*", help="Games to measure, all registered games by default.")
+    parser.add_argument("--batch-size", type=int, default=None, help="Lower the functions under jax.vmap.")
+    parser.add_argument("--output", "-o", help="Write the report as JSON to this file.")
+    parser.add_argument("--check", metavar="BASELINE", help="Exit with an error if a metric grew past this baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.05, help="Relative growth --check accepts.")
+    parser.add_argument("--update", metavar="BASELINE", help="Write the report as the new baseline to this file.")
+    args = parser.parse_args(argv)
+
+    report = run_hlo_report(args.games, args.batch_size)
+    print(format_table(report))
+    # compile times depend on the machine, the baseline only keeps the metrics check compares
+    baseline = {**report, "games": {
+        game_name: {function: {metric: metrics[metric] for metric in METRICS} for function, metrics in functions.items()}
+        for game_name, functions in report["games"].items()
+    }}
+    for path, content in ((args.output, report), (args.update, baseline)):
+        if path:
+            with open(path, "w") as f:
+                json.dump(content, f, indent=2)
+                f.write("\n")
+    if args.check:
+        with open(args.check) as f:
+            failures = check(report, json.load(f), args.tolerance)
+        if failures:
+            print("\n".join(["HLO grew past the baseline:"] + failures), file=sys.stderr)
+            sys.exit(1)
+        print(f"No metric grew past {args.check} by more than {args.tolerance:.0%}.")
+    return report
+
+
+if __name__ == "__main__":
+    main()
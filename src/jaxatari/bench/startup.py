@@ -0,0 +1,165 @@
+"""
+Startup benchmark: how long it takes from a fresh interpreter to the first frame of each game.
+
+Every game is measured in its own Python process, so each phase is cold:
+
+    import_jax      `import jax`
+    import_jaxatari `import jaxatari`, the registry only, no game module
+    import_game     importing the module of the game
+    make            `jaxatari.make(game)`, constructing the environment
+    first_reset     the first `env.reset(key)`, tracing and compiling included
+    first_step      the first `env.step(state, action)`, tracing and compiling included
+    second_step     the second step, which compiles again if step returns a state of other dtypes
+                    (e.g. without weak types) than reset did
+    first_render    the first `env.render(state)`, sprite I/O, tracing and compiling included
+
+Usage:
+    python -m jaxatari.bench.startup [games ...] [--repeat N] [--output results.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional, Sequence
+
+PHASES = (
+    "import_jax",
+    "import_jaxatari",
+    "import_game",
+    "make",
+    "first_reset",
+    "first_step",
+    "second_step",
+    "first_render",
+)
+
+# Runs in a fresh interpreter, it must not import anything before it starts timing
+_CHILD_SCRIPT = """
+import json, sys, time
+times = {}
+start = time.perf_counter()
+import jax
+times["import_jax"] = time.perf_counter() - start
+
+start = time.perf_counter()
+import jaxatari
+from jaxatari.core import get_env_class
+times["import_jaxatari"] = time.perf_counter() - start
+
+game = sys.argv[1]
+start = time.perf_counter()
+get_env_class(game)
+times["import_game"] = time.perf_counter() - start
+
+start = time.perf_counter()
+env = jaxatari.make(game)
+times["make"] = time.perf_counter() - start
+
+start = time.perf_counter()
+obs, state = jax.block_until_ready(env.reset(jax.random.PRNGKey(0)))
+times["first_reset"] = time.perf_counter() - start
+
+action = jax.numpy.array(0, dtype=jax.numpy.int32)
+start = time.perf_counter()
+obs, state, *_ = jax.block_until_ready(env.step(state, action))
+times["first_step"] = time.perf_counter() - start
+
+start = time.perf_counter()
+obs, state, *_ = jax.block_until_ready(env.step(state, action))
+times["second_step"] = time.perf_counter() - start
+
+start = time.perf_counter()
+jax.block_until_ready(env.render(state))
+times["first_render"] = time.perf_counter() - start
+
+print(json.dumps(times))
+"""
+
+
+def measure_game(game_name: str, env: Optional[Dict[str, str]] = None) -> Dict[str, float]:
+    """
+    Measures the startup phases of one game in a fresh Python process.
+    Args:
+        game_name: The registered name of the game.
+        env: Environment variables of the process, e.g. to select the JAX platform, os.environ by default.
+    Returns: The seconds every phase in PHASES took.
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", _CHILD_SCRIPT, game_name],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Startup benchmark of '{game_name}' failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run_startup_benchmark(
+    games: Optional[Sequence[str]] = None,
+    repeat: int = 1,
+    env: Optional[Dict[str, str]] = None,
+) -> dict:
+    """
+    Measures the startup phases of several games.
+    Args:
+        games: The games to measure, all registered games by default.
+        repeat: How many fresh processes to measure per game, the reported times are the medians.
+        env: Environment variables of the measured processes, os.environ by default.
+    Returns: A JSON-serializable dict with the environment the benchmark ran in and, per game,
+        the median seconds of every phase and their total.
+    """
+    import jax
+    import jaxatari
+
+    games = list(games) if games else jaxatari.list_available_games()
+    results = {}
+    for game_name in games:
+        runs: List[Dict[str, float]] = [measure_game(game_name, env) for _ in range(repeat)]
+        phases = {phase: statistics.median(run[phase] for run in runs) for phase in PHASES}
+        phases["total"] = sum(phases.values())
+        results[game_name] = phases
+
+    return {
+        "benchmark": "startup",
+        "python": platform.python_version(),
+        "jax": jax.__version__,
+        "backend": (env or os.environ).get("JAX_PLATFORMS") or jax.default_backend(),
+        "repeat": repeat,
+        "games": results,
+    }
+
+
+def format_table(results: dict) -> str:
+    """Formats the results of run_startup_benchmark as a table of milliseconds."""
+    columns = PHASES + ("total",)
+    width = max([len("game")] + [len(game) for game in results["games"]])
+    lines = [" ".join(["game".ljust(width)] + [column.rjust(max(len(column), 9)) for column in columns])]
+    for game_name, phases in results["games"].items():
+        cells = [f"{phases[column] * 1000:.1f}".rjust(max(len(column), 9)) for column in columns]
+        lines.append(" ".join([game_name.ljust(width)] + cells))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description="Measure the startup time of jaxatari games (in ms).")
+    parser.add_argument("games", nargs="*", help="Games to measure, all registered games by default.")
+    parser.add_argument("--repeat", type=int, default=1, help="Fresh processes per game, the median is reported.")
+    parser.add_argument("--output", "-o", help="Write the results as JSON to this file.")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON instead of a table.")
+    args = parser.parse_args(argv)
+
+    results = run_startup_benchmark(args.games, args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    print(json.dumps(results, indent=2) if args.json else format_table(results))
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""
+Steady-state throughput benchmark: environment steps per second of each game for a range of
+batch sizes and wrapper stacks, with and without rendering.
+
+Every configuration vectorizes the stack with `VecEnv` and runs num_steps steps of uniformly
+random actions in one jitted `lax.scan`. The last observations, rewards and rendered frames are
+carried through the loop and returned, so XLA cannot drop any part of the step. Compilation is timed separately and excluded from
+the steps per second.
+
+Stacks:
+    raw             the game itself
+    atari           AtariWrapper
+    object_centric  ObjectCentricWrapper(AtariWrapper)
+    pixel           PixelObsWrapper(AtariWrapper), always renders
+    log             LogWrapper(ObjectCentricWrapper(AtariWrapper))
+
+With render, the state of the game is additionally rendered after every step.
+steps_per_second counts agent steps, frames_per_second the emulated frames (steps times frame skip).
+memory_bytes is the argument, output and temporary memory of the compiled loop. process_peak_bytes is
+the peak memory the device reports since the process started (None on CPU). It is cumulative, so a row
+shows its own peak only if it was measured first or needs more memory than every row before it.
+
+Usage:
+    python -m jaxatari.bench.throughput [games ...] [--stacks raw atari] [--batch-sizes 1 64 1024]
+        [--render both|on|off] [--output results.json] [--csv results.csv]
+"""
+
+import argparse
+import csv
+import json
+import platform
+import statistics
+import time
+from functools import partial
+from typing import Callable, Dict, List, Optional, Sequence
+
+import jax
+import jax.numpy as jnp
+
+import jaxatari
+from jaxatari.wrappers import (
+    AtariWrapper,
+    LogWrapper,
+    ObjectCentricWrapper,
+    PixelObsWrapper,
+    VecEnv,
+)
+
+STACKS: Dict[str, Callable] = {
+    "raw": lambda env: env,
+    "atari": lambda env: AtariWrapper(env),
+    "object_centric": lambda env: ObjectCentricWrapper(AtariWrapper(env)),
+    "pixel": lambda env: PixelObsWrapper(AtariWrapper(env)),
+    "log": lambda env: LogWrapper(ObjectCentricWrapper(AtariWrapper(env))),
+}
+# stacks whose observations are rendered frames, they are only measured once as rendering
+RENDERING_STACKS = ("pixel",)
+BATCH_SIZES = (1, 8, 64, 512, 4096, 8192)
+
+CSV_FIELDS = (
+    "game",
+    "stack",
+    "batch_size",
+    "render",
+    "steps_per_second",
+    "frames_per_second",
+    "compile_seconds",
+    "memory_bytes",
+    "process_peak_bytes",
+    "error",
+)
+
+
+def _game_state(state):
+    """Unwraps the state of the game from the states of VecEnv and the wrappers."""
+    while True:
+        for field in ("env_state", "atari_state"):
+            if hasattr(state, field):
+                state = getattr(state, field)
+                break
+        else:
+            return state
+
+
+def _frame_skip(env) -> int:
+    while hasattr(env, "_env"):
+        if isinstance(env, AtariWrapper):
+            return env.frame_skip
+        env = env._env
+    return 1
+
+
+@partial(jax.jit, static_argnums=(0, 1, 2, 3))
+def _run(vec_env: VecEnv, game, render: bool, num_steps: int, state, key):
+    num_actions = game.action_space().n
+
+    def body_fn(carry, step_key):
+        state, _ = carry
+        action = jax.random.randint(step_key, (vec_env.num_envs,), 0, num_actions)
+        obs, state, reward, done, info = vec_env.step(state, action)
+        frames = jax.vmap(game.render)(_game_state(state)) if render else None
+        # the outputs of the last step leave the loop, so every step has to compute them
+        return (state, (obs, reward, frames)), None
+
+    actions = jnp.zeros((vec_env.num_envs,), dtype=jnp.int32)
+    obs, _, reward, _, _ = jax.eval_shape(vec_env.step, state, actions)
+    frames = jax.eval_shape(jax.vmap(game.render), _game_state(state)) if render else None
+    outputs = jax.tree.map(lambda leaf: jnp.zeros(leaf.shape, leaf.dtype), (obs, reward, frames))
+    (state, outputs), _ = jax.lax.scan(body_fn, (state, outputs), jax.random.split(key, num_steps))
+    return state, outputs
+
+
+def measure(
+    game_name: str,
+    stack: str,
+    batch_size: int,
+    render: bool = False,
+    num_steps: int = 100,
+    repeats: int = 3,
+    seed: int = 0,
+) -> dict:
+    """
+    Measures the throughput of one configuration.
+    Args:
+        game_name: The registered name of the game.
+        stack: The wrapper stack, a key of STACKS.
+        batch_size: The number of parallel environments.
+        render: Whether to additionally render the game state after every step.
+        num_steps: The steps of one timed call of the jitted loop.
+        repeats: How often the loop is timed, the median is reported.
+        seed: The seed of the environments and the random actions.
+    Returns: A row with the fields CSV_FIELDS.
+    """
+    game = jaxatari.make(game_name)
+    vec_env = VecEnv(STACKS[stack](game), batch_size)
+    key = jax.random.PRNGKey(seed)
+    reset_key, key = jax.random.split(key)
+    _, state = jax.block_until_ready(vec_env.reset(reset_key))
+
+    start = time.perf_counter()
+    compiled = _run.lower(vec_env, game, render, num_steps, state, key).compile()
+    compile_seconds = time.perf_counter() - start
+
+    # one untimed call, so the timed calls start from a state the loop produced
+    state, _ = jax.block_until_ready(compiled(state, key))
+    durations = []
+    for _ in range(repeats):
+        key, run_key = jax.random.split(key)
+        start = time.perf_counter()
+        state, _ = jax.block_until_ready(compiled(state, run_key))
+        durations.append(time.perf_counter() - start)
+    steps_per_second = batch_size * num_steps / statistics.median(durations)
+
+    memory = compiled.memory_analysis()
+    memory_bytes = None
+    if memory is not None:
+        memory_bytes = memory.argument_size_in_bytes + memory.output_size_in_bytes + memory.temp_size_in_bytes
+    device_stats = jax.local_devices()[0].memory_stats()
+
+    return {
+        "game": game_name,
+        "stack": stack,
+        "batch_size": batch_size,
+        "render": render,
+        "steps_per_second": steps_per_second,
+        "frames_per_second": steps_per_second * _frame_skip(vec_env),
+        "compile_seconds": compile_seconds,
+        "memory_bytes": memory_bytes,
+        "process_peak_bytes": device_stats.get("peak_bytes_in_use") if device_stats else None,
+        "error": None,
+    }
+
+
+def run_throughput_benchmark(
+    games: Optional[Sequence[str]] = None,
+    stacks: Sequence[str] = tuple(STACKS),
+    batch_sizes: Sequence[int] = BATCH_SIZES,
+    render_modes: Sequence[bool] = (False, True),
+    num_steps: int = 100,
+    repeats: int = 3,
+    log: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """
+    Measures every combination of game, stack, batch size and render mode.
+    A configuration that fails, e.g. because it runs out of memory, is reported with its error.
+    Args:
+        games: The games to measure, all registered games by default.
+        stacks: The wrapper stacks, keys of STACKS.
+        batch_sizes: The numbers of parallel environments.
+        render_modes: Whether to measure without rendering, with rendering or both.
+            Stacks in RENDERING_STACKS are measured once.
+        num_steps: The steps of one timed call.
+        repeats: How often each configuration is timed.
+        log: Called with every row as soon as it is measured.
+    Returns: A JSON-serializable dict with the environment the benchmark ran in and the rows.
+    """
+    unknown = set(stacks) - set(STACKS)
+    if unknown:
+        raise ValueError(f"Unknown stacks {sorted(unknown)}, expected a subset of {list(STACKS)}")
+    games = list(games) if games else jaxatari.list_available_games()
+
+    rows: List[dict] = []
+    for game_name in games:
+        for stack in stacks:
+            modes = [True] if stack in RENDERING_STACKS else list(render_modes)
+            for render in modes:
+                for batch_size in batch_sizes:
+                    try:
+                        # rendering stacks render through their wrapper, not through the extra render
+                        row = measure(
+                            game_name, stack, batch_size, render and stack not in RENDERING_STACKS, num_steps, repeats
+                        )
+                        row["render"] = render
+                    except Exception as e:
+                        row = {field: None for field in CSV_FIELDS}
+                        row.update(game=game_name, stack=stack, batch_size=batch_size, render=render,
+                                   error=f"{type(e).__name__}: {e}")
+                    rows.append(row)
+                    if log is not None:
+                        log(row)
+
+    return {
+        "benchmark": "throughput",
+        "python": platform.python_version(),
+        "jax": jax.__version__,
+        "backend": jax.default_backend(),
+        "devices": [str(device) for device in jax.local_devices()],
+        "num_steps": num_steps,
+        "repeats": repeats,
+        "rows": rows,
+    }
+
+
+def write_csv(results: dict, path: str) -> None:
+    """Writes the rows of run_throughput_benchmark to a CSV file."""
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(results["rows"])
+
+
+def _format_row(row: dict) -> str:
+    config = f"{row['game']:<10} {row['stack']:<15} {row['batch_size']:>6} {'render' if row['render'] else '':<7}"
+    if row["error"] is not None:
+        return f"{config} {row['error'].splitlines()[0]}"
+    return f"{config} {row['steps_per_second']:>14,.0f} steps/s  compile {row['compile_seconds']:6.1f}s"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description="Measure the steady-state throughput of jaxatari games.")
+    parser.add_argument("games", nargs="*", help="Games to measure, all registered games by default.")
+    parser.add_argument("--stacks", nargs="+", default=list(STACKS), choices=list(STACKS))
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=list(BATCH_SIZES))
+    parser.add_argument("--render", choices=("both", "on", "off"), default="both")
+    parser.add_argument("--num-steps", type=int, default=100, help="Steps of one timed call.")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed calls per configuration, the median is reported.")
+    parser.add_argument("--output", "-o", help="Write the results as JSON to this file.")
+    parser.add_argument("--csv", help="Write the rows as CSV to this file.")
+    args = parser.parse_args(argv)
+
+    render_modes = {"both": (False, True), "on": (True,), "off": (False,)}[args.render]
+    results = run_throughput_benchmark(
+        args.games, args.stacks, args.batch_sizes, render_modes, args.num_steps, args.repeats,
+        log=lambda row: print(_format_row(row), flush=True),
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.csv:
+        write_csv(results, args.csv)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Persistent compilation cache and ahead-of-time compilation of environments."""
+
+import os
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import chex
+import jax
+import jax.numpy as jnp
+from jax.experimental.compilation_cache import compilation_cache
+
+from jaxatari.environment import JaxEnvironment
+
+
+class CompileCacheStats(NamedTuple):
+    requests: int # compilations that looked up the persistent cache
+    hits: int # executables loaded from the persistent cache
+
+    @property
+    def misses(self) -> int:
+        return self.requests - self.hits
+
+    def __sub__(self, other: "CompileCacheStats") -> "CompileCacheStats":
+        return CompileCacheStats(self.requests - other.requests, self.hits - other.hits)
+
+
+_REQUEST_EVENT = "/jax/compilation_cache/compile_requests_use_cache"
+_HIT_EVENT = "/jax/compilation_cache/cache_hits"
+_counts = {_REQUEST_EVENT: 0, _HIT_EVENT: 0}
+_listening = False
+
+
+def _count_event(event: str, **kwargs) -> None:
+    if event in _counts:
+        _counts[event] += 1
+
+
+def enable_compile_cache(cache_dir: str, min_compile_time_secs: float = 0.0) -> None:
+    """
+    Turns on JAX's persistent compilation cache, so executables compiled in one process
+    are loaded from cache_dir by later processes instead of being compiled again.
+    Args:
+        cache_dir: The directory the executables are stored in, it is created if needed.
+        min_compile_time_secs: Only executables that took at least this long to compile are stored.
+    """
+    global _listening
+    cache_dir = os.path.abspath(os.path.expanduser(str(cache_dir)))
+    os.makedirs(cache_dir, exist_ok=True)
+    jax.config.update("jax_compilation_cache_dir", cache_dir)
+    jax.config.update("jax_persistent_cache_min_compile_time_secs", min_compile_time_secs)
+    jax.config.update("jax_persistent_cache_min_entry_size_bytes", 0)
+    # the cache is set up on the first compilation, reset it so the new directory is used
+    compilation_cache.reset_cache()
+    if not _listening:
+        jax.monitoring.register_event_listener(_count_event)
+        _listening = True
+
+
+def cache_stats() -> CompileCacheStats:
+    """Returns the persistent cache lookups and hits since `enable_compile_cache` was first called."""
+    return CompileCacheStats(_counts[_REQUEST_EVENT], _counts[_HIT_EVENT])
+
+
+def _base_env(env) -> JaxEnvironment:
+    while not isinstance(env, JaxEnvironment):
+        env = env._env
+    return env
+
+
+def _lower(fn, *args) -> jax.stages.Lowered:
+    """
+    Lowers a function the way calling it does: a method jitted with a static self through its own jit,
+    so that the compiled executable is the one its calls look up, anything else through a new jit.
+    """
+    jitted = getattr(fn, "__func__", None)
+    if hasattr(jitted, "lower"):
+        return jitted.lower(fn.__self__, *args)
+    return jax.jit(fn).lower(*args)
+
+
+def precompile(
+    env,
+    batch_size: Optional[int] = None,
+    key: Optional[chex.PRNGKey] = None,
+) -> Tuple[Dict[str, jax.stages.Compiled], Dict[str, CompileCacheStats]]:
+    """
+    Compiles reset, step and render of an environment or wrapper ahead of time.
+    With the persistent cache enabled, the executables are written to (or loaded from) the cache directory.
+    The jitted reset, step and render methods themselves are compiled, so later calls of e.g. `env.step`,
+    also in other processes, load them from the cache.
+    Args:
+        env: The environment or wrapper to compile.
+        batch_size: If given, reset and step of `VecEnv(env, batch_size)` are compiled, the functions
+            a VecEnv of the same stack and size dispatches.
+        key: An example key, only its shape and type are used.
+
+    Returns: The compiled reset, step and render functions, and the cache lookups and hits of each of them.
+        render takes the unbatched state of the underlying game, e.g. `state.env_state` of an AtariWrapper,
+        and is left out for environments made with render=False.
+    """
+    from jaxatari.wrappers import VecEnv
+
+    key = jax.random.PRNGKey(0) if key is None else key
+    base_env = _base_env(env)
+    if batch_size is not None:
+        env = VecEnv(env, batch_size)
+    _, state = jax.eval_shape(env.reset, key)
+    _, base_state = jax.eval_shape(base_env.reset, key)
+    action_shape = (batch_size,) if batch_size is not None else ()
+
+    args = {
+        "reset": (env.reset, (key,)),
+        "step": (env.step, (state, jax.ShapeDtypeStruct(action_shape, jnp.int32))),
+    }
+    if not base_env.headless:
+        # create the renderer up front, loading its sprites would otherwise be counted as compilations of render
+        base_env.renderer
+        args["render"] = (base_env.render, (base_state,))
+
+    compiled, stats = {}, {}
+    for name, (fn, fn_args) in args.items():
+        before = cache_stats()
+        compiled[name] = _lower(fn, *fn_args).compile()
+        stats[name] = cache_stats() - before
+    return compiled, stats
@@ -1,58 +1,214 @@
 import importlib
-import inspect
+from importlib import metadata
+from typing import Any, Dict, Optional, Type, Union
 
-from jaxatari.environment import JaxEnvironment
+from jaxatari.compilation import enable_compile_cache
+from jaxatari.environment import JaxEnvironment, _value_key
 
 
-# Map of game names to their module paths
-GAME_MODULES = {
-    "pong": "jaxatari.games.jax_pong",
-    "seaquest": "jaxatari.games.jax_seaquest",
-    "kangaroo": "jaxatari.games.jax_kangaroo",
-    "freeway": "jaxatari.games.jax_freeway",
-    "breakout": "jaxatari.games.jax_breakout",
+# Map of game names to their environment classes as "module:Class" paths, modules are only imported by make
+GAME_REGISTRY: Dict[str, str] = {
+    "pong": "jaxatari.games.jax_pong:JaxPong",
+    "seaquest": "jaxatari.games.jax_seaquest:JaxSeaquest",
+    "kangaroo": "jaxatari.games.jax_kangaroo:JaxKangaroo",
+    "freeway": "jaxatari.games.jax_freeway:JaxFreeway",
+    "breakout": "jaxatari.games.jax_breakout:JaxBreakout",
+    "phoenix": "jaxatari.games.jax_phoenix:JaxPhoenix",
     # Add new games here
 }
 
+# Map of game names to their mods (JaxatariWrapper subclasses), also as "module:Class" paths
+MOD_REGISTRY: Dict[str, Dict[str, str]] = {
+    "pong": {
+        "LazyEnemyWrapper": "jaxatari.games.mods.pong_mods:LazyEnemyWrapper",
+        "RandomizedEnemyWrapper": "jaxatari.games.mods.pong_mods:RandomizedEnemyWrapper",
+    },
+    "seaquest": {
+        "DisableEnemiesWrapper": "jaxatari.games.mods.seaquest_mods:DisableEnemiesWrapper",
+    },
+    "kangaroo": {
+        "DisableThreadsWrapper": "jaxatari.games.mods.kangaroo_mods:DisableThreadsWrapper",
+    },
+    "freeway": {
+        "StopAllCars": "jaxatari.games.mods.freeway_mods:StopAllCars",
+        "AlwaysStopAllCars": "jaxatari.games.mods.freeway_mods:AlwaysStopAllCars",
+        "SpeedMode": "jaxatari.games.mods.freeway_mods:SpeedMode",
+    },
+    "breakout": {
+        "SpeedMode": "jaxatari.games.mods.breakout_mods:SpeedMode",
+        "SmallPaddle": "jaxatari.games.mods.breakout_mods:SmallPaddle",
+        "BigPaddle": "jaxatari.games.mods.breakout_mods:BigPaddle",
+    },
+}
+
+# Entry point groups other packages register games and mods in, e.g. in their pyproject.toml:
+#   [project.entry-points."jaxatari.games"]
+#   mygame = "mypackage.mygame:JaxMyGame"
+#   [project.entry-points."jaxatari.mods"]
+#   "mygame.FastEnemies" = "mypackage.mygame_mods:FastEnemies"
+GAME_ENTRY_POINT_GROUP = "jaxatari.games"
+MOD_ENTRY_POINT_GROUP = "jaxatari.mods"
+_entry_points_loaded = False
+
+# Environments returned by make, keyed by (game_name, mode, difficulty, value of consts, render)
+_ENV_CACHE: dict[tuple, JaxEnvironment] = {}
+
+def _load_entry_points() -> None:
+    """Adds the games and mods of installed plugins to the registries, without importing them."""
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+    for entry_point in metadata.entry_points(group=GAME_ENTRY_POINT_GROUP):
+        # built-in and explicitly registered games take precedence
+        GAME_REGISTRY.setdefault(entry_point.name, entry_point.value)
+    for entry_point in metadata.entry_points(group=MOD_ENTRY_POINT_GROUP):
+        game_name, _, mod_name = entry_point.name.partition(".")
+        if not mod_name:
+            raise ValueError(
+                f"Mod entry point '{entry_point.name}' must be named '<game>.<mod>'"
+            )
+        MOD_REGISTRY.setdefault(game_name, {}).setdefault(mod_name, entry_point.value)
+
+def _import_object(path: str) -> Any:
+    """Imports the object at a "module:attribute" path."""
+    module_name, _, attribute = path.partition(":")
+    if not attribute:
+        raise ValueError(f"Expected a 'module:Class' path, got '{path}'")
+    obj = importlib.import_module(module_name)
+    for name in attribute.split("."):
+        obj = getattr(obj, name)
+    return obj
+
+def register_game(game_name: str, env_class: Union[str, Type[JaxEnvironment]], overwrite: bool = False) -> None:
+    """
+    Registers a game for make.
+    Args:
+        game_name: The name passed to make.
+        env_class: The environment class, or its "module:Class" path to import it only when the game is made.
+        overwrite: Whether an already registered game of that name may be replaced.
+    """
+    _load_entry_points()
+    if game_name in GAME_REGISTRY and not overwrite:
+        raise ValueError(f"The game '{game_name}' is already registered as {GAME_REGISTRY[game_name]}")
+    GAME_REGISTRY[game_name] = env_class
+    clear_cache()
+
+def register_mod(game_name: str, mod_name: str, mod_class: Union[str, type], overwrite: bool = False) -> None:
+    """
+    Registers a mod of a game for load_mod.
+    Args:
+        game_name: The game the mod applies to.
+        mod_name: The name passed to load_mod.
+        mod_class: The JaxatariWrapper subclass, or its "module:Class" path.
+        overwrite: Whether an already registered mod of that name may be replaced.
+    """
+    _load_entry_points()
+    mods = MOD_REGISTRY.setdefault(game_name, {})
+    if mod_name in mods and not overwrite:
+        raise ValueError(f"The mod '{mod_name}' of '{game_name}' is already registered as {mods[mod_name]}")
+    mods[mod_name] = mod_class
+
 def list_available_games() -> list[str]:
-    """Lists all available, registered games."""
-    return list(GAME_MODULES.keys())
+    """Lists all available, registered games. No game module is imported."""
+    _load_entry_points()
+    return list(GAME_REGISTRY.keys())
+
+def list_available_mods(game_name: str) -> list[str]:
+    """Lists the registered mods of a game. No mod module is imported."""
+    _load_entry_points()
+    return list(MOD_REGISTRY.get(game_name, {}).keys())
+
+def get_env_class(game_name: str) -> Type[JaxEnvironment]:
+    """Returns the environment class of a registered game, importing its module if needed."""
+    _load_entry_points()
+    if game_name not in GAME_REGISTRY:
+        raise NotImplementedError(
+            f"The game '{game_name}' does not exist. Available games: {list_available_games()}"
+        )
+    env_class = GAME_REGISTRY[game_name]
+    if isinstance(env_class, str):
+        try:
+            env_class = _import_object(env_class)
+        except (ImportError, AttributeError) as e:
+            raise ImportError(f"Failed to load game '{game_name}': {e}") from e
+    if not (isinstance(env_class, type) and issubclass(env_class, JaxEnvironment)):
+        raise ImportError(f"Failed to load game '{game_name}': {env_class} is not a JaxEnvironment subclass")
+    return env_class
+
+def load_mod(game_name: str, mod_name: str) -> type:
+    """
+    Returns the wrapper class of a registered mod, importing its module if needed.
+    Apply it by wrapping an environment of the game: `load_mod("pong", "LazyEnemyWrapper")(make("pong"))`.
+    Mods leave the wrapped environment unchanged, so the cached instance can be shared safely.
+    """
+    from jaxatari.wrappers import JaxatariWrapper
+
+    _load_entry_points()
+    mods = MOD_REGISTRY.get(game_name, {})
+    if mod_name not in mods:
+        raise NotImplementedError(
+            f"The mod '{mod_name}' of '{game_name}' does not exist. Available mods: {list_available_mods(game_name)}"
+        )
+    mod_class = mods[mod_name]
+    if isinstance(mod_class, str):
+        try:
+            mod_class = _import_object(mod_class)
+        except (ImportError, AttributeError) as e:
+            raise ImportError(f"Failed to load mod '{mod_name}' of '{game_name}': {e}") from e
+    if not (isinstance(mod_class, type) and issubclass(mod_class, JaxatariWrapper)):
+        raise ImportError(f"Failed to load mod '{mod_name}' of '{game_name}': {mod_class} is not a JaxatariWrapper subclass")
+    return mod_class
+
+def clear_cache() -> None:
+    """Drops all environments cached by make, the next call creates (and compiles) them again."""
+    _ENV_CACHE.clear()
 
-def make(game_name: str, mode: int = 0, difficulty: int = 0) -> JaxEnvironment:
+def make(
+    game_name: str,
+    mode: int = 0,
+    difficulty: int = 0,
+    consts: Any = None,
+    cache: bool = True,
+    compile_cache_dir: Optional[str] = None,
+    render: bool = True,
+) -> JaxEnvironment:
     """
     Creates and returns a JaxAtari game environment instance.
     This is the main entry point for creating environments.
 
+    Environments are cached: calls with the same game, mode, difficulty and equal constants return
+    the same instance, which also reuses the functions compiled for it. Environments created with
+    cache=False or outside make compare equal by value as well (see `JaxEnvironment.__eq__`),
+    so their jitted methods reuse the traces and executables of an equal environment.
+
     Args:
         game_name: Name of the game to load (e.g., "pong").
         mode: Game mode.
         difficulty: Game difficulty.
+        consts: Optional constants of the game, the defaults of the game are used if None.
+        cache: If False, a new instance is created and not cached, e.g. to modify it in place.
+        compile_cache_dir: If given, JAX's persistent compilation cache is enabled in this directory
+            (see `jaxatari.compilation.enable_compile_cache`), so later processes load the compiled functions.
+        render: If False, the environment is headless: no sprites are ever loaded and rendering raises.
+            Renderers are created lazily either way, so this only guards against accidental rendering.
 
     Returns:
         An instance of the specified game environment.
     """
-    if game_name not in GAME_MODULES:
-        raise NotImplementedError(
-            f"The game '{game_name}' does not exist. Available games: {list_available_games()}"
-        )
-    
-    try:
-        # 1. Dynamically load the module
-        module = importlib.import_module(GAME_MODULES[game_name])
-        
-        # 2. Find the correct environment class within the module
-        env_class = None
-        for _, obj in inspect.getmembers(module):
-            if inspect.isclass(obj) and issubclass(obj, JaxEnvironment) and obj is not JaxEnvironment:
-                env_class = obj
-                break # Found it
-        
-        if env_class is None:
-            raise ImportError(f"No JaxEnvironment subclass found in {GAME_MODULES[game_name]}")
-        
-        # 3. Instantiate the class, passing along the arguments, and return it
-        # TODO: none of our environments use mode / difficulty yet, but we might want to add it here and in the single envs
-        return env_class()
-
-    except (ImportError, AttributeError) as e:
-        raise ImportError(f"Failed to load game '{game_name}': {e}") from e
\ No newline at end of file
+    env_class = get_env_class(game_name)
+
+    if compile_cache_dir is not None:
+        enable_compile_cache(compile_cache_dir)
+
+    key = (game_name, mode, difficulty, _value_key(consts), render)
+    if cache and key in _ENV_CACHE:
+        return _ENV_CACHE[key]
+
+    # TODO: none of our environments use mode / difficulty yet, but we might want to add it here and in the single envs
+    env = env_class() if consts is None else env_class(consts=consts)
+    env.headless = not render
+
+    if cache:
+        _ENV_CACHE[key] = env
+    return env
\ No newline at end of file
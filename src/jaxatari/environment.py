@@ -1,7 +1,10 @@
 from enum import Enum
-from typing import Tuple, Generic, TypeVar
+from functools import partial
+from typing import Any, Callable, Generic, Hashable, NamedTuple, Optional, Sequence, Tuple, TypeVar
+import jax
 import jax.numpy as jnp
 import jax.random as jrandom
+import numpy as np
 from jaxatari.spaces import Space
 
 
@@ -44,6 +47,80 @@ class JAXAtariAction:
             cls.UPRIGHTFIRE, cls.UPLEFTFIRE, cls.DOWNRIGHTFIRE, cls.DOWNLEFTFIRE
         ], dtype=jnp.int32)
 
+class Trajectory(NamedTuple):
+    """
+    Struct-of-arrays trajectory collected by `rollout`. Every field has a leading num_steps axis,
+    obs[t] is the observation the policy chose action[t] from. Fields that were not requested are None.
+    """
+    obs: Any
+    action: Any
+    reward: Any
+    done: Any
+    info: Any
+
+
+@partial(jax.jit, static_argnames=("env", "policy_fn", "num_steps", "fields"))
+def rollout(
+    env,
+    env_state: EnvState,
+    policy_fn: Callable,
+    policy_params: Any,
+    key: jrandom.PRNGKey,
+    num_steps: int,
+    obs: Optional[EnvObs] = None,
+    fields: Sequence[str] = Trajectory._fields,
+) -> Tuple[EnvObs, EnvState, Trajectory]:
+    """
+    Runs a policy for num_steps steps of an environment or wrapper in a single `lax.scan` on device.
+    Args:
+        env: The environment or wrapper to step. Auto-resetting wrappers keep the rollout going across episodes.
+        env_state: The state to start from.
+        policy_fn: A jittable function policy_fn(policy_params, obs, key) -> action. Pass the same function
+            object on every call, a new lambda triggers a new compilation.
+        policy_params: The parameters passed to policy_fn.
+        key: The random key the per-step policy keys are split from.
+        num_steps: The number of steps to run.
+        obs: The observation belonging to env_state. Only base environments can derive it from the state.
+        fields: Tuple of the Trajectory fields to record, the others are None and never leave the device.
+
+    Returns: The final observation, the final environment state and the collected Trajectory.
+    """
+    unknown = set(fields) - set(Trajectory._fields)
+    if unknown:
+        raise ValueError(f"Unknown trajectory fields {sorted(unknown)}, expected a subset of {Trajectory._fields}")
+    if obs is None:
+        if not isinstance(env, JaxEnvironment):
+            raise ValueError("Wrapped environments need the observation returned by reset or step as obs")
+        obs = env._get_observation(env_state)
+
+    def body_fn(carry, step_key):
+        obs, state = carry
+        action = policy_fn(policy_params, obs, step_key)
+        next_obs, next_state, reward, done, info = env.step(state, action)
+        record = {"obs": obs, "action": action, "reward": reward, "done": done, "info": info}
+        return (next_obs, next_state), Trajectory(**{f: record[f] if f in fields else None for f in Trajectory._fields})
+
+    (obs, env_state), trajectory = jax.lax.scan(body_fn, (obs, env_state), jrandom.split(key, num_steps))
+    return obs, env_state, trajectory
+
+
+def _value_key(value: Any) -> Hashable:
+    """
+    Returns a hashable key that is equal for equal values, so that constants holding arrays
+    (which are not hashable themselves) can be compared by value.
+    """
+    if isinstance(value, (tuple, list)):
+        # the type keeps NamedTuple constants of different games apart
+        return (type(value), tuple(_value_key(v) for v in value))
+    if isinstance(value, dict):
+        return (dict, tuple((k, _value_key(v)) for k, v in sorted(value.items(), key=lambda item: repr(item[0]))))
+    if hasattr(value, "shape") and hasattr(value, "dtype"):
+        array = np.asarray(value)
+        return (np.ndarray, array.shape, array.dtype.str, array.tobytes())
+    hash(value) # raises TypeError for unsupported values
+    return value
+
+
 class JaxEnvironment(Generic[EnvState, EnvObs, EnvInfo, EnvConstants]):
     """
     Abstract class for a JAX environment.
@@ -54,9 +131,70 @@ class JaxEnvironment(Generic[EnvState, EnvObs, EnvInfo, EnvConstants]):
     EnvConstants: The type of the environment constants.
     """
 
+    # set by `jaxatari.make(..., render=False)`, creating the renderer then raises instead
+    headless: bool = False
+    _renderer = None
+
     def __init__(self, consts: EnvConstants = None):
         self.consts = consts
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        # any change of an attribute can change the traced functions, the key is computed again
+        self.__dict__.pop("_static_key", None)
+        super().__setattr__(name, value)
+
+    def _get_static_key(self) -> Hashable:
+        """
+        Returns the key jitted methods, which take the environment as static argument, compare it by.
+        It holds the values of all attributes except the renderer, which is created from the constants.
+        """
+        key = self.__dict__.get("_static_key")
+        if key is None:
+            attributes = {name: value for name, value in vars(self).items() if name != "_renderer"}
+            attributes["headless"] = self.headless
+            try:
+                key = (type(self), _value_key(attributes))
+            except TypeError:
+                # attributes that cannot be compared by value keep the environment unique
+                key = (type(self), id(self))
+            self.__dict__["_static_key"] = key
+        return key
+
+    def __hash__(self) -> int:
+        return hash(self._get_static_key())
+
+    def __eq__(self, other: Any) -> bool:
+        if self is other:
+            return True
+        if type(self) is not type(other):
+            return NotImplemented
+        return self._get_static_key() == other._get_static_key()
+
+    @property
+    def renderer(self):
+        """
+        The renderer of the game. It is created on first access, so environments that are only stepped
+        never load sprites.
+        """
+        if self._renderer is None:
+            if self.headless:
+                raise RuntimeError(f"{type(self).__name__} was created with render=False and cannot render")
+            # the first access is often inside a jitted render, the sprites must still be concrete arrays
+            with jax.ensure_compile_time_eval():
+                self._renderer = self._create_renderer()
+        return self._renderer
+
+    @renderer.setter
+    def renderer(self, renderer):
+        self._renderer = renderer
+
+    def _create_renderer(self):
+        """
+        Creates the renderer used by `render`, `render_indexed` and `palette`.
+        Returns: The renderer, or None if the environment has none.
+        """
+        return None
+
     def reset(self, key: jrandom.PRNGKey=None) -> Tuple[EnvObs, EnvState]:
         """
         Resets the environment to the initial state.
@@ -79,6 +217,22 @@ class JaxEnvironment(Generic[EnvState, EnvObs, EnvInfo, EnvConstants]):
         """
         raise NotImplementedError("Abstract method")
 
+    def rollout(
+        self,
+        env_state: EnvState,
+        policy_fn: Callable,
+        policy_params: Any,
+        key: jrandom.PRNGKey,
+        num_steps: int,
+        obs: Optional[EnvObs] = None,
+        fields: Sequence[str] = Trajectory._fields,
+    ) -> Tuple[EnvObs, EnvState, Trajectory]:
+        """
+        Runs policy_fn(policy_params, obs, key) for num_steps steps in a single `lax.scan`, see `rollout`.
+        Returns: The final observation, the final environment state and the collected Trajectory.
+        """
+        return rollout(self, env_state, policy_fn, policy_params, key, num_steps, obs, tuple(fields))
+
     def render(self, state: EnvState) -> Tuple[jnp.ndarray]:
         """
         Renders the environment state to a single image.
@@ -90,6 +244,30 @@ class JaxEnvironment(Generic[EnvState, EnvObs, EnvInfo, EnvConstants]):
         """
         raise NotImplementedError("Abstract method")
 
+    def render_indexed(self, state: EnvState) -> jnp.ndarray:
+        """
+        Renders the environment state to a single-channel image of palette indices.
+        RGB can be recovered with `jaxatari.rendering.jax_rendering_utils.palette_lookup(image, self.palette())`.
+        Raises NotImplementedError if the renderer does not draw palette indices natively.
+        Args:
+            state: The environment state.
+        Returns: A (H, W) uint8 image of palette indices.
+        """
+        renderer = getattr(self, "renderer", None)
+        if renderer is None:
+            raise NotImplementedError("Environment has no renderer with a palette-indexed mode")
+        return renderer.render_indexed(state)
+
+    def palette(self) -> jnp.ndarray:
+        """
+        Returns the color palette used by `render_indexed`.
+        Returns: A (P, 3) uint8 array of RGB colors.
+        """
+        renderer = getattr(self, "renderer", None)
+        if renderer is None:
+            raise NotImplementedError("Environment has no renderer with a palette-indexed mode")
+        return renderer.palette
+
     def action_space(self) -> Space:
         """
         Returns the action space of the environment as an array containing the actions that can be taken.
@@ -7,6 +7,7 @@ import chex
 import pygame
 
 from jaxatari.environment import JaxEnvironment, JAXAtariAction as Action
+from jaxatari.profile import stage
 import jaxatari.spaces as spaces
 from jaxatari.renderers import JAXGameRenderer
 import jaxatari.rendering.jax_rendering_utils as jr
@@ -110,7 +111,6 @@ class JaxBreakout(JaxEnvironment[BreakoutState, BreakoutObservation, BreakoutInf
     def __init__(self, consts: BreakoutConstants = None, reward_funcs: list[callable]=None):
         consts = consts or BreakoutConstants()
         super().__init__(consts)
-        self.renderer = BreakoutRenderer(self.consts)
         if reward_funcs is not None:
             reward_funcs = tuple(reward_funcs) 
         self.reward_funcs = reward_funcs 
@@ -128,6 +128,7 @@ class JaxBreakout(JaxEnvironment[BreakoutState, BreakoutObservation, BreakoutInf
             return jnp.array(Action.NOOP)
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("player_step")
     def _player_step(
         self,
         state_player_x: chex.Array,
@@ -219,6 +220,7 @@ class JaxBreakout(JaxEnvironment[BreakoutState, BreakoutObservation, BreakoutInf
         return player_x, player_speed, new_acceleration_counter
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_ball_velocity")
     def _get_ball_velocity(self, speed_idx, direction_idx, step_counter):
         """Returns the ball's velocity based on the speed and direction indices."""
         sub_idx = step_counter % 2
@@ -227,6 +229,7 @@ class JaxBreakout(JaxEnvironment[BreakoutState, BreakoutObservation, BreakoutInf
         return abs_speed[0] * direction[0], abs_speed[1] * direction[1]
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("detect_paddle_hit")
     def _detect_paddle_hit(self, ball_x, ball_y, player_x, small_paddle):
         """Detects if the ball has hit the paddle."""
         paddle_width = jnp.where(small_paddle, self.consts.PLAYER_SIZE_SMALL[0], self.consts.PLAYER_SIZE[0])
@@ -268,6 +271,7 @@ class JaxBreakout(JaxEnvironment[BreakoutState, BreakoutObservation, BreakoutInf
         return jnp.logical_or(jnp.logical_or(hit_from_above, hit_from_left), hit_from_right)
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("ball_step")
     def _ball_step(self, state, game_started, player_x):
         """Updates the ball's position, handles wall collisions, and paddle bounces."""
         # Compute spawn index and spawn position
@@ -435,6 +439,7 @@ class JaxBreakout(JaxEnvironment[BreakoutState, BreakoutObservation, BreakoutInf
 
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("check_block_collision")
     def _check_block_collision(self, state, ball_x, ball_y, ball_speed_idx, ball_direction_idx, consecutive_hits):
         """Checks for block collisions and updates the state using vectorized operations."""
 
@@ -580,6 +585,9 @@ class JaxBreakout(JaxEnvironment[BreakoutState, BreakoutObservation, BreakoutInf
             operand=None
         )
 
+    def _create_renderer(self):
+        return BreakoutRenderer(self.consts)
+
     @partial(jax.jit, static_argnums=(0,))
     def reset(self, key = None) -> tuple[BreakoutObservation, BreakoutState]:
         """Initialize game state"""
@@ -700,6 +708,7 @@ class JaxBreakout(JaxEnvironment[BreakoutState, BreakoutObservation, BreakoutInf
         )
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_observation")
     def _get_observation(self, state: BreakoutState) -> BreakoutObservation:
         paddle_width = jnp.where(state.small_paddle, self.consts.PLAYER_SIZE_SMALL[0], self.consts.PLAYER_SIZE[0])
 
@@ -726,6 +735,7 @@ class JaxBreakout(JaxEnvironment[BreakoutState, BreakoutObservation, BreakoutInf
         )
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_info")
     def _get_info(self, state: BreakoutState, all_rewards: chex.Array = None) -> BreakoutInfo:
         return BreakoutInfo(
             time=state.step_counter,
@@ -734,10 +744,12 @@ class JaxBreakout(JaxEnvironment[BreakoutState, BreakoutObservation, BreakoutInf
         )
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_reward")
     def _get_reward(self, previous_state: BreakoutState, current_state: BreakoutState) -> chex.Array:
         return current_state.score - previous_state.score
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_all_reward")
     def _get_all_reward(self, previous_state: BreakoutState, state: BreakoutState):
         if self.reward_funcs is None:
             return jnp.zeros(1)
@@ -747,6 +759,7 @@ class JaxBreakout(JaxEnvironment[BreakoutState, BreakoutObservation, BreakoutInf
         return rewards
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_done")
     def _get_done(self, state: BreakoutState) -> chex.Array:
         return jnp.logical_or(state.lives <= 0, jnp.logical_or(state.all_blocks_cleared, state.step_counter >= 5000))
 
@@ -831,6 +844,15 @@ class BreakoutRenderer(JAXGameRenderer):
         # Pre-compute the raster layers for every possible block position.
         self.ALL_POSSIBLE_BLOCK_RASTERS = self._precompute_block_rasters()
 
+        # palette-index versions of the sprites and block layers for render_indexed
+        self.INDEXED_BG, self.INDEXED_PLAYER, self.INDEXED_BALL, self.INDEXED_DIGITS = [
+            jr.index_sprite(sprite, self.palette)
+            for sprite in (self.SPRITE_BG, self.SPRITE_PLAYER, self.SPRITE_BALL, self.DIGIT_SPRITES)
+        ]
+        self.ALL_POSSIBLE_BLOCK_INDICES = self._precompute_block_rasters(
+            [jr.rgb_to_palette_index(color, self.palette) for color in self.BLOCK_COLORS]
+        )
+
     def load_sprites(self):
         """Load all sprites required for Pong rendering."""
         MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -860,13 +882,21 @@ class BreakoutRenderer(JAXGameRenderer):
         )
     
     
-    def _precompute_block_rasters(self):
+    def _precompute_block_rasters(self, block_colors=None):
         """
         Calculates a stack of rasters, one for each possible block position.
         This is done once at initialization to speed up the main render loop.
+        With block_colors given as palette indices, the rasters are palette-index frames.
         """
+        indexed = block_colors is not None
+        block_colors = self.BLOCK_COLORS if block_colors is None else block_colors
+
         # Helper function to draw a single block on a blank canvas of fixed size.
         def draw_single_block(x, y, color):
+            if indexed:
+                blank_raster = jr.create_initial_index_frame(width=160, height=210)
+                patch = jnp.full((self.BLOCK_SIZE[1], self.BLOCK_SIZE[0]), color, dtype=jnp.uint8)
+                return jax.lax.dynamic_update_slice(blank_raster, patch, (y, x))
             # Frame shape should be (Height, Width, Channels) = (210, 160, 3)
             blank_raster = jr.create_initial_frame(width=160, height=210)
             patch = jnp.full((self.BLOCK_SIZE[1], self.BLOCK_SIZE[0], 3), color, dtype=jnp.uint8)
@@ -883,7 +913,7 @@ class BreakoutRenderer(JAXGameRenderer):
         
         # Convert JAX array to regular Python array for indexing (should be fine since we only call this during init?)
         rows_flat = rows_grid.flatten()
-        all_colors = jnp.array([self.BLOCK_COLORS[int(row)] for row in rows_flat])
+        all_colors = jnp.array([block_colors[int(row)] for row in rows_flat])
 
         # Vectorize the drawing function over all possible blocks.
         # This produces a stack of rasters, one for each potential block position.
@@ -891,6 +921,9 @@ class BreakoutRenderer(JAXGameRenderer):
         return jax.vmap(draw_single_block, in_axes=(0, 0, 0))(all_xs, all_ys, all_colors)
 
 
+    def palette_sources(self):
+        return [self.SPRITE_BG, self.SPRITE_PLAYER, self.SPRITE_BALL, self.DIGIT_SPRITES], self.BLOCK_COLORS
+
     @partial(jax.jit, static_argnums=(0,))
     def render(self, state):
         """
@@ -905,66 +938,57 @@ class BreakoutRenderer(JAXGameRenderer):
         # Create empty raster with correct orientation
         # Frame shape should be (Height, Width, Channels) = (210, 160, 3)
         raster = jr.create_initial_frame(width=160, height=210)
+        sprites = (self.SPRITE_BG, self.SPRITE_PLAYER, self.SPRITE_BALL, self.DIGIT_SPRITES)
+        return self._draw(raster, state, sprites, self.ALL_POSSIBLE_BLOCK_RASTERS)
+
+    @partial(jax.jit, static_argnums=(0,))
+    def render_indexed(self, state):
+        raster = jr.create_initial_index_frame(width=160, height=210)
+        sprites = (self.INDEXED_BG, self.INDEXED_PLAYER, self.INDEXED_BALL, self.INDEXED_DIGITS)
+        return self._draw(raster, state, sprites, self.ALL_POSSIBLE_BLOCK_INDICES)
+
+    def _draw(self, raster, state, sprites, block_rasters):
+        """Draws the game onto an RGB or palette-index raster with the matching sprites and block layers."""
+        sprite_bg, sprite_player, sprite_ball, digit_sprites = sprites
 
         # Render background - (0, 0) is top-left corner
-        frame_bg = jr.get_sprite_frame(self.SPRITE_BG, 0)
-        raster = jr.render_at(raster, 0, 0, frame_bg)
+        frame_bg = jr.get_sprite_frame(sprite_bg, 0)
+        raster = jr.blit(raster, 0, 0, frame_bg)
 
         # Render player paddle
-        frame_player = jr.get_sprite_frame(self.SPRITE_PLAYER, 0)
-        raster = jr.render_at(raster, state.player_x, self.consts.PLAYER_START_Y, frame_player)
+        frame_player = jr.get_sprite_frame(sprite_player, 0)
+        raster = jr.blit(raster, state.player_x, self.consts.PLAYER_START_Y, frame_player)
 
         # Render ball - ball position is (ball_x, ball_y)
         # Move ball outside visible area when game hasn't started
         ball_x = jnp.where(state.game_started, state.ball_x, -10)
         ball_y = jnp.where(state.game_started, state.ball_y, -10)
-        frame_ball = jr.get_sprite_frame(self.SPRITE_BALL, 0)
-        raster = jr.render_at(raster, ball_x, ball_y, frame_ball)
+        frame_ball = jr.get_sprite_frame(sprite_ball, 0)
+        raster = jr.blit(raster, ball_x, ball_y, frame_ball)
 
         # 1. Create a mask for currently active blocks from the game state.
         active_mask = (state.blocks == 1).flatten()
 
         # 2. Apply the mask to the pre-computed rasters to zero out inactive blocks.
         # The mask is reshaped to allow broadcasting across the raster dimensions.
-        masked_rasters = self.ALL_POSSIBLE_BLOCK_RASTERS * active_mask[:, None, None, None]
+        masked_rasters = block_rasters * active_mask.reshape((-1,) + (1,) * (block_rasters.ndim - 1))
 
         # 3. Sum the masked rasters to create a single layer with all active blocks.
         # Summation works because non-overlapping blocks were drawn on zeroed backgrounds.
         blocks_layer = jnp.sum(masked_rasters, axis=0, dtype=jnp.uint8)
 
-        # 4. Add the block layer onto the main raster.
+        # 4. Add the block layer onto the main raster, black is index 0 in palette-index frames.
         raster += blocks_layer
 
-        # 1. Get digit array
-        player_score_digits = jr.int_to_digits(state.score, max_digits=3)
-        player_lifes_digit = jr.int_to_digits(state.lives, max_digits=1)
-        number_players_digit = jr.int_to_digits(1, max_digits=1)
-
         # score starts at 36, 5
         # number of lives at 100, 5
         # number players at 132, 5 (always 1 for us)
-
-        # 1. Render score
-        raster = jr.render_label_selective(raster, 36, 5,
-                                            player_score_digits, self.DIGIT_SPRITES,
-                                            0, 3,
-                                            spacing=16)
-        
-        # 2. Render number of lives
-        raster = jr.render_label_selective(raster, 100, 5,
-                                            player_lifes_digit, self.DIGIT_SPRITES,
-                                            0, 1,
-                                            spacing=16)
-        
-        # 3. Render number of players
-        raster = jr.render_label_selective(raster, 132, 5,
-                                            number_players_digit, self.DIGIT_SPRITES,
-                                            0, 1,
-                                            spacing=16)
+        raster = jr.render_number(raster, 36, 5, state.score, digit_sprites, 3, 16)
+        raster = jr.render_number(raster, 100, 5, state.lives, digit_sprites, 1, 16)
+        raster = jr.render_number(raster, 132, 5, 1, digit_sprites, 1, 16)
 
         # after y=196 til y=210 render a black rectangle (its blocking the view of the ball)
-        # Frame is (Height, Width, Channels) so we index as [y_range, x_range, :]
-        # Force the last 14 rows (y=196 to y=210) to be black
-        raster = raster.at[196:210, :, :].set(0)
+        # Force the last 14 rows (y=196 to y=210) to be black, rows are the first axis for RGB and index rasters
+        raster = raster.at[196:210].set(0)
 
         return raster
@@ -7,6 +7,7 @@ from dataclasses import dataclass
 from typing import Tuple, NamedTuple, List, Dict, Optional, Any
 
 from jaxatari.environment import JaxEnvironment, JAXAtariAction as Action
+from jaxatari.profile import stage
 import jaxatari.spaces as spaces
 from jaxatari.renderers import JAXGameRenderer
 import jaxatari.rendering.jax_rendering_utils as jr
@@ -98,7 +99,9 @@ class JaxFreeway(JaxEnvironment[FreewayState, FreewayObservation, FreewayInfo, F
             reward_funcs = tuple(reward_funcs)
         self.reward_funcs = reward_funcs
         self.state = self.reset()
-        self.renderer = FreewayRenderer()
+
+    def _create_renderer(self):
+        return FreewayRenderer()
 
     def reset(self, key: jax.random.PRNGKey = None) -> Tuple[FreewayObservation, FreewayState]:
         """Initialize a new game state"""
@@ -133,9 +136,8 @@ class JaxFreeway(JaxEnvironment[FreewayState, FreewayObservation, FreewayInfo, F
 
         return self._get_observation(state), state
 
-    @partial(jax.jit, static_argnums=(0,))
-    def step(self, state: FreewayState, action: int) -> tuple[FreewayObservation, FreewayState, float, bool, FreewayInfo]:
-        """Take a step in the game given an action"""
+    @stage("chicken_step")
+    def _chicken_step(self, state: FreewayState, action: int) -> Tuple[chex.Array, chex.Array]:
         # Update chicken position if not in cooldown
         dy = jnp.where(
             jnp.logical_and(state.cooldown > 30, state.cooldown < 54), # throw the chicken back for 24 frames
@@ -161,6 +163,10 @@ class JaxFreeway(JaxEnvironment[FreewayState, FreewayObservation, FreewayInfo, F
             self.consts.bottom_border + self.consts.chicken_height - 1,
         ).astype(jnp.int32)
 
+        return new_y, new_walking_frames
+
+    @stage("cars_step")
+    def _cars_step(self, state: FreewayState) -> chex.Array:
         # Update car positions
         new_cars = state.cars
         for lane in range(self.consts.num_lanes):
@@ -187,6 +193,10 @@ class JaxFreeway(JaxEnvironment[FreewayState, FreewayObservation, FreewayInfo, F
 
             new_cars = new_cars.at[lane, 0].set(new_x)
 
+        return new_cars
+
+    @stage("collision_step")
+    def _collision_step(self, state: FreewayState, new_cars: chex.Array) -> chex.Array:
         # Check for collisions
         def check_collision(car_pos):
             car_x, car_y = car_pos
@@ -207,6 +217,14 @@ class JaxFreeway(JaxEnvironment[FreewayState, FreewayObservation, FreewayInfo, F
         any_collision = jax.lax.cond(
             state.cooldown > 0, lambda _: False, lambda _: any_collision, operand=None
         )
+        return any_collision
+
+    @partial(jax.jit, static_argnums=(0,))
+    def step(self, state: FreewayState, action: int) -> tuple[FreewayObservation, FreewayState, float, bool, FreewayInfo]:
+        """Take a step in the game given an action"""
+        new_y, new_walking_frames = self._chicken_step(state, action)
+        new_cars = self._cars_step(state)
+        any_collision = self._collision_step(state, new_cars)
 
         # Update cooldown
         new_cooldown = jnp.where(
@@ -255,6 +273,7 @@ class JaxFreeway(JaxEnvironment[FreewayState, FreewayObservation, FreewayInfo, F
         return obs, new_state, env_reward, done, info
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_observation")
     def _get_observation(self, state: FreewayState):
         # create chicken
         chicken = EntityPosition(
@@ -282,14 +301,17 @@ class JaxFreeway(JaxEnvironment[FreewayState, FreewayObservation, FreewayInfo, F
         return FreewayObservation(chicken=chicken, car=cars, score=state.score)
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_info")
     def _get_info(self, state: FreewayState, all_rewards: chex.Array = None) -> FreewayInfo:
         return FreewayInfo(time=state.time, all_rewards=all_rewards)
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_reward")
     def _get_reward(self, previous_state: FreewayState, state: FreewayState):
         return state.score - previous_state.score
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_all_reward")
     def _get_all_reward(self, previous_state: FreewayState, state: FreewayState):
         if self.reward_funcs is None:
             return jnp.zeros(1)
@@ -299,6 +321,7 @@ class JaxFreeway(JaxEnvironment[FreewayState, FreewayObservation, FreewayInfo, F
         return rewards
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_done")
     def _get_done(self, state: FreewayState) -> bool:
         return state.game_over
 
@@ -370,6 +393,8 @@ class FreewayRenderer(JAXGameRenderer):
         super().__init__()
         self.consts = consts or FreewayConstants()
         self.sprites, self.offsets = self._load_sprites()
+        # palette-index versions of all sprites for render_indexed
+        self.indexed_sprites = {name: jr.index_sprite(sprite, self.palette) for name, sprite in self.sprites.items()}
 
     def _load_sprites(self):
         """Load all sprites required for Freeway rendering."""
@@ -420,24 +445,36 @@ class FreewayRenderer(JAXGameRenderer):
 
         return sprites, offsets
 
+    def palette_sources(self):
+        return list(self.sprites.values()), []
+
     @partial(jax.jit, static_argnums=(0,))
     def render(self, state):
         """Render the game state to a raster image."""
         raster = jr.create_initial_frame(width=160, height=210)
+        return self._draw(raster, state, self.sprites)
+
+    @partial(jax.jit, static_argnums=(0,))
+    def render_indexed(self, state):
+        raster = jr.create_initial_index_frame(width=160, height=210)
+        return self._draw(raster, state, self.indexed_sprites)
+
+    def _draw(self, raster, state, sprites):
+        """Draws the game onto an RGB or palette-index raster with the matching sprites."""
 
         # draw the background
-        background = jr.get_sprite_frame(self.sprites['background'], 0)
+        background = jr.get_sprite_frame(sprites['background'], 0)
 
-        raster = jr.render_at(raster,0, 0, background)
+        raster = jr.blit(raster,0, 0, background)
 
         # draw fixed 2nd chicken at x=110 and y=self.consts.bottom_border + self.consts.chicken_height - 1
-        chicken_idle = jr.get_sprite_frame(self.sprites['player_idle'], 0)
-        chicken_walk = jr.get_sprite_frame(self.sprites['player_walk'], 0)
-        chicken_hit = jr.get_sprite_frame(self.sprites['player_hit'], 0)
+        chicken_idle = jr.get_sprite_frame(sprites['player_idle'], 0)
+        chicken_walk = jr.get_sprite_frame(sprites['player_walk'], 0)
+        chicken_hit = jr.get_sprite_frame(sprites['player_hit'], 0)
         chicken_idle_offset = self.offsets['player_idle']
         chicken_walk_offset = self.offsets['player_walk']
         chicken_hit_offset = self.offsets['player_hit']
-        raster = jr.render_at(raster, 110, self.consts.bottom_border + self.consts.chicken_height - 1, chicken_idle, flip_offset=chicken_idle_offset)
+        raster = jr.blit(raster, 110, self.consts.bottom_border + self.consts.chicken_height - 1, chicken_idle, flip_offset=chicken_idle_offset)
 
         # select a frame based on the walking frames (0-3 for walk, 4-7 for idle, repeat)
         use_idle = state.walking_frames < 4
@@ -462,38 +499,38 @@ class FreewayRenderer(JAXGameRenderer):
             lambda: chicken_hit_offset,
             lambda: chicken_offset,
         )
-        raster = jr.render_at(raster, self.consts.chicken_x, state.chicken_y, chicken, flip_offset=chicken_offset)
+        raster = jr.blit(raster, self.consts.chicken_x, state.chicken_y, chicken, flip_offset=chicken_offset)
 
         # render the cars in the correct color (starting from the top: dark red, light green, dark green, light red, blue, brown, light blue, red, green, yellow)
-        dark_red = jr.get_sprite_frame(self.sprites['car_dark_red'], 0)
-        raster = jr.render_at(raster, state.cars[0, 0], state.cars[0, 1], dark_red)
+        dark_red = jr.get_sprite_frame(sprites['car_dark_red'], 0)
+        raster = jr.blit(raster, state.cars[0, 0], state.cars[0, 1], dark_red)
 
-        light_green = jr.get_sprite_frame(self.sprites['car_light_green'], 0)
-        raster = jr.render_at(raster, state.cars[1, 0], state.cars[1, 1], light_green)
+        light_green = jr.get_sprite_frame(sprites['car_light_green'], 0)
+        raster = jr.blit(raster, state.cars[1, 0], state.cars[1, 1], light_green)
 
-        dark_green = jr.get_sprite_frame(self.sprites['car_dark_green'], 0)
-        raster = jr.render_at(raster, state.cars[2, 0], state.cars[2, 1], dark_green)
+        dark_green = jr.get_sprite_frame(sprites['car_dark_green'], 0)
+        raster = jr.blit(raster, state.cars[2, 0], state.cars[2, 1], dark_green)
 
-        light_red = jr.get_sprite_frame(self.sprites['car_light_red'], 0)
-        raster = jr.render_at(raster, state.cars[3, 0], state.cars[3, 1], light_red)
+        light_red = jr.get_sprite_frame(sprites['car_light_red'], 0)
+        raster = jr.blit(raster, state.cars[3, 0], state.cars[3, 1], light_red)
 
-        blue = jr.get_sprite_frame(self.sprites['car_blue'], 0)
-        raster = jr.render_at(raster, state.cars[4, 0], state.cars[4, 1], blue)
+        blue = jr.get_sprite_frame(sprites['car_blue'], 0)
+        raster = jr.blit(raster, state.cars[4, 0], state.cars[4, 1], blue)
 
-        brown = jr.get_sprite_frame(self.sprites['car_brown'], 0)
-        raster = jr.render_at(raster, state.cars[5, 0], state.cars[5, 1], brown)
+        brown = jr.get_sprite_frame(sprites['car_brown'], 0)
+        raster = jr.blit(raster, state.cars[5, 0], state.cars[5, 1], brown)
 
-        light_blue = jr.get_sprite_frame(self.sprites['car_light_blue'], 0)
-        raster = jr.render_at(raster, state.cars[6, 0], state.cars[6, 1], light_blue)
+        light_blue = jr.get_sprite_frame(sprites['car_light_blue'], 0)
+        raster = jr.blit(raster, state.cars[6, 0], state.cars[6, 1], light_blue)
 
-        red = jr.get_sprite_frame(self.sprites['car_red'], 0)
-        raster = jr.render_at(raster, state.cars[7, 0], state.cars[7, 1], red)
+        red = jr.get_sprite_frame(sprites['car_red'], 0)
+        raster = jr.blit(raster, state.cars[7, 0], state.cars[7, 1], red)
 
-        green = jr.get_sprite_frame(self.sprites['car_green'], 0)
-        raster = jr.render_at(raster, state.cars[8, 0], state.cars[8, 1], green)
+        green = jr.get_sprite_frame(sprites['car_green'], 0)
+        raster = jr.blit(raster, state.cars[8, 0], state.cars[8, 1], green)
 
-        yellow = jr.get_sprite_frame(self.sprites['car_yellow'], 0)
-        raster = jr.render_at(raster, state.cars[9, 0], state.cars[9, 1], yellow)
+        yellow = jr.get_sprite_frame(sprites['car_yellow'], 0)
+        raster = jr.blit(raster, state.cars[9, 0], state.cars[9, 1], yellow)
 
         # ----------- SCORE -------------
         # Define score positions and spacing
@@ -504,53 +541,20 @@ class FreewayRenderer(JAXGameRenderer):
         max_score_digits = 2
 
         # Get digit sprites
-        digit_sprites = self.sprites.get('score', None)
+        digit_sprites = sprites.get('score', None)
 
         # Define the function to render scores if sprites are available
         def render_scores(raster_to_update):
             # --- Player Score (Left) ---
-            # Convert score to digit indices (always 2, e.g., 0 -> [0,0], 10 -> [1,0])
-            player_score_digits_indices = jr.int_to_digits(state.score, max_digits=max_score_digits)
-
-            # Determine parameters based on score magnitude
-            is_player_single_digit = state.score < 10
-
-            # Start index in player_score_digits_indices:
-            # - If single digit (e.g., score=5 -> indices=[0,5]), start reading at index 1 to get the '5'.
-            # - If double digit (e.g., score=12 -> indices=[1,2]), start reading at index 0 to get '1' then '2'.
-            player_start_index = jax.lax.select(is_player_single_digit, 1, 0)
-
-            # Number of digits to render: 1 for single, 2 for double
-            player_num_to_render = jax.lax.select(is_player_single_digit, 1, 2)
-
-            # Calculate the starting X position for rendering:
-            # - If single digit, render starts at player_score_rightmost_digit_x.
-            # - If double digit, render starts score_spacing pixels *before* player_score_rightmost_digit_x,
-            #   so the second digit ('0' in '10') aligns correctly at player_score_rightmost_digit_x.
-            player_render_x = jax.lax.select(is_player_single_digit,
-                                             player_score_rightmost_digit_x,
-                                             player_score_rightmost_digit_x - score_spacing)
-
-            # Render player score using selective rendering
-            raster_updated = jr.render_label_selective(raster_to_update, player_render_x, score_y,
-                                                       player_score_digits_indices, digit_sprites[0],
-                                                       player_start_index, player_num_to_render,
-                                                       spacing=score_spacing)
+            # Two-digit field ending at the rightmost digit, a leading zero is left out (5 -> "5", 12 -> "12")
+            raster_updated = jr.render_number(raster_to_update,
+                                              player_score_rightmost_digit_x - (max_score_digits - 1) * score_spacing,
+                                              score_y, state.score, digit_sprites[0], max_score_digits, score_spacing,
+                                              hide_leading_zeros=True)
 
             # --- Enemy Score (Right - rendering a Dummy '0' since the right player is not playable) ---
-            enemy_score = 0
-            enemy_score_digits_indices = jr.int_to_digits(enemy_score, max_digits=max_score_digits)  # [0, 0]
-            # Parameters for single digit '0'
-            enemy_start_index = 1  # Read the second '0' from indices [0, 0]
-            enemy_num_to_render = 1  # Render only one digit
-            # Render the enemy '0' starting at its designated rightmost position
-            enemy_render_x = enemy_score_rightmost_digit_x
-
-            # Render enemy score using selective rendering
-            raster_final = jr.render_label_selective(raster_updated, enemy_render_x, score_y,
-                                                     enemy_score_digits_indices, digit_sprites[0],
-                                                     enemy_start_index, enemy_num_to_render,
-                                                     spacing=score_spacing)  # Spacing doesn't matter here
+            raster_final = jr.render_number(raster_updated, enemy_score_rightmost_digit_x, score_y, 0,
+                                            digit_sprites[0], 1, score_spacing)
             return raster_final
 
         # Render scores conditionally
@@ -562,8 +566,8 @@ class FreewayRenderer(JAXGameRenderer):
         )
 
         # Force the first 8 columns (x=0 to x=7) to be black (KEEP THIS PART)
-        # Frame is (Height, Width, Channels) so we index as [y_range, x_range, :]
+        # rows and columns are the first two axes for RGB and index rasters
         bar_width = 8
-        raster = raster.at[:, :bar_width, :].set(0)
+        raster = raster.at[:, :bar_width].set(0)
 
         return raster
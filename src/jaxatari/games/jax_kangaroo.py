@@ -8,6 +8,7 @@ from jax import Array
 
 import jaxatari.spaces as spaces
 from jaxatari.environment import JaxEnvironment, JAXAtariAction as Action
+from jaxatari.profile import stage
 from jaxatari.renderers import JAXGameRenderer
 import jaxatari.rendering.jax_rendering_utils as jr
 from jaxatari.games.kangaroo_levels import (
@@ -217,7 +218,6 @@ class JaxKangaroo(JaxEnvironment[KangarooState, KangarooObservation, KangarooInf
         ]
         self.consts = consts or KangarooConstants()
         self.obs_size = 111
-        self.renderer = KangarooRenderer(self.consts)
 
     @partial(jax.jit, static_argnums=(0,))
     def _get_valid_platforms(self, level_constants: LevelConstants) -> chex.Array:
@@ -621,6 +621,7 @@ class JaxKangaroo(JaxEnvironment[KangarooState, KangarooObservation, KangarooInf
         return jnp.where(has_platform_below, platform_y, jnp.array(1000))
 
     @partial(jax.jit, static_argnums=(0,), donate_argnums=(1,))
+    @stage("fruits_step")
     def _fruits_step(self, state: KangarooState) -> Tuple[chex.Array, chex.Array]:
         fruit_x = state.level.fruit_positions[:, 0]
         fruit_y = state.level.fruit_positions[:, 1]
@@ -689,6 +690,7 @@ class JaxKangaroo(JaxEnvironment[KangarooState, KangarooObservation, KangarooInf
         return new_score, activations, new_stages, counter
 
     @partial(jax.jit, static_argnums=(0,), donate_argnums=(1,))
+    @stage("child_step")
     def _child_step(self, state: KangarooState) -> Tuple[chex.Array]:
         RESET_TIMER_AFTER = 50
 
@@ -756,6 +758,7 @@ class JaxKangaroo(JaxEnvironment[KangarooState, KangarooObservation, KangarooInf
         )
 
     @partial(jax.jit, static_argnums=(0,), donate_argnums=(1,))
+    @stage("player_step")
     def _player_step(self, state: KangarooState, action: chex.Array):
         level_constants = self._get_level_constants(state.current_level)
         x, y = state.player.x, state.player.y
@@ -988,12 +991,14 @@ class JaxKangaroo(JaxEnvironment[KangarooState, KangarooObservation, KangarooInf
         )
 
     @partial(jax.jit, static_argnums=(0,), donate_argnums=(1,))
+    @stage("timer_controller")
     def _timer_controller(self, state: KangarooState):
         return jnp.where(
             state.level.step_counter == 255, state.level.timer - 100, state.level.timer
         )
 
     @partial(jax.jit, static_argnums=(0,), donate_argnums=(1,))
+    @stage("next_level")
     def _next_level(self, state: KangarooState):
         RESET_AFTER_TICKS = 256
 
@@ -1011,6 +1016,7 @@ class JaxKangaroo(JaxEnvironment[KangarooState, KangarooObservation, KangarooInf
         return current_level, counter, reset_coords, levelup
 
     @partial(jax.jit, static_argnums=(0,), donate_argnums=(1,))
+    @stage("lives_controller")
     def _lives_controller(self, state: KangarooState):
         is_time_over = state.level.timer <= 0
 
@@ -1133,6 +1139,7 @@ class JaxKangaroo(JaxEnvironment[KangarooState, KangarooObservation, KangarooInf
 
 
     @partial(jax.jit, static_argnums=(0,), donate_argnums=(1,))
+    @stage("falling_coconut_controller")
     def _falling_coconut_controller(self, state: KangarooState, punching: chex.Array):
         falling_coco_exists = (state.level.falling_coco_position[0] != 13) | (
             state.level.falling_coco_position[1] != -1
@@ -1254,6 +1261,7 @@ class JaxKangaroo(JaxEnvironment[KangarooState, KangarooObservation, KangarooInf
         )
 
     @partial(jax.jit, static_argnums=(0,), donate_argnums=(1,))
+    @stage("monkey_controller")
     def _monkey_controller(self, state: KangarooState, punching: chex.Array):
         current_monkeys_existing = jnp.sum(state.level.monkey_states != 0)
 
@@ -1615,6 +1623,9 @@ class JaxKangaroo(JaxEnvironment[KangarooState, KangarooObservation, KangarooInf
             dtype=jnp.uint8
         )
 
+    def _create_renderer(self):
+        return KangarooRenderer(self.consts)
+
     @partial(jax.jit, static_argnums=(0,))
     def reset(self, key=None) -> Tuple[
         KangarooObservation,
@@ -1625,6 +1636,7 @@ class JaxKangaroo(JaxEnvironment[KangarooState, KangarooObservation, KangarooInf
         return obs, state
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("reset_level")
     def reset_level(self, next_level=1) -> KangarooState:
         next_level = jnp.clip(next_level, 1, 3)
         level_constants: LevelConstants = self._get_level_constants(next_level)
@@ -1908,6 +1920,7 @@ class JaxKangaroo(JaxEnvironment[KangarooState, KangarooObservation, KangarooInf
         return observation, new_state, env_reward, done, info
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_observation")
     def _get_observation(self, state: KangarooState) -> KangarooObservation:
         fruit_mask = state.level.fruit_actives[:, jnp.newaxis]
         fruit_positions = jnp.where(
@@ -1949,6 +1962,7 @@ class JaxKangaroo(JaxEnvironment[KangarooState, KangarooObservation, KangarooInf
         )
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_info")
     def _get_info(self, state: KangarooState, all_rewards: chex.Array) -> KangarooInfo:
         return KangarooInfo(
             score=state.score,
@@ -1957,12 +1971,14 @@ class JaxKangaroo(JaxEnvironment[KangarooState, KangarooObservation, KangarooInf
         )
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_env_reward")
     def _get_env_reward(
         self, previous_state: KangarooState, state: KangarooState
     ) -> float:
         return state.score - previous_state.score
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_all_rewards")
     def _get_all_rewards(
         self, previous_state: KangarooState, state: KangarooState
     ) -> chex.Array:
@@ -1974,6 +1990,7 @@ class JaxKangaroo(JaxEnvironment[KangarooState, KangarooObservation, KangarooInf
         return rewards
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_done")
     def _get_done(self, state: KangarooState) -> bool:
         return jnp.logical_and(state.lives <= 0, state.player.y == 188)
 
@@ -1993,6 +2010,13 @@ class KangarooRenderer(JAXGameRenderer):
         self.consts = consts or KangarooConstants()
         self.sprite_path = f"{os.path.dirname(os.path.abspath(__file__))}/sprites/kangaroo"
         self.sprites, self.pivots = self._load_sprites()
+        # Atlases for the entity arrays that are drawn in one render_many pass
+        self.fruit_keys = ['strawberry', 'tomato', 'cherry', 'pineapple']
+        self.fruit_atlas = jnp.stack([self.sprites[key][0] for key in self.fruit_keys])
+        # Indexed by monkey state: 0 non-existent, 1 down, 2 left, 3 throwing, 4 right, 5 up
+        self.monkey_keys = ['ape_standing', 'ape_climb_left', 'ape_moving', 'throwing_ape', 'ape_moving', 'ape_climb_right']
+        self.monkey_atlas = jnp.stack([self.sprites[key][0] for key in self.monkey_keys])
+        self.monkey_pivots = jnp.stack([self.pivots.get(key, jnp.array([0.0, 0.0])) for key in self.monkey_keys])
         # Store background sprites directly for use in render function
         self.background_0 = self.sprites.get('background_0')
         self.background_1 = self.sprites.get('background_1')
@@ -2003,6 +2027,12 @@ class KangarooRenderer(JAXGameRenderer):
         self.ladder_color = jnp.array([162, 98, 33], dtype=jnp.uint8)
         # platform constants
         self.platform_color = jnp.array([162, 98, 33], dtype=jnp.uint8)
+        # palette-index versions of all sprites and colors for render_indexed
+        self.indexed_sprites = {name: jr.index_sprite(sprite, self.palette) for name, sprite in self.sprites.items()}
+        self.indexed_fruit_atlas = jr.index_sprite(self.fruit_atlas, self.palette)
+        self.indexed_monkey_atlas = jr.index_sprite(self.monkey_atlas, self.palette)
+        self.indexed_ladder_color = jr.rgb_to_palette_index(self.ladder_color, self.palette)
+        self.indexed_platform_color = jr.rgb_to_palette_index(self.platform_color, self.palette)
 
     def _load_sprites(self) -> tuple[Dict[str, Any], Dict[str, Any]]:
         """Loads all necessary sprites from .npy files and stores pivots."""
@@ -2108,6 +2138,9 @@ class KangarooRenderer(JAXGameRenderer):
 
         return sprites, pad_offsets
 
+    def palette_sources(self):
+        return list(self.sprites.values()), [self.platform_color, self.ladder_color]
+
     # Apply JIT compilation. static_argnums=(0,) means 'self' is static.
     @partial(jax.jit, static_argnums=(0,))
     def render(self, state: KangarooState) -> chex.Array:
@@ -2122,13 +2155,31 @@ class KangarooRenderer(JAXGameRenderer):
             A JAX array representing the rendered game screen (HEIGHT, WIDTH, 3), dtype=uint8.
         """
 
-        # --- Select and Render Background ---
         # Initialize raster using the consistent function
         raster = jr.create_initial_frame(width=160, height=210)
+        return self._draw(
+            raster, state, self.sprites, self.fruit_atlas, self.monkey_atlas, self.platform_color, self.ladder_color
+        )
 
-        background_sprite = self.sprites.get('background')
+    @partial(jax.jit, static_argnums=(0,))
+    def render_indexed(self, state: KangarooState) -> chex.Array:
+        raster = jr.create_initial_index_frame(width=160, height=210)
+        return self._draw(
+            raster,
+            state,
+            self.indexed_sprites,
+            self.indexed_fruit_atlas,
+            self.indexed_monkey_atlas,
+            self.indexed_platform_color,
+            self.indexed_ladder_color,
+        )
+
+    def _draw(self, raster, state, sprites, fruit_atlas, monkey_atlas, platform_color, ladder_color):
+        """Draws the game onto an RGB or palette-index raster with the matching sprites and colors."""
+        # --- Select and Render Background ---
+        background_sprite = sprites.get('background')
         background_sprite = jr.get_sprite_frame(background_sprite, 0)
-        raster = jr.render_at(raster, 0, 0, background_sprite)
+        raster = jr.blit(raster, 0, 0, background_sprite)
 
         # --- Draw the current platforms ---
 
@@ -2151,7 +2202,6 @@ class KangarooRenderer(JAXGameRenderer):
 
         platform_positions = state.level.platform_positions
         platform_sizes = state.level.platform_sizes
-        platform_color = self.platform_color
 
         # Create coordinate grids once for the entire raster
         xx, yy = jnp.meshgrid(jnp.arange(self.consts.SCREEN_WIDTH), jnp.arange(self.consts.SCREEN_HEIGHT), indexing='xy')
@@ -2167,7 +2217,9 @@ class KangarooRenderer(JAXGameRenderer):
         combined_platform_mask = jnp.logical_or.reduce(all_platform_masks, axis=0)
 
         # Apply the combined mask to the raster in one operation
-        raster = jnp.where(combined_platform_mask[..., None], platform_color, raster)
+        # the mask gets a channel axis for RGB rasters only
+        combined_platform_mask = combined_platform_mask.reshape(combined_platform_mask.shape + (1,) * (raster.ndim - 2))
+        raster = jnp.where(combined_platform_mask, platform_color, raster)
     
 
         def create_single_ladder_mask(pos, size, xx, yy, rung_height, space_height):
@@ -2221,44 +2273,22 @@ class KangarooRenderer(JAXGameRenderer):
         combined_mask = jnp.logical_or.reduce(all_masks, axis=0)
 
         # Apply the combined mask to the raster in one operation
-        raster = jnp.where(combined_mask[..., None], self.ladder_color, raster)
+        combined_mask = combined_mask.reshape(combined_mask.shape + (1,) * (raster.ndim - 2))
+        raster = jnp.where(combined_mask, ladder_color, raster)
 
         # --- Draw fruits ---
         fruit_positions = state.level.fruit_positions
         fruit_actives = state.level.fruit_actives
 
-        def _draw_fruit(i, current_raster):
-            # get the current fruit type using the fruit_stages array
-            fruit_type = state.level.fruit_stages[i].astype(int)
-
-            fruit_sprite = jax.lax.switch(
-                fruit_type,
-                [
-                    lambda: self.sprites.get('strawberry'), # Case 0
-                    lambda: self.sprites.get('tomato'),    # Case 1
-                    lambda: self.sprites.get('cherry'),    # Case 2
-                    lambda: self.sprites.get('pineapple'),  # Case 3
-                ]
-            )
-
-            fruit_pivot = jax.lax.switch(
-                fruit_type,
-                [
-                    lambda: self.pivots.get('strawberry', jnp.array([0.0, 0.0])),
-                    lambda: self.pivots.get('tomato', jnp.array([0.0, 0.0])),
-                    lambda: self.pivots.get('cherry', jnp.array([0.0, 0.0])),
-                    lambda: self.pivots.get('pineapple', jnp.array([0.0, 0.0])),
-                ]
-            )
-
-            should_draw = jnp.logical_and(fruit_actives[i], fruit_sprite is not None)
-            pos = fruit_positions[i]
-            def render_fruit_sprite(raster_to_update):
-                return jr.render_at(raster_to_update, pos[0].astype(int), pos[1].astype(int), jr.get_sprite_frame(fruit_sprite, 0), flip_offset=fruit_pivot)
-            return jax.lax.cond(should_draw, render_fruit_sprite, lambda r: r, current_raster)
-
-        num_fruits_to_draw = fruit_positions.shape[0]
-        raster = jax.lax.fori_loop(0, num_fruits_to_draw, _draw_fruit, raster)
+        raster = jr.render_many(
+            raster,
+            fruit_positions[:, 0].astype(int),
+            fruit_positions[:, 1].astype(int),
+            state.level.fruit_stages.astype(int),
+            fruit_atlas,
+            False,
+            fruit_actives,
+        )
 
         # --- Draw Bell ---
         # if the bell_animation is: 192-176, 143-128, 95-80, 47-32 draw the alternate bell sprite
@@ -2274,8 +2304,8 @@ class KangarooRenderer(JAXGameRenderer):
 
         bell_sprite = jax.lax.cond(
             jnp.logical_or(bell_in_range_left, bell_in_range_right),
-            lambda: self.sprites.get('ringing_bell'),
-            lambda: self.sprites.get('bell')
+            lambda: sprites.get('ringing_bell'),
+            lambda: sprites.get('bell')
         )
         bell_pivot = jax.lax.cond(
             jnp.logical_or(bell_in_range_left, bell_in_range_right),
@@ -2290,69 +2320,35 @@ class KangarooRenderer(JAXGameRenderer):
         should_draw_bell = jnp.logical_and(jnp.logical_and(not_all_fruits_collected, bell_pos_valid), sprite_is_valid)
 
         def draw_bell_func(current_raster):
-            return jr.render_at(current_raster, bell_pos[0].astype(int), bell_pos[1].astype(int), jr.get_sprite_frame(bell_sprite, 0), flip_horizontal=bell_in_range_left, flip_offset=bell_pivot)
+            return jr.blit(current_raster, bell_pos[0].astype(int), bell_pos[1].astype(int), jr.get_sprite_frame(bell_sprite, 0), flip_horizontal=bell_in_range_left, flip_offset=bell_pivot)
         raster = jax.lax.cond(should_draw_bell, draw_bell_func, lambda r: r, raster)
 
         # --- Draw monkeys (Apes) ---
         monkey_positions = state.level.monkey_positions
         monkey_states = state.level.monkey_states
 
-        def _draw_monkey(i, current_raster):
-            state_idx = monkey_states[i].astype(int)
-            pos = monkey_positions[i]
-            should_draw = state_idx != 0
-            """
-            - 0: non-existent
-            - 1: moving down
-            - 2: moving left
-            - 3: throwing
-            - 4: moving right
-            - 5: moving up
-            """
-            monkey_sprite = jax.lax.switch(
-                state_idx,
-                [
-                    lambda: self.sprites.get('ape_standing'), # Case 0
-                    lambda: self.sprites.get('ape_climb_left'),    # Case 1
-                    lambda: self.sprites.get('ape_moving'),    # Case 2
-                    lambda: self.sprites.get('throwing_ape'),  # Case 3
-                    lambda: self.sprites.get('ape_moving'),    # Case 4
-                    lambda: self.sprites.get('ape_climb_right'),# Case 5
-                ]
-            )
-
-            monkey_pivot = jax.lax.switch(
-                state_idx,
-                [
-                    lambda: self.pivots.get('ape_standing', jnp.array([0.0, 0.0])),
-                    lambda: self.pivots.get('ape_climb_left', jnp.array([0.0, 0.0])),
-                    lambda: self.pivots.get('ape_moving', jnp.array([0.0, 0.0])),
-                    lambda: self.pivots.get('throwing_ape', jnp.array([0.0, 0.0])),
-                    lambda: self.pivots.get('ape_moving', jnp.array([0.0, 0.0])),
-                    lambda: self.pivots.get('ape_climb_right', jnp.array([0.0, 0.0])),
-                ]
-            )
-
-            # in case its state_idx 2 or 4 and the counter is % 16, use standing instead of moving
-            monkey_sprite, monkey_pivot = jax.lax.cond(
-                jnp.logical_and(
-                    (state.level.step_counter % 32) < 16,
-                    jnp.logical_or(state_idx == 2, state_idx == 4)
-                ),
-                lambda: (self.sprites.get('ape_standing'), self.pivots.get('ape_standing', jnp.array([0.0, 0.0]))),
-                lambda: (monkey_sprite, monkey_pivot)
-            )
-
-            is_moving_left = (state_idx == 4)
-            flip_h = is_moving_left
-            sprite_is_valid = monkey_sprite is not None
-            should_draw = jnp.logical_and(should_draw, sprite_is_valid)
-            def render_monkey_sprite(raster_to_update):
-                return jr.render_at(raster_to_update, pos[0].astype(int), pos[1].astype(int), jr.get_sprite_frame(monkey_sprite, 0), flip_horizontal=flip_h, flip_offset=monkey_pivot)
-            return jax.lax.cond(should_draw, render_monkey_sprite, lambda r: r, current_raster)
-
-        num_monkeys_to_draw = monkey_positions.shape[0]
-        raster = jax.lax.fori_loop(0, num_monkeys_to_draw, _draw_monkey, raster)
+        # in case its moving left or right and the counter is % 16, use standing instead of moving
+        monkey_ids = monkey_states.astype(int)
+        monkey_ids = jnp.where(
+            jnp.logical_and(
+                (state.level.step_counter % 32) < 16,
+                jnp.logical_or(monkey_ids == 2, monkey_ids == 4)
+            ),
+            0,
+            monkey_ids
+        )
+        # monkeys moving right (state 4) are flipped
+        monkey_flips = monkey_states.astype(int) == 4
+        raster = jr.render_many(
+            raster,
+            monkey_positions[:, 0].astype(int),
+            monkey_positions[:, 1].astype(int),
+            monkey_ids,
+            monkey_atlas,
+            monkey_flips,
+            monkey_states.astype(int) != 0,
+            flip_offsets=self.monkey_pivots[monkey_ids],
+        )
 
         # --- Draw player (Kangaroo) ---
         player_pos_x = state.player.x
@@ -2360,17 +2356,17 @@ class KangarooRenderer(JAXGameRenderer):
         player_orientation = state.player.orientation
         flip_player = player_orientation < 0
         sprite_lambda = jax.lax.cond(
-            state.player.is_crashing, lambda: self.sprites.get('kangaroo_dead'),
+            state.player.is_crashing, lambda: sprites.get('kangaroo_dead'),
             lambda: jax.lax.cond(
-                state.player.is_climbing, lambda: self.sprites.get('kangaroo_climb'),
+                state.player.is_climbing, lambda: sprites.get('kangaroo_climb'),
                 lambda: jax.lax.cond(
-                    state.player.is_crouching, lambda: self.sprites.get('kangaroo_ducking'),
+                    state.player.is_crouching, lambda: sprites.get('kangaroo_ducking'),
                     lambda: jax.lax.cond(
-                        state.player.is_jumping, lambda: self.sprites.get('kangaroo_jump'),
+                        state.player.is_jumping, lambda: sprites.get('kangaroo_jump'),
                         lambda: jax.lax.cond(
                             state.player.punch_left | state.player.punch_right,
-                            lambda: self.sprites.get('kangaroo_boxing'),
-                            lambda: self.sprites.get('kangaroo')
+                            lambda: sprites.get('kangaroo_boxing'),
+                            lambda: sprites.get('kangaroo')
                         )
                     )
                 )
@@ -2398,14 +2394,14 @@ class KangarooRenderer(JAXGameRenderer):
 
         sprite_lambda = jax.lax.cond(
             is_walking_anim,
-            lambda: self.sprites.get('kangaroo_walk'),
+            lambda: sprites.get('kangaroo_walk'),
             lambda: sprite_lambda
         )
 
         # in case the player_animation is between 17 and 25, use high jump
         sprite_lambda = jax.lax.cond(
             jnp.logical_and(state.player.jump_counter > 16, state.player.jump_counter < 25),
-            lambda: self.sprites.get('kangaroo_jump_high'),
+            lambda: sprites.get('kangaroo_jump_high'),
             lambda: sprite_lambda
         )
 
@@ -2432,7 +2428,7 @@ class KangarooRenderer(JAXGameRenderer):
         )
         sprite_is_valid = player_sprite is not None
         def render_player_sprite(raster_to_update):
-             return jr.render_at(raster_to_update,
+             return jr.blit(raster_to_update,
                                  player_pos_x.astype(int),
                                  player_pos_y.astype(int),
                                  jr.get_sprite_frame(player_sprite, 0),
@@ -2446,54 +2442,52 @@ class KangarooRenderer(JAXGameRenderer):
         # if the velocity is negative, flip horizontal
         child_flip = state.level.child_velocity > 0
         child_sprite_lambda = jax.lax.cond(
-            is_jumping, lambda: self.sprites.get('child_jump'), lambda: self.sprites.get('child')
+            is_jumping, lambda: sprites.get('child_jump'), lambda: sprites.get('child')
         )
         child_sprite = child_sprite_lambda
         should_draw_child = jnp.logical_and(child_pos[0] != -1, child_sprite is not None)
         child_pivot = self.pivots.get('child', jnp.array([0.0, 0.0]))
         def draw_child_func(current_raster):
-            return jr.render_at(current_raster, child_pos[0].astype(int), child_pos[1].astype(int), jr.get_sprite_frame(child_sprite, 0), flip_horizontal=child_flip, flip_offset=child_pivot)
+            return jr.blit(current_raster, child_pos[0].astype(int), child_pos[1].astype(int), jr.get_sprite_frame(child_sprite, 0), flip_horizontal=child_flip, flip_offset=child_pivot)
         raster = jax.lax.cond(should_draw_child, draw_child_func, lambda r: r, raster)
 
         # --- Draw falling coconut ---
         falling_coco_pos = state.level.falling_coco_position
-        coco_sprite = self.sprites.get('thrown_coconut', None)
+        coco_sprite = sprites.get('thrown_coconut', None)
         should_draw_falling_coco = jnp.logical_and(falling_coco_pos[1] != -1, coco_sprite is not None)
         coco_pivot = self.pivots.get('thrown_coconut', jnp.array([0.0, 0.0]))
         def draw_falling_coco_func(current_raster):
-            return jr.render_at(current_raster, falling_coco_pos[0].astype(int), falling_coco_pos[1].astype(int), jr.get_sprite_frame(coco_sprite, 0), flip_offset=coco_pivot)
+            return jr.blit(current_raster, falling_coco_pos[0].astype(int), falling_coco_pos[1].astype(int), jr.get_sprite_frame(coco_sprite, 0), flip_offset=coco_pivot)
         raster = jax.lax.cond(should_draw_falling_coco, draw_falling_coco_func, lambda r: r, raster)
 
         # --- Draw thrown coconuts ---
         coco_positions = state.level.coco_positions
         coco_states = state.level.coco_states
-        coco_sprite = self.sprites.get('coconut', None)
+        coco_sprite = sprites.get('coconut', None)
         coco_pivot = self.pivots.get('coconut', jnp.array([0.0, 0.0]))
         def _draw_coco(i, current_raster):
             should_draw = jnp.logical_and(coco_states[i] != 0, coco_sprite is not None)
             pos = coco_positions[i]
             def render_coco_sprite(raster_to_update):
-                return jr.render_at(raster_to_update, pos[0].astype(int), pos[1].astype(int), jr.get_sprite_frame(coco_sprite, 0), flip_offset=coco_pivot)
+                return jr.blit(raster_to_update, pos[0].astype(int), pos[1].astype(int), jr.get_sprite_frame(coco_sprite, 0), flip_offset=coco_pivot)
             return jax.lax.cond(should_draw, render_coco_sprite, lambda r: r, current_raster)
         num_cocos_to_draw = coco_positions.shape[0]
         raster = jax.lax.fori_loop(0, num_cocos_to_draw, _draw_coco, raster)
 
         # --- Draw UI ---
         # Score
-        digit_sprites = self.sprites.get('digits', None)
-        score_digits_indices = jr.int_to_digits(state.score, max_digits=6)
-        raster = jr.render_label(raster, 105, 182, score_digits_indices, digit_sprites[0], spacing=8)
+        digit_sprites = sprites.get('digits', None)
+        raster = jr.render_number(raster, 105, 182, state.score, digit_sprites[0], 6, 8)
 
         # Lives
-        life_sprite = self.sprites.get('kangaroo_lives', None)
+        life_sprite = sprites.get('kangaroo_lives', None)
         lives_count = jnp.maximum(state.lives.astype(int) - 1, 0)
         raster = jr.render_indicator(raster, 15, 182, lives_count, life_sprite[0], spacing=8)
 
         # Timer
-        time_digit_sprites = self.sprites.get('time_digits', None)
+        time_digit_sprites = sprites.get('time_digits', None)
         timer_val = jnp.maximum(state.level.timer.astype(int), 0)
-        timer_digits_indices = jr.int_to_digits(timer_val, max_digits=4)
-        raster = jr.render_label(raster, 80, 190, timer_digits_indices, time_digit_sprites[0], spacing=4)
+        raster = jr.render_number(raster, 80, 190, timer_val, time_digit_sprites[0], 4, 4)
 
         # Ensure the final raster has the correct dtype
         return raster.astype(jnp.uint8)
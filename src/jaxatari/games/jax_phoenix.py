@@ -8,11 +8,50 @@ import jaxatari.spaces as spaces
 import jaxatari.rendering.jax_rendering_utils as jr
 import numpy as np
 from jaxatari.environment import JaxEnvironment, JAXAtariAction as Action
+from jaxatari.profile import stage
 from jaxatari.spaces import Space
 
 from jaxatari.rendering.jax_rendering_utils import pad_to_match
 
 
+class EnemyLevelParams(NamedTuple):
+    """How the enemies behave in each kind of level, indexed by level % 5 (0 is the boss level)."""
+    speed: Tuple[float, ...] = (0.0, 0.4, 0.4, 0.5, 0.5)  # horizontal step per frame
+    formation_turn: Tuple[bool, ...] = (False, True, True, False, False)  # turn as a formation, else every enemy alone
+    left_margin: Tuple[int, ...] = (0, 0, 0, 3, 3)  # distance to the left bound at which enemies turn
+    dive_chance: Tuple[float, ...] = (0.0, 0.005, 0.005, 0.0, 0.0)  # chance per frame the lowest enemies dive
+    flutter_chance: Tuple[float, ...] = (0.0, 0.0, 0.0, 0.1, 0.1)  # chance per frame an enemy jumps up or down
+    flutter_step: Tuple[int, ...] = (0, 0, 0, 2, 2)  # height of such a jump
+    wings: Tuple[bool, ...] = (False, False, False, True, True)  # shots hit the wings, enemies die as bats
+    descent_step: Tuple[float, ...] = (0.05, 0.0, 0.0, 0.0, 0.0)  # the boss sinks this far every 30 frames
+    blocks: Tuple[bool, ...] = (True, False, False, False, False)  # shots hit the blocks of the boss
+
+
+def block_hit_lookup(positions, block_size: Tuple[int, int], projectile_size: Tuple[int, int]):
+    """
+    Precomputes which boss blocks a projectile overlaps, so that a hit is found with a table lookup
+    instead of a test against every block.
+    Returns: The (x, y) position of the first table cell and a (height, width, K) table holding for every
+        projectile position the indices of the overlapped blocks in ascending order, padded with len(positions).
+    """
+    positions = np.asarray(positions)
+    (block_w, block_h), (projectile_w, projectile_h) = block_size, projectile_size
+    origin_x = int(positions[:, 0].min()) - projectile_w + 1
+    origin_y = int(positions[:, 1].min()) - projectile_h + 1
+    px = np.arange(origin_x, int(positions[:, 0].max()) + block_w)
+    py = np.arange(origin_y, int(positions[:, 1].max()) + block_h)
+    overlap = (
+        (px[None, :, None] + projectile_w > positions[None, None, :, 0])
+        & (px[None, :, None] < positions[None, None, :, 0] + block_w)
+        & (py[:, None, None] + projectile_h > positions[None, None, :, 1])
+        & (py[:, None, None] < positions[None, None, :, 1] + block_h)
+    )
+    # stable sort moves the overlapped blocks to the front, keeping their order
+    order = np.argsort(~overlap, axis=-1, kind="stable")[..., :overlap.sum(axis=-1).max()]
+    table = np.where(np.take_along_axis(overlap, order, axis=-1), order, len(positions))
+    return (origin_x, origin_y), jnp.asarray(table, dtype=jnp.int32)
+
+
 # Phoenix Game by: Florian Schmidt, Finn Keller
 # new Constant class
 class PhoenixConstants(NamedTuple):
@@ -51,6 +90,10 @@ class PhoenixConstants(NamedTuple):
     ENEMY_ANIMATION_SPEED: int = 30  # ca. 0,5 Sekunden bei 60 FPS
     PLAYER_ANIMATION_SPEED: int = 6  # ca. 0,1 Sekunden bei 60 FPS
     PLAYER_LIVES: int = 4 # Anzahl der Leben
+    ENEMY_LEVEL_PARAMS: EnemyLevelParams = EnemyLevelParams()
+    # Derive all randomness from PRNGKey(step_counter) as earlier versions did, instead of from state.rng_key.
+    # Every environment of a batch then draws the same numbers at the same step.
+    LEGACY_RNG: bool = False
     ENEMY_POSITIONS_X_LIST = [
         lambda: jnp.array(
             [123 - 160 // 2, 123 - 160 // 2, 136 - 160 // 2, 136 - 160 // 2, 160 - 160 // 2, 160 - 160 // 2,
@@ -167,6 +210,15 @@ class PhoenixConstants(NamedTuple):
         ]
     )
 
+    # The blocks never move, the state only keeps a mask of the ones still standing.
+    # These tables find the blocks a projectile overlaps, see block_hit_lookup.
+    BLUE_BLOCK_LOOKUP = block_hit_lookup(
+        BLUE_BLOCK_POSITIONS, (BLOCK_WIDTH, BLOCK_HEIGHT), (PROJECTILE_WIDTH, PROJECTILE_HEIGHT))
+    RED_BLOCK_LOOKUP = block_hit_lookup(
+        RED_BLOCK_POSITIONS, (BLOCK_WIDTH, BLOCK_HEIGHT), (PROJECTILE_WIDTH, PROJECTILE_HEIGHT))
+    GREEN_BLOCK_LOOKUP = block_hit_lookup(
+        GREEN_BLOCK_POSITIONS, (BLOCK_WIDTH, BLOCK_HEIGHT), (PROJECTILE_WIDTH, PROJECTILE_HEIGHT))
+
 # === GAME STATE ===
 class PhoenixState(NamedTuple):
     player_x: chex.Array
@@ -176,9 +228,9 @@ class PhoenixState(NamedTuple):
     enemies_y: chex.Array
     horizontal_direction_enemies: chex.Array
     vertical_direction_enemies: chex.Array
-    blue_blocks: chex.Array
-    red_blocks: chex.Array
-    green_blocks: chex.Array
+    blue_blocks: chex.Array # Standing boss blocks, (48,), bool, positions in PhoenixConstants.BLUE_BLOCK_POSITIONS
+    red_blocks: chex.Array # (126,), bool
+    green_blocks: chex.Array # (30,), bool
     invincibility: chex.Array
     invincibility_timer: chex.Array
     ability_cooldown: chex.Array
@@ -197,6 +249,7 @@ class PhoenixState(NamedTuple):
     phoenix_returning: chex.Array # Returning status of the Phoenix
     phoenix_dying: chex.Array # Dying status of the Phoenix, (8,), bool
     phoenix_death_timer: chex.Array # Timer for Phoenix death animation, (8,), int
+    rng_key: chex.PRNGKey # Split every step, unused with PhoenixConstants.LEGACY_RNG
 
     player_dying: chex.Array = jnp.array(False)  # Player dying status, bool
     player_death_timer: chex.Array = jnp.array(0)  # Timer for player death animation, int
@@ -218,6 +271,12 @@ class PhoenixObservation(NamedTuple):
     player_y: chex.Array
     player_score: chex.Array
     lives: chex.Array
+    enemies: chex.Array  # (8, 5): x, y, alive, wings (bit 0 left, bit 1 right), attacking
+    player_projectile: chex.Array  # (3,): x, y, active
+    enemy_projectiles: chex.Array  # (8, 3): x, y, active
+    blue_blocks: chex.Array  # (48,) mask of the boss blocks still standing, zero outside the boss level
+    red_blocks: chex.Array  # (126,)
+    green_blocks: chex.Array  # (30,)
 
 class PhoenixInfo(NamedTuple):
     step_counter: jnp.ndarray
@@ -234,7 +293,6 @@ class JaxPhoenix(JaxEnvironment[PhoenixState, PhoenixObservation, PhoenixInfo, N
     def __init__(self, consts: PhoenixConstants = None, reward_funcs: list[callable]=None):
         consts = consts or PhoenixConstants()
         super().__init__(consts)
-        self.renderer = PhoenixRenderer(self.consts)
         if reward_funcs is not None:
             reward_funcs = tuple(reward_funcs)
         self.reward_funcs = reward_funcs
@@ -261,16 +319,54 @@ class JaxPhoenix(JaxEnvironment[PhoenixState, PhoenixObservation, PhoenixInfo, N
         ]# Add step counter tracking
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_observation")
     def _get_observation(self, state: PhoenixState) -> PhoenixObservation:
         player = EntityPosition(x=state.player_x, y=state.player_y)
+        params = self.level_params(state.level)
+
+        # enemies that are on the field and not in their death animation
+        dying = jnp.where(params.wings, state.bat_dying, state.phoenix_dying)
+        alive = (state.enemies_x > -1) & (state.enemies_y < self.consts.HEIGHT + 10) & (~dying)
+        enemies_x = jnp.clip(jnp.round(state.enemies_x), 0, self.consts.WIDTH - 1).astype(jnp.int32)
+        enemies_y = jnp.clip(jnp.round(state.enemies_y), 0, self.consts.HEIGHT - 1).astype(jnp.int32)
+        # bat_wings is 2 for both wings, -1 for only the left and 1 for only the right one
+        left_wing = (state.bat_wings == 2) | (state.bat_wings == -1)
+        right_wing = (state.bat_wings == 2) | (state.bat_wings == 1)
+        wings = jnp.where(params.wings, left_wing.astype(jnp.int32) + 2 * right_wing.astype(jnp.int32), 0)
+        enemies = jnp.stack([
+            jnp.where(alive, enemies_x, 0),
+            jnp.where(alive, enemies_y, 0),
+            alive.astype(jnp.int32),
+            jnp.where(alive, wings, 0),
+            (alive & state.phoenix_do_attack).astype(jnp.int32),
+        ], axis=1)
+
+        def projectiles(xs, ys):
+            active = (xs >= 0) & (ys >= 0) & (ys < self.consts.HEIGHT)
+            return jnp.stack([
+                jnp.where(active, jnp.clip(xs, 0, self.consts.WIDTH - 1), 0),
+                jnp.where(active, ys, 0),
+                active.astype(jnp.int32),
+            ], axis=-1).astype(jnp.int32)
+
+        def block_mask(blocks):
+            return (params.blocks & blocks).astype(jnp.int32)
+
         return PhoenixObservation(
             player_x=player[0],
             player_y=player[1],
             player_score=state.score,
-            lives=state.lives
+            lives=state.lives,
+            enemies=enemies,
+            player_projectile=projectiles(state.projectile_x, state.projectile_y),
+            enemy_projectiles=projectiles(state.enemy_projectile_x, state.enemy_projectile_y),
+            blue_blocks=block_mask(state.blue_blocks),
+            red_blocks=block_mask(state.red_blocks),
+            green_blocks=block_mask(state.green_blocks),
         )
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_all_rewards")
     def _get_all_rewards(self, previous_state: PhoenixState, state: PhoenixState):
         if self.reward_funcs is None:
             return jnp.zeros(1)
@@ -280,6 +376,7 @@ class JaxPhoenix(JaxEnvironment[PhoenixState, PhoenixObservation, PhoenixInfo, N
         return rewards
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_info")
     def _get_info(self, state: PhoenixState, all_rewards: chex.Array = None) -> PhoenixInfo:
         return PhoenixInfo(
             step_counter=state.step_counter,
@@ -287,10 +384,12 @@ class JaxPhoenix(JaxEnvironment[PhoenixState, PhoenixObservation, PhoenixInfo, N
         )
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_done")
     def _get_done(self, state: PhoenixState) -> Tuple[bool, PhoenixState]:
         return jnp.less_equal(state.lives, 0)
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_reward")
     def _get_reward(self, previous_state: PhoenixState, state: PhoenixState):
         return state.score - previous_state.score
 
@@ -304,6 +403,22 @@ class JaxPhoenix(JaxEnvironment[PhoenixState, PhoenixObservation, PhoenixInfo, N
             "player_y": spaces.Box(low=0, high=self.consts.HEIGHT - 1, shape=(), dtype=jnp.int32),
             "player_score": spaces.Box(low=0, high=99999, shape=(), dtype=jnp.int32),
             "lives": spaces.Box(low=0, high=9, shape=(), dtype=jnp.int32),
+            "enemies": spaces.Box(
+                low=0, high=np.array([self.consts.WIDTH - 1, self.consts.HEIGHT - 1, 1, 3, 1]), shape=(8, 5), dtype=jnp.int32
+            ),
+            "player_projectile": spaces.Box(
+                low=0, high=np.array([self.consts.WIDTH - 1, self.consts.HEIGHT - 1, 1]), shape=(3,), dtype=jnp.int32
+            ),
+            "enemy_projectiles": spaces.Box(
+                low=0, high=np.array([self.consts.WIDTH - 1, self.consts.HEIGHT - 1, 1]), shape=(8, 3), dtype=jnp.int32
+            ),
+            "blue_blocks": spaces.Box(
+                low=0, high=1, shape=(self.consts.BLUE_BLOCK_POSITIONS.shape[0],), dtype=jnp.int32
+            ),
+            "red_blocks": spaces.Box(low=0, high=1, shape=(self.consts.RED_BLOCK_POSITIONS.shape[0],), dtype=jnp.int32),
+            "green_blocks": spaces.Box(
+                low=0, high=1, shape=(self.consts.GREEN_BLOCK_POSITIONS.shape[0],), dtype=jnp.int32
+            ),
         })
 
     def image_space(self) -> spaces.Box:
@@ -320,10 +435,17 @@ class JaxPhoenix(JaxEnvironment[PhoenixState, PhoenixObservation, PhoenixInfo, N
             obs.player_x.flatten(),
             obs.player_y.flatten(),
             obs.player_score.flatten(),
-            obs.lives.flatten()
+            obs.lives.flatten(),
+            obs.enemies.flatten(),
+            obs.player_projectile.flatten(),
+            obs.enemy_projectiles.flatten(),
+            obs.blue_blocks.flatten(),
+            obs.red_blocks.flatten(),
+            obs.green_blocks.flatten(),
         ]
         )
     @partial(jax.jit, static_argnums=(0,))
+    @stage("player_step")
     def player_step(self, state: PhoenixState, action: chex.Array) -> tuple[chex.Array]:
         step_size = 2  # Größerer Wert = schnellerer Schritt
         # left action
@@ -386,14 +508,49 @@ class JaxPhoenix(JaxEnvironment[PhoenixState, PhoenixObservation, PhoenixInfo, N
 
         return state
 
-    def phoenix_step(self, state):
-        enemy_step_size = 0.4
-        attack_speed = 1#0.4
-        tolerance = 0.5 #TODO Kann evtl entfernt werden
+    def level_params(self, level: chex.Array) -> EnemyLevelParams:
+        """The enemy behavior of level, every field picked from consts.ENEMY_LEVEL_PARAMS."""
+        kind = level % 5
+        return EnemyLevelParams(*(jnp.asarray(values)[kind] for values in self.consts.ENEMY_LEVEL_PARAMS))
+
+    def random_keys(self, state: PhoenixState) -> Tuple[chex.PRNGKey, Tuple[chex.PRNGKey, ...], chex.PRNGKey]:
+        """
+        Splits the keys one step draws from off state.rng_key.
+        Returns: The rng_key of the next state, the keys of enemy_step and the key of enemy_fire_step.
+            With consts.LEGACY_RNG, they are derived from the step counter and state.rng_key stays as it is.
+        """
+        if self.consts.LEGACY_RNG:
+            step_counter = state.step_counter
+            enemy_keys = (
+                jax.random.PRNGKey(step_counter),
+                jax.random.PRNGKey(step_counter + 999),
+                jax.random.PRNGKey(step_counter + 123),
+            )
+            return state.rng_key, enemy_keys, jax.random.PRNGKey(step_counter)
+        rng_key, attack_key, drift_key, delay_key, fire_key = jax.random.split(state.rng_key, 5)
+        return rng_key, (attack_key, drift_key, delay_key), fire_key
+
+    @stage("enemy_step")
+    def enemy_step(self, state: PhoenixState, keys: Tuple[chex.PRNGKey, ...]) -> PhoenixState:
+        """
+        Moves the enemies of every level (phoenix formation, bats and boss) with one update. What the current
+        level does is read from consts.ENEMY_LEVEL_PARAMS, the parts it does not use leave the state unchanged.
+        There is no branch per level, so under jax.vmap the enemies of all levels cost a single update.
+        keys are the three enemy keys of random_keys.
+        """
+        params = self.level_params(state.level)
+        dives = params.dive_chance > 0
+        flutters = params.flutter_chance > 0
+        descends = params.descent_step > 0
+        attack_speed = 1
+        tolerance = 0.5
 
         # Nur Gegner mit gültiger Position im Spielfeld bewegen
-        active_enemies = (state.enemies_x > -1) & (state.enemies_y < self.consts.HEIGHT + 10) & (~state.phoenix_dying)
+        dying = jnp.where(params.wings, state.bat_dying, state.phoenix_dying)
+        active_enemies = (state.enemies_x > -1) & (state.enemies_y < self.consts.HEIGHT + 10) & (~dying)
+        key, drift_key, key_delay = keys
 
+        # --- Dive attacks (phoenix levels) ---
         # Unterste aktive Phoenixe (zum Starten eines Angriffs)
         masked_enemies_y = jnp.where(active_enemies, state.enemies_y, -jnp.inf)
         max_y = jnp.max(masked_enemies_y)
@@ -407,8 +564,7 @@ class JaxPhoenix(JaxEnvironment[PhoenixState, PhoenixObservation, PhoenixInfo, N
                 & (state.phoenix_cooldown == 0)
                 & ((state.phoenix_original_y == -1) | (state.enemies_y == state.phoenix_original_y))
         )
-        key = jax.random.PRNGKey(state.step_counter)
-        attack_chance = jax.random.uniform(key, shape=()) < 0.005
+        attack_chance = jax.random.uniform(key, shape=()) < params.dive_chance
         attack_trigger = lowest_mask & jnp.any(can_attack & attack_chance)
 
         # Zielbereich für den Angriff
@@ -427,9 +583,8 @@ class JaxPhoenix(JaxEnvironment[PhoenixState, PhoenixObservation, PhoenixInfo, N
 
         # Drift nur beim Abtauchen/Anflug
         drift_prob = 0.6
-        drift_max = 0.6#0.35
+        drift_max = 0.6
         num = state.enemies_x.shape[0]
-        drift_key = jax.random.PRNGKey(state.step_counter + 999)
         dir_key, mag_key, on_key = jax.random.split(drift_key, 3)
         dir_sign = jnp.where(jax.random.uniform(dir_key, (num,)) < 0.5, -1.0, 1.0)
         magnitude = jax.random.uniform(mag_key, (num,)) * drift_max
@@ -442,15 +597,14 @@ class JaxPhoenix(JaxEnvironment[PhoenixState, PhoenixObservation, PhoenixInfo, N
         going_up = new_phoenix_do_attack & (state.enemies_y > new_phoenix_attack_target_y + tolerance)
 
         # WICHTIG: Y-Bewegung nur für aktive Gegner
-        new_enemies_y = jnp.where(active_enemies & going_down, state.enemies_y + attack_speed, state.enemies_y)
-        new_enemies_y = jnp.where(active_enemies & going_up, new_enemies_y - attack_speed, new_enemies_y)
+        attack_y = jnp.where(active_enemies & going_down, state.enemies_y + attack_speed, state.enemies_y)
+        attack_y = jnp.where(active_enemies & going_up, attack_y - attack_speed, attack_y)
 
         # Seiten-Drift nur während des Abtauchens/an Zielanflug
         lateral_drift = jnp.where(going_down | going_up, new_phoenix_drift, 0.0).astype(jnp.float32)
 
         # Ziel erreicht? -> gemeinsamen "unten bleiben"-Cooldown starten
         target_reached = (~going_down) & (~going_up) & new_phoenix_do_attack
-        key_delay = jax.random.PRNGKey(state.step_counter + 123)
         common_delay = jax.random.randint(key_delay, (), 30, 120)
         any_reached_target = jnp.any(target_reached & (state.phoenix_cooldown == 0))
 
@@ -467,288 +621,171 @@ class JaxPhoenix(JaxEnvironment[PhoenixState, PhoenixObservation, PhoenixInfo, N
         new_phoenix_attack_target_y = jnp.where(start_return, -1, new_phoenix_attack_target_y)
 
         # Rückflug: gleiches Tempo wie Angriff (nur aktive Gegner)
-        returning_active = new_phoenix_returning
-        dy = new_phoenix_original_y - new_enemies_y
-        step = jnp.clip(dy, -attack_speed, attack_speed)
-        new_enemies_y = jnp.where(active_enemies & returning_active, new_enemies_y + step, new_enemies_y)
+        dy = new_phoenix_original_y - attack_y
+        return_step = jnp.clip(dy, -attack_speed, attack_speed)
+        attack_y = jnp.where(active_enemies & new_phoenix_returning, attack_y + return_step, attack_y)
 
-        arrived = active_enemies & returning_active & (jnp.abs(new_enemies_y - new_phoenix_original_y) <= tolerance)
-        new_enemies_y = jnp.where(arrived, new_phoenix_original_y, new_enemies_y)
+        arrived = active_enemies & new_phoenix_returning & (jnp.abs(attack_y - new_phoenix_original_y) <= tolerance)
+        attack_y = jnp.where(arrived, new_phoenix_original_y, attack_y)
         new_phoenix_returning = jnp.where(arrived, False, new_phoenix_returning)
         new_phoenix_original_y = jnp.where(arrived, -1, new_phoenix_original_y)
         new_phoenix_cooldown = jnp.where(arrived, 30, new_phoenix_cooldown)
+        # Cooldown am Ende einmal dekrementieren
+        new_phoenix_cooldown = jnp.where(new_phoenix_cooldown > 0, new_phoenix_cooldown - 1, 0)
 
-        # Gruppenbewegung: nur während des Abtauchens ausnehmen
-        group_mask = active_enemies & (~going_down)
-
-        # Richtungswechsel nur anhand der oberen Formation
-        direction_mask = active_enemies & (new_phoenix_original_y == -1)
-
-        at_left_boundary = jnp.any(jnp.logical_and(state.enemies_x <= self.consts.PLAYER_BOUNDS[0], direction_mask))
-        at_right_boundary = jnp.any(
-            jnp.logical_and(
-                state.enemies_x >= self.consts.PLAYER_BOUNDS[1] - self.consts.ENEMY_WIDTH / 2,
-                direction_mask
-            )
-        )
-        new_direction = jax.lax.cond(
+        going_down = going_down & dives
+        lateral_drift = jnp.where(dives, lateral_drift, 0.0)
+        new_enemies_y = jnp.where(dives, attack_y, state.enemies_y)
+
+        # --- Horizontal movement ---
+        # the phoenix formation turns as a whole (only the enemies in formation count), bats turn on their own
+        turning = active_enemies & (params.speed > 0) & jnp.where(params.formation_turn, new_phoenix_original_y == -1, True)
+        at_left_boundary = (state.enemies_x <= self.consts.PLAYER_BOUNDS[0] + params.left_margin) & turning
+        at_right_boundary = (state.enemies_x >= self.consts.PLAYER_BOUNDS[1] - self.consts.ENEMY_WIDTH / 2) & turning
+        at_left_boundary = jnp.where(params.formation_turn, jnp.any(at_left_boundary), at_left_boundary)
+        at_right_boundary = jnp.where(params.formation_turn, jnp.any(at_right_boundary), at_right_boundary)
+        new_direction = jnp.where(
             at_left_boundary,
-            lambda: jnp.full_like(state.horizontal_direction_enemies, 1.0, dtype=jnp.float32),
-            lambda: jax.lax.cond(
-                at_right_boundary,
-                lambda: jnp.full_like(state.horizontal_direction_enemies, -1.0, dtype=jnp.float32),
-                lambda: state.horizontal_direction_enemies.astype(jnp.float32),
-            ),
-        )
+            1.0,
+            jnp.where(at_right_boundary, -1.0, state.horizontal_direction_enemies.astype(jnp.float32)),
+        ).astype(jnp.float32)
 
-        # Horizontale Bewegung anwenden
-        group_step = jnp.where(group_mask, new_direction * enemy_step_size, 0.0).astype(jnp.float32)
-        new_enemies_x = jnp.where(
-            active_enemies,
-            state.enemies_x + group_step + lateral_drift,
-            state.enemies_x
-        )
+        # Gruppenbewegung: nur während des Abtauchens ausnehmen
+        group_mask = active_enemies & (~going_down)
+        group_step = jnp.where(group_mask, new_direction * params.speed, 0.0).astype(jnp.float32)
+        new_enemies_x = jnp.where(active_enemies, state.enemies_x + group_step + lateral_drift, state.enemies_x)
         # WICHTIG: Clipping nur für aktive Gegner, damit Tote (-1) nicht auf 0 geclippt werden
         clipped_x = jnp.clip(new_enemies_x, self.consts.PLAYER_BOUNDS[0], self.consts.PLAYER_BOUNDS[1])
         new_enemies_x = jnp.where(active_enemies, clipped_x, state.enemies_x)
 
-        # Cooldown am Ende einmal dekrementieren
-        new_phoenix_cooldown = jnp.where(new_phoenix_cooldown > 0, new_phoenix_cooldown - 1, 0)
-
-
-        state = state._replace(
-            enemies_x=new_enemies_x.astype(jnp.float32),
-            horizontal_direction_enemies=new_direction.astype(jnp.float32),
-            enemies_y=new_enemies_y.astype(jnp.float32),
-            vertical_direction_enemies=state.vertical_direction_enemies.astype(jnp.float32),
-            phoenix_do_attack=new_phoenix_do_attack,
-            phoenix_attack_target_y=new_phoenix_attack_target_y.astype(jnp.float32),
-            phoenix_original_y=new_phoenix_original_y.astype(jnp.float32),
-            phoenix_cooldown=new_phoenix_cooldown.astype(jnp.int32),
-            phoenix_drift=new_phoenix_drift.astype(jnp.float32),
-            phoenix_returning=new_phoenix_returning.astype(jnp.bool_),
-            phoenix_dying=state.phoenix_dying.astype(jnp.bool_),
-            phoenix_death_timer=state.phoenix_death_timer.astype(jnp.int32),
-            player_dying=state.player_dying.astype(jnp.bool_),
-            player_death_timer=state.player_death_timer.astype(jnp.int32),
-        )
-        return state
-
-    def bat_step(self, state):
-        bat_step_size = 0.5
-        bat_y_step = 2
-        bat_y_chance = 0.1
-        active_bats = (state.enemies_x > -1) & (state.enemies_y < self.consts.HEIGHT + 10) & (~state.bat_dying)
-        proj_pos = jnp.array([state.projectile_x, state.projectile_y])
-        cooldown_ready = (state.bat_y_cooldown == 0) & active_bats
-
-        key = jax.random.PRNGKey(state.step_counter)
-        y_move_chance = jax.random.uniform(key, shape=state.enemies_y.shape) < bat_y_chance
-        dir_key = jax.random.PRNGKey(state.step_counter + 123)
-        y_direction = jnp.where(jax.random.uniform(dir_key, shape=state.enemies_y.shape) < 0.5,1.0,-1.0)
-
-        y_move = jnp.where(cooldown_ready & y_move_chance, bat_y_step * y_direction, 0.0)
-
-        # Initialisiere neue Richtungen für jede Fledermaus
-        new_directions = jnp.where(
-            jnp.logical_and(state.enemies_x <= self.consts.PLAYER_BOUNDS[0] + 3, active_bats),
-            jnp.ones(state.horizontal_direction_enemies.shape, dtype=jnp.float32),  # Force array shape
-            jnp.where(
-                jnp.logical_and(state.enemies_x >= self.consts.PLAYER_BOUNDS[1] - self.consts.ENEMY_WIDTH / 2,
-                                active_bats),
-                jnp.ones(state.horizontal_direction_enemies.shape, dtype=jnp.float32) * -1,  # Force array shape
-                state.horizontal_direction_enemies.astype(jnp.float32)  # Ensure consistency
-            )
-        )
-
-        # Bewege Fledermäuse basierend auf ihrer individuellen Richtung
-        #new_enemies_x = jnp.where(active_bats, state.enemies_x + (new_directions * bat_step_size), state.enemies_x)
-        #enemy_pos = jnp.stack([new_enemies_x, state.enemies_y], axis=1)
-        #new_enemies_x = jnp.clip(new_enemies_x, self.consts.PLAYER_BOUNDS[0], self.consts.PLAYER_BOUNDS[1])
-
-        #new_enemies_y = jnp.where(active_bats, state.enemies_y + y_move, state.enemies_y)
-        #new_enemies_y = jnp.clip(new_enemies_y, 0, self.consts.HEIGHT - self.consts.ENEMY_HEIGHT)
-        #new_y_cooldown = jnp.where(cooldown_ready & y_move_chance, 50, jnp.maximum(state.bat_y_cooldown-1,0))
-
-        # Horizontal: nur aktive Bats bewegen und clippen
-        proposed_x = jnp.where(active_bats, state.enemies_x + (new_directions * bat_step_size), state.enemies_x)
-        clipped_x = jnp.clip(proposed_x, self.consts.PLAYER_BOUNDS[0], self.consts.PLAYER_BOUNDS[1])
-        new_enemies_x = jnp.where(active_bats, clipped_x, state.enemies_x)
-
-        # Vertikal: nur aktive Bats bewegen und clippen
-        proposed_y = jnp.where(active_bats, state.enemies_y + y_move, state.enemies_y)
+        # --- Vertical movement ---
+        # bats jump up or down at random, then wait for their cooldown
+        cooldown_ready = (state.bat_y_cooldown == 0) & active_enemies
+        y_move_chance = jax.random.uniform(key, shape=state.enemies_y.shape) < params.flutter_chance
+        y_direction = jnp.where(jax.random.uniform(key_delay, shape=state.enemies_y.shape) < 0.5, 1.0, -1.0)
+        y_move = jnp.where(cooldown_ready & y_move_chance, params.flutter_step * y_direction, 0.0)
+        proposed_y = jnp.where(active_enemies, new_enemies_y + y_move, new_enemies_y)
         clipped_y = jnp.clip(proposed_y, 0, self.consts.HEIGHT - self.consts.ENEMY_HEIGHT)
-        new_enemies_y = jnp.where(active_bats, clipped_y, state.enemies_y)
-
-        # Für Kollisionen die neuen Y-Werte verwenden
-        enemy_pos = jnp.stack([new_enemies_x, new_enemies_y], axis=1)
-
+        new_enemies_y = jnp.where(flutters & active_enemies, clipped_y, new_enemies_y)
         new_y_cooldown = jnp.where(cooldown_ready & y_move_chance, 50, jnp.maximum(state.bat_y_cooldown - 1, 0))
-
-        def check_collision(entity_pos, projectile_pos):
-            enemy_x, enemy_y = entity_pos
-            proj_x, proj_y = projectile_pos
-            wing_left_x = enemy_x - 5
-            wing_y = enemy_y + 2
-            wing_right_x = enemy_x + 5
-            collision_x_left = (proj_x + self.consts.PROJECTILE_WIDTH > wing_left_x) & (
-                    proj_x < wing_left_x + self.consts.WING_WIDTH)
-            collision_y = (proj_y + self.consts.PROJECTILE_HEIGHT > wing_y) & (
-                    proj_y < enemy_y + 2)
-            collision_x_right = (proj_x + self.consts.PROJECTILE_WIDTH > wing_right_x) & (
-                    proj_x < wing_right_x + self.consts.WING_WIDTH)
-
-            return collision_x_left & collision_y, collision_x_right & collision_y
-
-        left_wing_collision, right_wing_collision = jax.vmap(lambda entity_pos: check_collision(entity_pos, proj_pos))(enemy_pos)
+        new_y_cooldown = jnp.where(flutters, new_y_cooldown, state.bat_y_cooldown)
+
+        # the boss sinks every 30 frames until it reached its lowest position
+        descending = descends & (state.enemies_y[0] <= 100) & ((state.step_counter % 30) == 0)
+        new_enemies_y = jnp.where(descending, new_enemies_y + params.descent_step, new_enemies_y)
+
+        # --- Player projectile against wings (bat levels) ---
+        proj_x, proj_y = state.projectile_x, state.projectile_y
+        wing_left_x = new_enemies_x - 5
+        wing_right_x = new_enemies_x + 5
+        wing_y = new_enemies_y + 2
+        collision_y = (proj_y + self.consts.PROJECTILE_HEIGHT > wing_y) & (proj_y < new_enemies_y + 2)
+        left_wing_collision = collision_y & (proj_x + self.consts.PROJECTILE_WIDTH > wing_left_x) & (
+                proj_x < wing_left_x + self.consts.WING_WIDTH)
+        right_wing_collision = collision_y & (proj_x + self.consts.PROJECTILE_WIDTH > wing_right_x) & (
+                proj_x < wing_right_x + self.consts.WING_WIDTH)
         left_hit_valid = left_wing_collision & ((state.bat_wings == 2) | (state.bat_wings == -1))
         right_hit_valid = right_wing_collision & ((state.bat_wings == 2) | (state.bat_wings == 1))
 
         # Only remove the projectile if any valid hit occurred
-        any_valid_hit = jnp.any(left_hit_valid | right_hit_valid)
-        new_proj_y = jnp.where(any_valid_hit, -1, state.projectile_y)
-        def update_wing_state(current_state, left_hit, right_hit):
-            # current_state: int (-1,0,1,2), left_hit & right_hit: bool
-
-            # First handle left wing hit
-            updated = jnp.where(
-                left_hit,
-                jnp.where(current_state == 2, 1,  # both wings → right wing only
-                          jnp.where(current_state == -1, 0, current_state)),  # right only → none, else unchanged
-                current_state
-            )
-
-            # Then handle right wing hit
-            updated = jnp.where(
-                right_hit,
-                jnp.where(updated == 2, -1,  # both wings → left wing only
-                          jnp.where(updated == 1, 0, updated)),  # left only → none, else unchanged
-                updated
-            )
-
-            return updated
-
-        new_bat_wings = jax.vmap(update_wing_state)(state.bat_wings, left_wing_collision, right_wing_collision)
-
-        no_wings = (new_bat_wings == 0) & active_bats
+        wing_hit = params.wings & jnp.any(left_hit_valid | right_hit_valid)
+        proj_y = jnp.where(wing_hit, -1, proj_y)
+
+        # wings: 2 both, 1 right only, -1 left only, 0 none. A hit on a missing wing changes nothing.
+        new_bat_wings = jnp.where(
+            left_wing_collision,
+            jnp.where(state.bat_wings == 2, 1, jnp.where(state.bat_wings == -1, 0, state.bat_wings)),
+            state.bat_wings,
+        )
+        new_bat_wings = jnp.where(
+            right_wing_collision,
+            jnp.where(new_bat_wings == 2, -1, jnp.where(new_bat_wings == 1, 0, new_bat_wings)),
+            new_bat_wings,
+        )
+        no_wings = (new_bat_wings == 0) & active_enemies
         new_regen_timer = jnp.where(no_wings, state.bat_wing_regen_timer + 1, 0)
         regenerated = (new_regen_timer >= self.consts.BAT_REGEN)
         new_bat_wings = jnp.where(regenerated, 2, new_bat_wings)
         new_regen_timer = jnp.where(regenerated, 0, new_regen_timer)
+        new_bat_wings = jnp.where(params.wings, new_bat_wings, state.bat_wings)
+        new_regen_timer = jnp.where(params.wings, new_regen_timer, state.bat_wing_regen_timer)
+
+        # --- Player projectile against the blocks of the boss ---
+        projectile_active = params.blocks & (state.projectile_x >= 0) & (state.projectile_y >= 0)
+
+        def remove_first_hit(blocks, lookup):
+            """Removes the first standing block the projectile hits, looked up by the projectile position."""
+            (origin_x, origin_y), table = lookup
+            cell_x = state.projectile_x - origin_x
+            cell_y = state.projectile_y - origin_y
+            in_table = (cell_x >= 0) & (cell_x < table.shape[1]) & (cell_y >= 0) & (cell_y < table.shape[0])
+            candidates = table[jnp.clip(cell_y, 0, table.shape[0] - 1), jnp.clip(cell_x, 0, table.shape[1] - 1)]
+            # the padding index of the table points to a block that never stands
+            standing = projectile_active & in_table & jnp.append(blocks, False)[candidates]
+            hit = jnp.any(standing)
+            return jnp.where(hit, blocks.at[candidates[jnp.argmax(standing)]].set(False), blocks), hit
+
+        new_green_blocks, green_hit = remove_first_hit(state.green_blocks, self.consts.GREEN_BLOCK_LOOKUP)
+        new_red_blocks, red_hit = remove_first_hit(state.red_blocks, self.consts.RED_BLOCK_LOOKUP)
+        new_blue_blocks, blue_hit = remove_first_hit(state.blue_blocks, self.consts.BLUE_BLOCK_LOOKUP)
+        block_hit = green_hit | red_hit | blue_hit
+
+        # once the blue shield has a gap, it rotates every 20 frames
+        rotate = params.blocks & ~jnp.all(new_blue_blocks) & (state.step_counter % 20 == 0)
+        new_blue_blocks = jnp.where(rotate, jnp.roll(new_blue_blocks, 1), new_blue_blocks)
+        proj_x = jnp.where(block_hit, -1, proj_x)
+        proj_y = jnp.where(block_hit, -1, proj_y)
 
         state = state._replace(
             enemies_x=new_enemies_x.astype(jnp.float32),
             enemies_y=new_enemies_y.astype(jnp.float32),
-            horizontal_direction_enemies=new_directions.astype(jnp.float32),
-            projectile_y=new_proj_y,
-            bat_wings= new_bat_wings,
+            horizontal_direction_enemies=new_direction,
+            projectile_x=proj_x.astype(jnp.int32),
+            projectile_y=proj_y.astype(jnp.int32),
+            blue_blocks=new_blue_blocks,
+            red_blocks=new_red_blocks,
+            green_blocks=new_green_blocks,
+            bat_wings=new_bat_wings,
             bat_wing_regen_timer=new_regen_timer,
-            bat_y_cooldown=new_y_cooldown.astype(jnp.int32)
+            bat_y_cooldown=new_y_cooldown.astype(jnp.int32),
+            phoenix_do_attack=jnp.where(dives, new_phoenix_do_attack, state.phoenix_do_attack),
+            phoenix_attack_target_y=jnp.where(
+                dives, new_phoenix_attack_target_y, state.phoenix_attack_target_y).astype(jnp.float32),
+            phoenix_original_y=jnp.where(dives, new_phoenix_original_y, state.phoenix_original_y).astype(jnp.float32),
+            phoenix_cooldown=jnp.where(dives, new_phoenix_cooldown, state.phoenix_cooldown).astype(jnp.int32),
+            phoenix_drift=jnp.where(dives, new_phoenix_drift, state.phoenix_drift).astype(jnp.float32),
+            phoenix_returning=jnp.where(dives, new_phoenix_returning, state.phoenix_returning).astype(jnp.bool_),
         )
-
         return state
 
-    def boss_step(self, state):
-        step_size = 0.05
-        step_count = state.step_counter
-
-        condition = (state.enemies_y[0] <= 100) & ((step_count % 30) == 0)
-
-        def move_blocks(blocks):
-            not_removed = blocks[:, 0] > -99  # Filter out removed blocks
-            move_mask = condition & not_removed
-            return blocks.at[:, 1].set(
-                jnp.where(move_mask, blocks[:, 1] + step_size, blocks[:, 1])
-            )
-
-        new_green_blocks = move_blocks(state.green_blocks)
-        new_red_blocks = move_blocks(state.red_blocks)
-        new_blue_blocks = move_blocks(state.blue_blocks)
+    @stage("enemy_fire_step")
+    def enemy_fire_step(self, state: PhoenixState, key: chex.PRNGKey) -> Tuple[chex.Array, chex.Array]:
+        # Random decision: should each enemy fire?
+        enemy_should_fire = jax.random.uniform(key, (8,)) < self.consts.FIRE_CHANCE
 
-        new_enemy_y = jnp.where(condition, state.enemies_y + step_size, state.enemies_y.astype(jnp.float32))
+        # Fire only from active enemies
+        can_fire = (state.enemy_projectile_y < 0) & (state.enemies_x > -1)
+        not_attacking = jnp.logical_not(jnp.logical_or(state.phoenix_do_attack, state.phoenix_returning))
+        not_attacking = not_attacking & (~state.phoenix_returning)
+        enemy_fire_mask = enemy_should_fire & can_fire & not_attacking
 
-        projectile_active = (state.projectile_x >= 0) & (state.projectile_y >= 0)
-        projectile_pos = jnp.array([state.projectile_x, state.projectile_y])
 
-        def check_collision(entity_pos, projectile_pos):
-            enemy_x, enemy_y = entity_pos
-            projectile_x, projectile_y = projectile_pos
-
-            collision_x = (projectile_x + self.consts.PROJECTILE_WIDTH > enemy_x) & (
-                        projectile_x < enemy_x + self.consts.BLOCK_WIDTH)
-            collision_y = (projectile_y + self.consts.PROJECTILE_HEIGHT > enemy_y) & (
-                        projectile_y < enemy_y + self.consts.BLOCK_HEIGHT)
-            return collision_x & collision_y
+        # Fire from current enemy positions
+        enemy_projectile_x = jnp.where(enemy_fire_mask, state.enemies_x + self.consts.ENEMY_WIDTH // 2,
+                                           state.enemy_projectile_x)
+        enemy_projectile_y = jnp.where(enemy_fire_mask, state.enemies_y + self.consts.ENEMY_HEIGHT, state.enemy_projectile_y)
 
-        def process_collisions(_):
-            # Check collisions for each block group
-            green_block_collisions = jax.vmap(lambda entity_pos: check_collision(entity_pos, projectile_pos))(
-                new_green_blocks)
-            red_block_collisions = jax.vmap(lambda entity_pos: check_collision(entity_pos, projectile_pos))(
-                new_red_blocks)
-            blue_block_collisions = jax.vmap(lambda entity_pos: check_collision(entity_pos, projectile_pos))(
-                new_blue_blocks)
-
-            def remove_first_hit(blocks, collisions):
-                hit_indices = jnp.where(collisions, size=1, fill_value=-1)[0]
-                first_hit_index = hit_indices[0]  # scalar
-
-                def remove_block(i, arr):
-                    # Create a mask with True only at index i
-                    mask = jnp.arange(arr.shape[0]) == i  # shape (50,)
-                    # Broadcast mask to shape (50, 1) to align with arr shape (50, 2)
-                    mask = mask[:, None]  # shape (50, 1)
-
-                    # Create an array of -100 with the same shape as one block (2,)
-                    replacement = jnp.full(arr.shape[1:], -100)  # shape (2,)
-
-                    # Use jnp.where to replace the entire row at index i with -100 vector
-                    return jnp.where(mask, replacement, arr)
-
-                return jax.lax.cond(
-                    first_hit_index >= 0,
-                    lambda: remove_block(first_hit_index, blocks),
-                    lambda: blocks
-                ), first_hit_index
-
-            new_green, _ = remove_first_hit(new_green_blocks, green_block_collisions)
-            new_red, _ = remove_first_hit(new_red_blocks, red_block_collisions)
-            new_blue, first_hit_idx = remove_first_hit(new_blue_blocks, blue_block_collisions)
-            hit_any = jnp.any(green_block_collisions) | jnp.any(red_block_collisions) | jnp.any(blue_block_collisions)
-            return new_green, new_red, new_blue, hit_any
-
-        def skip_collisions(_):
-            return (new_green_blocks, new_red_blocks, new_blue_blocks, False)
-
-        # Use lax.cond to select between processing or skipping collision
-        new_green_blocks, new_red_blocks, new_blue_blocks, projectile_hit_detected = jax.lax.cond(
-            projectile_active,
-            process_collisions,
-            skip_collisions,
-            operand=None
-        )
+        # Move enemy projectiles downwards
+        enemy_projectile_y = jnp.where(state.enemy_projectile_y >= 0, state.enemy_projectile_y + self.consts.ENEMY_PROJECTILE_SPEED,
+                                           enemy_projectile_y)
 
-        def rotate(arr):
-            return jnp.stack([jnp.roll(arr[:, 0], 1), arr[:, 1]], axis=1)
+        # Remove enemy projectile if off-screen
+        enemy_projectile_y = jnp.where(enemy_projectile_y > 185 - self.consts.PROJECTILE_HEIGHT, -1, enemy_projectile_y) # TODO 185 durch Konstante ersetzen, die global geändert werden kann.
 
-        new_blue_blocks = jax.lax.cond(
-            jnp.logical_and(jnp.any(new_blue_blocks <= -100), step_count % 20 == 0),
-            lambda: rotate(new_blue_blocks),
-            lambda: new_blue_blocks,
-        )
-        projectile_x = jnp.where(projectile_hit_detected, -1, state.projectile_x)
-        projectile_y = jnp.where(projectile_hit_detected, -1, state.projectile_y)
+        return enemy_projectile_x, enemy_projectile_y
 
-        state = state._replace(
-            enemies_y=new_enemy_y.astype(jnp.float32),
-            blue_blocks=new_blue_blocks.astype(jnp.int32),
-            red_blocks=new_red_blocks.astype(jnp.int32),
-            green_blocks=new_green_blocks.astype(jnp.int32),
-            projectile_x=projectile_x.astype(jnp.int32),
-            projectile_y=projectile_y.astype(jnp.int32),
-            enemies_x = state.enemies_x.astype(jnp.float32),
-        )
-        return state
+    def _create_renderer(self):
+        return PhoenixRenderer(self.consts)
 
     def reset(self, key: jax.random.PRNGKey = jax.random.PRNGKey(42)) -> Tuple[PhoenixObservation, PhoenixState]:
 
@@ -786,15 +823,16 @@ class JaxPhoenix(JaxEnvironment[PhoenixState, PhoenixObservation, PhoenixInfo, N
             phoenix_returning=jnp.full((8,), False, dtype=jnp.bool),  # Returning status of the Phoenix
             phoenix_dying=jnp.full((8,), False, dtype=jnp.bool),  # Dying status of the Phoenix
             phoenix_death_timer=jnp.full((8,), 0, dtype=jnp.int32),  # Timer for Phoenix death animation
+            rng_key=key,
 
             player_dying=jnp.array(False, dtype = jnp.bool),  # Player dying status, bool
             player_death_timer=jnp.array(0, dtype = jnp.int32),  # Timer for player death animation, int
             player_moving=jnp.array(False, dtype = jnp.bool), # Player moving status, bool
 
-            # Initialierung der Blockpositionen
-            blue_blocks=self.consts.BLUE_BLOCK_POSITIONS.astype(jnp.int32),
-            red_blocks=self.consts.RED_BLOCK_POSITIONS.astype(jnp.int32),
-            green_blocks = self.consts.GREEN_BLOCK_POSITIONS.astype(jnp.int32),
+            # Alle Boss-Blöcke stehen
+            blue_blocks=jnp.full((self.consts.BLUE_BLOCK_POSITIONS.shape[0],), True),
+            red_blocks=jnp.full((self.consts.RED_BLOCK_POSITIONS.shape[0],), True),
+            green_blocks=jnp.full((self.consts.GREEN_BLOCK_POSITIONS.shape[0],), True),
         )
 
         initial_obs = self._get_observation(return_state)
@@ -831,16 +869,8 @@ class JaxPhoenix(JaxEnvironment[PhoenixState, PhoenixObservation, PhoenixInfo, N
         ])
         firing = jnp.any(fire_actions) & can_fire
 
-        state = jax.lax.cond(
-            jnp.logical_or((state.level % 5) == 1, (state.level % 5) == 2),
-            lambda: self.phoenix_step(state),
-            lambda: jax.lax.cond(
-                jnp.logical_or((state.level % 5) == 3, (state.level % 5) == 4),
-                lambda: self.bat_step(state),
-                lambda: self.boss_step(state),
-
-            )
-        )
+        rng_key, enemy_keys, fire_key = self.random_keys(state)
+        state = self.enemy_step(state, enemy_keys)
         projectile_x = jnp.where(firing,
                                  state.player_x + 2,
                                  state.projectile_x).astype(jnp.int32)
@@ -851,34 +881,7 @@ class JaxPhoenix(JaxEnvironment[PhoenixState, PhoenixObservation, PhoenixInfo, N
                                            state.projectile_y - 3,  # move up if active
                                            state.projectile_y))  # stay
         projectile_y = jnp.where(projectile_y < 0, -6, projectile_y)
-        # use step_counter for randomness
-        def generate_fire_key_and_chance(step_counter: int, fire_chance: float) -> Tuple[jax.random.PRNGKey, float]:
-            key = jax.random.PRNGKey(step_counter)
-            return key, fire_chance
-
-        key, fire_chance = generate_fire_key_and_chance(state.step_counter, self.consts.FIRE_CHANCE)
-
-        # Random decision: should each enemy fire?
-        enemy_should_fire = jax.random.uniform(key, (8,)) < fire_chance
-
-        # Fire only from active enemies
-        can_fire = (state.enemy_projectile_y < 0) & (state.enemies_x > -1)
-        not_attacking = jnp.logical_not(jnp.logical_or(state.phoenix_do_attack, state.phoenix_returning))
-        not_attacking = not_attacking & (~state.phoenix_returning)
-        enemy_fire_mask = enemy_should_fire & can_fire & not_attacking
-
-
-        # Fire from current enemy positions
-        enemy_projectile_x = jnp.where(enemy_fire_mask, state.enemies_x + self.consts.ENEMY_WIDTH // 2,
-                                           state.enemy_projectile_x)
-        enemy_projectile_y = jnp.where(enemy_fire_mask, state.enemies_y + self.consts.ENEMY_HEIGHT, state.enemy_projectile_y)
-
-        # Move enemy projectiles downwards
-        enemy_projectile_y = jnp.where(state.enemy_projectile_y >= 0, state.enemy_projectile_y + self.consts.ENEMY_PROJECTILE_SPEED,
-                                           enemy_projectile_y)
-
-        # Remove enemy projectile if off-screen
-        enemy_projectile_y = jnp.where(enemy_projectile_y > 185 - self.consts.PROJECTILE_HEIGHT, -1, enemy_projectile_y) # TODO 185 durch Konstante ersetzen, die global geändert werden kann.
+        enemy_projectile_x, enemy_projectile_y = self.enemy_fire_step(state, fire_key)
 
 
 
@@ -1013,9 +1016,9 @@ class JaxPhoenix(JaxEnvironment[PhoenixState, PhoenixObservation, PhoenixInfo, N
         # Boss-Blöcke nur beim Eintritt in das Boss-Level neu initialisieren
         enter_boss_next = ((pending_next_level % 5) == 0)
         reset_blocks = reset_mask & enter_boss_next
-        blue_blocks = jnp.where(reset_blocks, self.consts.BLUE_BLOCK_POSITIONS.astype(jnp.float32), state.blue_blocks)
-        red_blocks = jnp.where(reset_blocks, self.consts.RED_BLOCK_POSITIONS.astype(jnp.float32), state.red_blocks)
-        green_blocks = jnp.where(reset_blocks, self.consts.GREEN_BLOCK_POSITIONS.astype(jnp.float32), state.green_blocks)
+        blue_blocks = state.blue_blocks | reset_blocks
+        red_blocks = state.red_blocks | reset_blocks
+        green_blocks = state.green_blocks | reset_blocks
 
         # Gegner-Respawn nach Spieler-Respawn nur, wenn kein Level-Übergang läuft
         enemy_respawn_x = jax.lax.switch((level - 1) % 5, self.consts.ENEMY_POSITIONS_X_LIST).astype(jnp.float32)
@@ -1030,6 +1033,7 @@ class JaxPhoenix(JaxEnvironment[PhoenixState, PhoenixObservation, PhoenixInfo, N
 
         is_vulnerable = (new_respawn_timer <= 0) & (~state.player_dying) & (~state.invincibility)
 
+        @stage("player_hit")
         def check_player_hit(projectile_xs, projectile_ys, player_x, player_y):
             def is_hit(px, py):
                 hit_x = (px + self.consts.PROJECTILE_WIDTH > player_x) & (px < player_x + 5) # TODO 5 durch Konstante ersetzen, die global geändert werden kann.
@@ -1114,9 +1118,9 @@ class JaxPhoenix(JaxEnvironment[PhoenixState, PhoenixObservation, PhoenixInfo, N
             player_respawn_timer = player_respawn_timer,
             level = level,
             vertical_direction_enemies=new_vertical_direction_enemies,
-            blue_blocks=blue_blocks.astype(jnp.int32),
-            red_blocks=red_blocks.astype(jnp.int32),
-            green_blocks=green_blocks.astype(jnp.int32),
+            blue_blocks=blue_blocks,
+            red_blocks=red_blocks,
+            green_blocks=green_blocks,
             invincibility=state.invincibility,
             invincibility_timer=state.invincibility_timer,
             bat_wings=new_bat_wings,
@@ -1137,7 +1141,7 @@ class JaxPhoenix(JaxEnvironment[PhoenixState, PhoenixObservation, PhoenixInfo, N
             ability_cooldown=state.ability_cooldown,
             bat_wing_regen_timer=state.bat_wing_regen_timer,
             bat_y_cooldown=state.bat_y_cooldown,
-
+            rng_key=rng_key,
         )
         observation = self._get_observation(return_state)
         env_reward = jnp.where(enemy_hit_detected, 1.0, 0.0)
@@ -1181,12 +1185,6 @@ class PhoenixRenderer(JAXGameRenderer):
             self.SPRITE_BAT_BLUE_MAIN,
             self.SPRITE_BAT_BLUE_LEFT_WING_MIDDLE,
             self.SPRITE_BAT_BLUE_RIGHT_WING_MIDDLE,
-            self.SPRITE_BAT_BLUE_LEFT_WING_UP,
-            self.SPRITE_BAT_BLUE_RIGHT_WING_UP,
-            self.SPRITE_BAT_BLUE_LEFT_WING_DOWN,
-            self.SPRITE_BAT_BLUE_RIGHT_WING_DOWN,
-            self.SPRITE_BAT_BLUE_LEFT_WING_DOWN_2,
-            self.SPRITE_BAT_BLUE_RIGHT_WING_DOWN_2,
             self.SPRITE_BAT_BLUE_DEATH_1,
             self.SPRITE_BAT_BLUE_DEATH_2,
             self.SPRITE_BAT_BLUE_DEATH_3,
@@ -1194,22 +1192,9 @@ class PhoenixRenderer(JAXGameRenderer):
             self.SPRITE_BAT_RED_MAIN,
             self.SPRITE_BAT_RED_LEFT_WING_MIDDLE,
             self.SPRITE_BAT_RED_RIGHT_WING_MIDDLE,
-            self.SPRITE_BAT_RED_LEFT_WING_UP,
-            self.SPRITE_BAT_RED_RIGHT_WING_UP,
-            self.SPRITE_BAT_RED_LEFT_WING_DOWN,
-            self.SPRITE_BAT_RED_RIGHT_WING_DOWN,
-            self.SPRITE_BAT_RED_LEFT_WING_DOWN_2,
-            self.SPRITE_BAT_RED_RIGHT_WING_DOWN_2,
             self.SPRITE_BAT_RED_DEATH_1,
             self.SPRITE_BAT_RED_DEATH_2,
             self.SPRITE_BAT_RED_DEATH_3,
-            # --- OLD BAT SPRITES -- TODO: remove
-            self.SPRITE_MAIN_BAT_1,
-            self.SPRITE_LEFT_WING_BAT_1,
-            self.SPRITE_RIGHT_WING_BAT_1,
-            self.SPRITE_MAIN_BAT_2,
-            self.SPRITE_LEFT_WING_BAT_2,
-            self.SPRITE_RIGHT_WING_BAT_2,
             # --- BOSS SPRITES ---
             self.SPRITE_BOSS,
             self.SPRITE_RED_BLOCK,
@@ -1217,6 +1202,130 @@ class PhoenixRenderer(JAXGameRenderer):
             self.SPRITE_GREEN_BLOCK,
 
         ) = self.load_sprites()
+        # Boss blocks padded to one size so they can be drawn in a single render_many pass
+        padded_blocks, _ = pad_to_match([self.SPRITE_BLUE_BLOCK, self.SPRITE_RED_BLOCK, self.SPRITE_GREEN_BLOCK])
+        self.BOSS_BLOCK_ATLAS = jnp.stack(padded_blocks)
+        self.SHIELD_ORIGIN, self.SHIELD_OWNERS, self.SHIELD_COLORS = self.build_shield()
+        self.ENEMY_BANK, self.ENEMY_BANK_OFFSETS = self.build_enemy_bank()
+        # palette-index versions of all drawn sprites for render_indexed
+        (
+            self.INDEXED_BG,
+            self.INDEXED_FLOOR,
+            self.INDEXED_DIGITS,
+            self.INDEXED_LIFE_INDICATOR,
+            self.INDEXED_PLAYER,
+            self.INDEXED_PLAYER_DEATH_1,
+            self.INDEXED_PLAYER_DEATH_2,
+            self.INDEXED_PLAYER_DEATH_3,
+            self.INDEXED_PLAYER_MOVE,
+            self.INDEXED_PLAYER_ABILITY,
+            self.INDEXED_PLAYER_PROJECTILE,
+            self.INDEXED_ENEMY_PROJECTILE,
+            self.INDEXED_ENEMY_BANK,
+            self.INDEXED_SHIELD_COLORS,
+        ) = [jr.index_sprite(sprite, self.palette) for sprite in self.palette_sources()[0]]
+
+    def build_shield(self):
+        """
+        Pre-draws the boss shield, blue, red and green blocks in index order with later blocks on top.
+        Returns: The (x, y) of its top-left pixel, the (H, W, K) indices of the blocks covering every pixel
+            (topmost first, blue then red then green, padded with the number of blocks) and their (H, W, K, 4) colors.
+        """
+        atlas = np.asarray(self.BOSS_BLOCK_ATLAS)
+        block_positions = [
+            np.asarray(self.consts.BLUE_BLOCK_POSITIONS),
+            np.asarray(self.consts.RED_BLOCK_POSITIONS),
+            np.asarray(self.consts.GREEN_BLOCK_POSITIONS),
+        ]
+        positions = np.concatenate(block_positions)
+        sprite_ids = np.repeat(np.arange(len(block_positions)), [len(p) for p in block_positions])
+        origin = positions.min(axis=0)
+        width, height = positions.max(axis=0) - origin + (atlas.shape[2], atlas.shape[1])
+
+        covering = [[[] for _ in range(width)] for _ in range(height)]
+        for index in reversed(range(len(positions))):
+            x, y = positions[index] - origin
+            for dy, dx in zip(*np.nonzero(atlas[sprite_ids[index], ..., 3] > 0)):
+                covering[y + dy][x + dx].append(index)
+        depth = max(len(blocks) for row in covering for blocks in row)
+        owners = np.full((height, width, depth), len(positions), dtype=np.int32)
+        colors = np.zeros((height, width, depth, 4), dtype=atlas.dtype)
+        for y, row in enumerate(covering):
+            for x, blocks in enumerate(row):
+                owners[y, x, :len(blocks)] = blocks
+                for k, index in enumerate(blocks):
+                    colors[y, x, k] = atlas[sprite_ids[index], y - (positions[index, 1] - origin[1]),
+                                            x - (positions[index, 0] - origin[0])]
+        return tuple(int(v) for v in origin), jnp.asarray(owners), jnp.asarray(colors)
+
+    def build_enemy_bank(self):
+        """
+        Pre-composites every look an enemy can have, so that render draws each enemy from one index.
+        The bank holds the phoenix (frame 1, frame 2, attack, death 1, death 2) at 0-4, the blue bat
+        (no wings, left wing, right wing, both wings, death 1, death 2, death 3) at 5-11, the red bat at 12-18
+        and the boss at 19.
+        Returns: The (20, H, W, 4) bank and the (20, 2) offsets of its sprites from the enemy position.
+        """
+        frame = lambda sprite: np.asarray(sprite)[0]
+        wing_y = 2  # beide Flügel 2px tiefer
+        right_wing_x = self.consts.ENEMY_WIDTH - 1  # rechter Flügel 1px weiter links
+
+        entries = [[(0, 0, frame(sprite))] for sprite in (
+            self.SPRITE_PHOENIX_1,
+            self.SPRITE_PHOENIX_2,
+            self.SPRITE_PHOENIX_ATTACK,
+            self.SPRITE_PHOENIX_DEATH_1,
+            self.SPRITE_PHOENIX_DEATH_2,
+        )]
+        for body, left_wing, right_wing, deaths in (
+            (self.SPRITE_BAT_BLUE_MAIN, self.SPRITE_BAT_BLUE_LEFT_WING_MIDDLE, self.SPRITE_BAT_BLUE_RIGHT_WING_MIDDLE,
+             (self.SPRITE_BAT_BLUE_DEATH_1, self.SPRITE_BAT_BLUE_DEATH_2, self.SPRITE_BAT_BLUE_DEATH_3)),
+            (self.SPRITE_BAT_RED_MAIN, self.SPRITE_BAT_RED_LEFT_WING_MIDDLE, self.SPRITE_BAT_RED_RIGHT_WING_MIDDLE,
+             (self.SPRITE_BAT_RED_DEATH_1, self.SPRITE_BAT_RED_DEATH_2, self.SPRITE_BAT_RED_DEATH_3)),
+        ):
+            body = [(0, 0, frame(body))]
+            left = [(-self.consts.WING_WIDTH, wing_y, frame(left_wing))]
+            right = [(right_wing_x, wing_y, frame(right_wing))]
+            entries += [body, body + left, body + right, body + left + right]
+            # Death-Sprite zentriert auf den Körper-Anker ausrichten
+            bh, bw = body[0][2].shape[:2]
+            for death in deaths:
+                dh, dw = frame(death).shape[:2]
+                entries.append([((bw - dw) // 2 - 5, (bh - dh) // 2, frame(death))])
+        entries.append([(0, 0, frame(self.SPRITE_BOSS))])
+
+        sprites, offsets = [], []
+        for layers in entries:
+            left = min(dx for dx, _, _ in layers)
+            top = min(dy for _, dy, _ in layers)
+            width = max(dx + sprite.shape[1] for dx, _, sprite in layers) - left
+            height = max(dy + sprite.shape[0] for _, dy, sprite in layers) - top
+            canvas = np.zeros((height, width, 4), dtype=layers[0][2].dtype)
+            for dx, dy, sprite in layers:
+                window = canvas[dy - top:dy - top + sprite.shape[0], dx - left:dx - left + sprite.shape[1]]
+                window[...] = np.where(sprite[..., 3:] > 0, sprite, window)
+            sprites.append(jnp.asarray(canvas))
+            offsets.append((left, top))
+        padded, _ = pad_to_match(sprites)
+        return jnp.stack(padded), jnp.array(offsets, dtype=jnp.int32)
+
+    def render_shield(self, raster, state):
+        """
+        Draws the boss blocks with one blit, every pixel of the pre-drawn shield shows its topmost standing block.
+        Index rasters get the palette-index colors of the shield.
+        """
+        indexed = raster.ndim == 2
+        shield_colors = self.INDEXED_SHIELD_COLORS if indexed else self.SHIELD_COLORS
+        channels = (1,) * (shield_colors.ndim - 3)
+        standing = jnp.concatenate((state.blue_blocks, state.red_blocks, state.green_blocks, jnp.array([False])))
+        covered = standing[self.SHIELD_OWNERS] & (state.level % 5 == 0)
+        top = jnp.argmax(covered, axis=-1)
+        shield = jnp.take_along_axis(shield_colors, top.reshape(top.shape + (1,) + channels), axis=2)[:, :, 0]
+        shield = jnp.where(
+            jnp.any(covered, axis=-1).reshape(top.shape + channels), shield, jr.TRANSPARENT_INDEX if indexed else 0
+        ).astype(shield_colors.dtype)
+        return jr.blit(raster, self.SHIELD_ORIGIN[0], self.SHIELD_ORIGIN[1], shield)
+
     def load_sprites(self):
         MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
 
@@ -1244,12 +1353,6 @@ class PhoenixRenderer(JAXGameRenderer):
         bat_blue_main_sprite = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_blue/bat_blue_main.npy"))
         bat_blue_left_wing_middle_sprite = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_blue/bat_blue_left_wing_middle.npy"))
         bat_blue_right_wing_middle_sprite = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_blue/bat_blue_right_wing_middle.npy"))
-        bat_blue_left_wing_up_sprite = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_blue/bat_blue_left_wing_up.npy"))
-        bat_blue_right_wing_up_sprite = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_blue/bat_blue_right_wing_up.npy"))
-        bat_blue_left_wing_down_sprite = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_blue/bat_blue_left_wing_down.npy"))
-        bat_blue_right_wing_down_sprite = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_blue/bat_blue_right_wing_down.npy"))
-        bat_blue_left_wing_down_2_sprite = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_blue/bat_blue_left_wing_down_2.npy"))
-        bat_blue_right_wing_down_2_sprite = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_blue/bat_blue_right_wing_down_2.npy"))
         bat_blue_death_1_sprite = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_blue/bat_blue_death_1.npy"))
         bat_blue_death_2_sprite = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_blue/bat_blue_death_2.npy"))
         bat_blue_death_3_sprite = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_blue/bat_blue_death_3.npy"))
@@ -1257,24 +1360,10 @@ class PhoenixRenderer(JAXGameRenderer):
         bat_red_main_sprite = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_red/bat_red_main.npy"))
         bat_red_left_wing_middle_sprite = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_red/bat_red_left_wing_middle.npy"))
         bat_red_right_wing_middle_sprite = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_red/bat_red_right_wing_middle.npy"))
-        bat_red_left_wing_up_sprite = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_red/bat_red_left_wing_up.npy"))
-        bat_red_right_wing_up_sprite = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_red/bat_red_right_wing_up.npy"))
-        bat_red_left_wing_down_sprite = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_red/bat_red_left_wing_down.npy"))
-        bat_red_right_wing_down_sprite = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_red/bat_red_right_wing_down.npy"))
-        bat_red_left_wing_down_2_sprite = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_red/bat_red_left_wing_down_2.npy"))
-        bat_red_right_wing_down_2_sprite = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_red/bat_red_right_wing_down_2.npy"))
         bat_red_death_1_sprite = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_red/bat_red_death_1.npy"))
         bat_red_death_2_sprite = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_red/bat_red_death_2.npy"))
         bat_red_death_3_sprite = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_red/bat_red_death_3.npy"))
 
-        # --- OLD BAT SPRITES --- TODO: Remove
-        main_bat_1 = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_1_main.npy"))
-        left_wing_bat_1 = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_1_wing_left.npy"))
-        right_wing_bat_1 = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_1_wing_right.npy"))
-        main_bat_2 = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_2_main.npy"))
-        left_wing_bat_2 = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_2_wing_left.npy"))
-        right_wing_bat_2 = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/enemy_bats/bats_2_wing_right.npy"))
-
         # --- LOAD BOSS SPRITES ---
         boss_sprite = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/boss/boss.npy"))
         boss_block_red = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/phoenix/boss/red_block.npy"))
@@ -1289,30 +1378,20 @@ class PhoenixRenderer(JAXGameRenderer):
         padded_player_sprites, _ = pad_to_match(player_sprites_to_pad)
         player_sprite, player_death_1_sprite, player_death_2_sprite, player_death_3_sprite, player_move_sprite = padded_player_sprites
 
-        bat_blue_wing_sprites_to_pad = [
-            bat_blue_left_wing_middle_sprite, bat_blue_right_wing_middle_sprite,
-            bat_blue_left_wing_up_sprite, bat_blue_right_wing_up_sprite,
-            bat_blue_left_wing_down_sprite, bat_blue_right_wing_down_sprite,
-            bat_blue_left_wing_down_2_sprite, bat_blue_right_wing_down_2_sprite
-        ]
+        bat_blue_wing_sprites_to_pad = [bat_blue_left_wing_middle_sprite, bat_blue_right_wing_middle_sprite]
         padded_bat_blue_wings, _ = pad_to_match(bat_blue_wing_sprites_to_pad)
-        bat_blue_left_wing_middle_sprite, bat_blue_right_wing_middle_sprite, bat_blue_left_wing_up_sprite, bat_blue_right_wing_up_sprite, bat_blue_left_wing_down_sprite, bat_blue_right_wing_down_sprite, bat_blue_left_wing_down_2_sprite, bat_blue_right_wing_down_2_sprite = padded_bat_blue_wings
+        bat_blue_left_wing_middle_sprite, bat_blue_right_wing_middle_sprite = padded_bat_blue_wings
 
         bat_blue_sprites_to_pad = [bat_blue_main_sprite, bat_blue_death_1_sprite, bat_blue_death_2_sprite, bat_blue_death_3_sprite]
         padded_bat_blue_sprites, _ = pad_to_match(bat_blue_sprites_to_pad)
         bat_blue_main_sprite, bat_blue_death_1_sprite, bat_blue_death_2_sprite, bat_blue_death_3_sprite = padded_bat_blue_sprites
 
-        bat_red_wing_sprites_to_pad = [
-            bat_red_left_wing_middle_sprite, bat_red_right_wing_middle_sprite,
-            bat_red_left_wing_up_sprite, bat_red_right_wing_up_sprite,
-            bat_red_left_wing_down_sprite, bat_red_right_wing_down_sprite,
-            bat_red_left_wing_down_2_sprite, bat_red_right_wing_down_2_sprite
-        ]
+        bat_red_wing_sprites_to_pad = [bat_red_left_wing_middle_sprite, bat_red_right_wing_middle_sprite]
         padded_bat_red_wings, _ = pad_to_match(bat_red_wing_sprites_to_pad)
-        bat_red_left_wing_middle_sprite, bat_red_right_wing_middle_sprite, bat_red_left_wing_up_sprite, bat_red_right_wing_up_sprite, bat_red_left_wing_down_sprite, bat_red_right_wing_down_sprite, bat_red_left_wing_down_2_sprite, bat_red_right_wing_down_2_sprite = padded_bat_red_wings
+        bat_red_left_wing_middle_sprite, bat_red_right_wing_middle_sprite = padded_bat_red_wings
 
-        bat_red_wing_sprites_to_pad = [bat_red_main_sprite, bat_red_death_1_sprite, bat_red_death_2_sprite, bat_red_death_3_sprite]
-        padded_bat_red_sprites, _ = pad_to_match(bat_red_wing_sprites_to_pad)
+        bat_red_sprites_to_pad = [bat_red_main_sprite, bat_red_death_1_sprite, bat_red_death_2_sprite, bat_red_death_3_sprite]
+        padded_bat_red_sprites, _ = pad_to_match(bat_red_sprites_to_pad)
         bat_red_main_sprite, bat_red_death_1_sprite, bat_red_death_2_sprite, bat_red_death_3_sprite = padded_bat_red_sprites
 
         # --- PLAYER SPRITES ---
@@ -1341,12 +1420,6 @@ class PhoenixRenderer(JAXGameRenderer):
         SPRITE_BAT_BLUE_MAIN = jnp.expand_dims(bat_blue_main_sprite, axis=0)
         SPRITE_BAT_BLUE_LEFT_WING_MIDDLE = jnp.expand_dims(bat_blue_left_wing_middle_sprite, axis=0)
         SPRITE_BAT_BLUE_RIGHT_WING_MIDDLE = jnp.expand_dims(bat_blue_right_wing_middle_sprite, axis=0)
-        SPRITE_BAT_BLUE_LEFT_WING_UP = jnp.expand_dims(bat_blue_left_wing_up_sprite, axis=0)
-        SPRITE_BAT_BLUE_RIGHT_WING_UP = jnp.expand_dims(bat_blue_right_wing_up_sprite, axis=0)
-        SPRITE_BAT_BLUE_LEFT_WING_DOWN = jnp.expand_dims(bat_blue_left_wing_down_sprite, axis=0)
-        SPRITE_BAT_BLUE_RIGHT_WING_DOWN = jnp.expand_dims(bat_blue_right_wing_down_sprite, axis=0)
-        SPRITE_BAT_BLUE_LEFT_WING_DOWN_2 = jnp.expand_dims(bat_blue_left_wing_down_2_sprite, axis=0)
-        SPRITE_BAT_BLUE_RIGHT_WING_DOWN_2 = jnp.expand_dims(bat_blue_right_wing_down_2_sprite, axis=0)
         SPRITE_BAT_BLUE_DEATH_1 = jnp.expand_dims(bat_blue_death_1_sprite, axis=0)
         SPRITE_BAT_BLUE_DEATH_2 = jnp.expand_dims(bat_blue_death_2_sprite, axis=0)
         SPRITE_BAT_BLUE_DEATH_3 = jnp.expand_dims(bat_blue_death_3_sprite, axis=0)
@@ -1354,23 +1427,9 @@ class PhoenixRenderer(JAXGameRenderer):
         SPRITE_BAT_RED_MAIN = jnp.expand_dims(bat_red_main_sprite, axis=0)
         SPRITE_BAT_RED_LEFT_WING_MIDDLE = jnp.expand_dims(bat_red_left_wing_middle_sprite, axis=0)
         SPRITE_BAT_RED_RIGHT_WING_MIDDLE = jnp.expand_dims(bat_red_right_wing_middle_sprite, axis=0)
-        SPRITE_BAT_RED_LEFT_WING_UP = jnp.expand_dims(bat_red_left_wing_up_sprite, axis=0)
-        SPRITE_BAT_RED_RIGHT_WING_UP = jnp.expand_dims(bat_red_right_wing_up_sprite, axis=0)
-        SPRITE_BAT_RED_LEFT_WING_DOWN = jnp.expand_dims(bat_red_left_wing_down_sprite, axis=0)
-        SPRITE_BAT_RED_RIGHT_WING_DOWN = jnp.expand_dims(bat_red_right_wing_down_sprite, axis=0)
-        SPRITE_BAT_RED_LEFT_WING_DOWN_2 = jnp.expand_dims(bat_red_left_wing_down_2_sprite, axis=0)
-        SPRITE_BAT_RED_RIGHT_WING_DOWN_2 = jnp.expand_dims(bat_red_right_wing_down_2_sprite, axis=0)
         SPRITE_BAT_RED_DEATH_1 = jnp.expand_dims(bat_red_death_1_sprite, axis=0)
         SPRITE_BAT_RED_DEATH_2 = jnp.expand_dims(bat_red_death_2_sprite, axis=0)
         SPRITE_BAT_RED_DEATH_3 = jnp.expand_dims(bat_red_death_3_sprite, axis=0)
-
-        # --- OLD BATS SPRITES ---
-        SPRITE_MAIN_BAT_1 = jnp.expand_dims(main_bat_1, axis=0)
-        SPRITE_LEFT_WING_BAT_1 = jnp.expand_dims(left_wing_bat_1, axis=0)
-        SPRITE_RIGHT_WING_BAT_1 = jnp.expand_dims(right_wing_bat_1, axis=0)
-        SPRITE_MAIN_BAT_2 = jnp.expand_dims(main_bat_2, axis=0)
-        SPRITE_LEFT_WING_BAT_2 = jnp.expand_dims(left_wing_bat_2, axis=0)
-        SPRITE_RIGHT_WING_BAT_2 = jnp.expand_dims(right_wing_bat_2, axis=0)
         # --- BOSS SPRITES ---
         SPRITE_BOSS = jnp.expand_dims(boss_sprite, axis=0)
         SPRITE_BLUE_BLOCK = boss_block_blue
@@ -1404,12 +1463,6 @@ class PhoenixRenderer(JAXGameRenderer):
             SPRITE_BAT_BLUE_MAIN,
             SPRITE_BAT_BLUE_LEFT_WING_MIDDLE,
             SPRITE_BAT_BLUE_RIGHT_WING_MIDDLE,
-            SPRITE_BAT_BLUE_LEFT_WING_UP,
-            SPRITE_BAT_BLUE_RIGHT_WING_UP,
-            SPRITE_BAT_BLUE_LEFT_WING_DOWN,
-            SPRITE_BAT_BLUE_RIGHT_WING_DOWN,
-            SPRITE_BAT_BLUE_LEFT_WING_DOWN_2,
-            SPRITE_BAT_BLUE_RIGHT_WING_DOWN_2,
             SPRITE_BAT_BLUE_DEATH_1,
             SPRITE_BAT_BLUE_DEATH_2,
             SPRITE_BAT_BLUE_DEATH_3,
@@ -1417,22 +1470,9 @@ class PhoenixRenderer(JAXGameRenderer):
             SPRITE_BAT_RED_MAIN,
             SPRITE_BAT_RED_LEFT_WING_MIDDLE,
             SPRITE_BAT_RED_RIGHT_WING_MIDDLE,
-            SPRITE_BAT_RED_LEFT_WING_UP,
-            SPRITE_BAT_RED_RIGHT_WING_UP,
-            SPRITE_BAT_RED_LEFT_WING_DOWN,
-            SPRITE_BAT_RED_RIGHT_WING_DOWN,
-            SPRITE_BAT_RED_LEFT_WING_DOWN_2,
-            SPRITE_BAT_RED_RIGHT_WING_DOWN_2,
             SPRITE_BAT_RED_DEATH_1,
             SPRITE_BAT_RED_DEATH_2,
             SPRITE_BAT_RED_DEATH_3,
-            # --- OLD BAT SPRITES --- # TODO remove
-            SPRITE_MAIN_BAT_1,
-            SPRITE_LEFT_WING_BAT_1,
-            SPRITE_RIGHT_WING_BAT_1,
-            SPRITE_MAIN_BAT_2,
-            SPRITE_LEFT_WING_BAT_2,
-            SPRITE_RIGHT_WING_BAT_2,
             # --- BOSS SPRITES ---
             SPRITE_BOSS,
             SPRITE_RED_BLOCK,
@@ -1443,76 +1483,103 @@ class PhoenixRenderer(JAXGameRenderer):
 
     # load sprites on module layer
 
+    def palette_sources(self):
+        sprites = [
+            self.BG_SPRITE,
+            self.SPRITE_FLOOR,
+            self.DIGITS,
+            self.LIFE_INDICATOR,
+            self.SPRITE_PLAYER,
+            self.SPRITE_PLAYER_DEATH_1,
+            self.SPRITE_PLAYER_DEATH_2,
+            self.SPRITE_PLAYER_DEATH_3,
+            self.SPRITE_PLAYER_MOVE,
+            self.SPRITE_PLAYER_ABILITY,
+            self.SPRITE_PLAYER_PROJECTILE,
+            self.SPRITE_ENEMY_PROJECTILE,
+            # all enemy and boss block sprites are drawn from the bank and the pre-drawn shield
+            self.ENEMY_BANK,
+            self.SHIELD_COLORS,
+        ]
+        return sprites, []
+
     @partial(jax.jit, static_argnums=(0,))
     def render(self, state):
         raster = jr.create_initial_frame(width=160, height=210)
+        sprites = (
+            self.BG_SPRITE,
+            self.SPRITE_FLOOR,
+            self.DIGITS,
+            self.LIFE_INDICATOR,
+            self.SPRITE_PLAYER,
+            self.SPRITE_PLAYER_DEATH_1,
+            self.SPRITE_PLAYER_DEATH_2,
+            self.SPRITE_PLAYER_DEATH_3,
+            self.SPRITE_PLAYER_MOVE,
+            self.SPRITE_PLAYER_ABILITY,
+            self.SPRITE_PLAYER_PROJECTILE,
+            self.SPRITE_ENEMY_PROJECTILE,
+            self.ENEMY_BANK,
+        )
+        return self._draw(raster, state, sprites)
+
+    @partial(jax.jit, static_argnums=(0,))
+    def render_indexed(self, state):
+        raster = jr.create_initial_index_frame(width=160, height=210)
+        sprites = (
+            self.INDEXED_BG,
+            self.INDEXED_FLOOR,
+            self.INDEXED_DIGITS,
+            self.INDEXED_LIFE_INDICATOR,
+            self.INDEXED_PLAYER,
+            self.INDEXED_PLAYER_DEATH_1,
+            self.INDEXED_PLAYER_DEATH_2,
+            self.INDEXED_PLAYER_DEATH_3,
+            self.INDEXED_PLAYER_MOVE,
+            self.INDEXED_PLAYER_ABILITY,
+            self.INDEXED_PLAYER_PROJECTILE,
+            self.INDEXED_ENEMY_PROJECTILE,
+            self.INDEXED_ENEMY_BANK,
+        )
+        return self._draw(raster, state, sprites)
+
+    def _draw(self, raster, state, sprites):
+        """Draws the game onto an RGB or palette-index raster with the matching sprites."""
+        (
+            sprite_bg,
+            sprite_floor,
+            digits,
+            life_indicator,
+            sprite_player,
+            sprite_player_death_1,
+            sprite_player_death_2,
+            sprite_player_death_3,
+            sprite_player_move,
+            sprite_player_ability,
+            sprite_player_projectile,
+            sprite_enemy_projectile,
+            enemy_bank,
+        ) = sprites
 
         # Render background
-        frame_bg = jr.get_sprite_frame(self.BG_SPRITE, 0)
-        raster = jr.render_at(raster, 0, 0, frame_bg)
+        frame_bg = jr.get_sprite_frame(sprite_bg, 0)
+        raster = jr.blit(raster, 0, 0, frame_bg)
 
         # Render floor
-        frame_floor = jr.get_sprite_frame(self.SPRITE_FLOOR, 0)
-        raster = jr.render_at(raster, 0, 185, frame_floor)
+        frame_floor = jr.get_sprite_frame(sprite_floor, 0)
+        raster = jr.blit(raster, 0, 185, frame_floor)
 
         # Render player
-        frame_player = jr.get_sprite_frame(self.SPRITE_PLAYER, 0)
-        frame_player_death_1 = jr.get_sprite_frame(self.SPRITE_PLAYER_DEATH_1, 0)
-        frame_player_death_2 = jr.get_sprite_frame(self.SPRITE_PLAYER_DEATH_2, 0)
-        frame_player_death_3 = jr.get_sprite_frame(self.SPRITE_PLAYER_DEATH_3, 0)
-        frame_player_move = jr.get_sprite_frame(self.SPRITE_PLAYER_MOVE, 0)
-        frame_player_ability = jr.get_sprite_frame(self.SPRITE_PLAYER_ABILITY, 0)
-        #raster = jr.render_at(raster, state.player_x, state.player_y, frame_player)
+        frame_player = jr.get_sprite_frame(sprite_player, 0)
+        frame_player_death_1 = jr.get_sprite_frame(sprite_player_death_1, 0)
+        frame_player_death_2 = jr.get_sprite_frame(sprite_player_death_2, 0)
+        frame_player_death_3 = jr.get_sprite_frame(sprite_player_death_3, 0)
+        frame_player_move = jr.get_sprite_frame(sprite_player_move, 0)
+        frame_player_ability = jr.get_sprite_frame(sprite_player_ability, 0)
+        #raster = jr.blit(raster, state.player_x, state.player_y, frame_player)
 
         # Render projectiles
-        frame_projectile = jr.get_sprite_frame(self.SPRITE_PLAYER_PROJECTILE, 0)
-        frame_enemy_projectile = jr.get_sprite_frame(self.SPRITE_ENEMY_PROJECTILE, 0)
-
-        # Render enemy phoenix
-        frame_phoenix_1 = jr.get_sprite_frame(self.SPRITE_PHOENIX_1, 0)
-        frame_phoenix_2 = jr.get_sprite_frame(self.SPRITE_PHOENIX_2, 0)
-        frame_phoenix_attack = jr.get_sprite_frame(self.SPRITE_PHOENIX_ATTACK, 0)
-        frame_phoenix_death_1 = jr.get_sprite_frame(self.SPRITE_PHOENIX_DEATH_1, 0)
-        frame_phoenix_death_2 = jr.get_sprite_frame(self.SPRITE_PHOENIX_DEATH_2, 0)
-
-        # Render enemy bats --- OLD --- TODO: remove
-        frame_main_bat = jr.get_sprite_frame(self.SPRITE_MAIN_BAT_1, 0)
-        frame_left_wing_bat_1 = jr.get_sprite_frame(self.SPRITE_LEFT_WING_BAT_1, 0)
-        frame_right_wing_bat_1 = jr.get_sprite_frame(self.SPRITE_RIGHT_WING_BAT_1, 0)
-        frame_main_bat_2 = jr.get_sprite_frame(self.SPRITE_MAIN_BAT_2, 0)
-        frame_left_wing_bat_2 = jr.get_sprite_frame(self.SPRITE_LEFT_WING_BAT_2, 0)
-        frame_right_wing_bat_2 = jr.get_sprite_frame(self.SPRITE_RIGHT_WING_BAT_2, 0)
-
-        # Render enemy bats blue
-        frame_bat_blue_main = jr.get_sprite_frame(self.SPRITE_BAT_BLUE_MAIN, 0)
-        frame_bat_blue_left_wing_middle = jr.get_sprite_frame(self.SPRITE_BAT_BLUE_LEFT_WING_MIDDLE, 0)
-        frame_bat_blue_right_wing_middle = jr.get_sprite_frame(self.SPRITE_BAT_BLUE_RIGHT_WING_MIDDLE, 0)
-        frame_bat_blue_left_wing_up = jr.get_sprite_frame(self.SPRITE_BAT_BLUE_LEFT_WING_UP, 0)
-        frame_bat_blue_right_wing_up = jr.get_sprite_frame(self.SPRITE_BAT_BLUE_RIGHT_WING_UP, 0)
-        frame_bat_blue_left_wing_down = jr.get_sprite_frame(self.SPRITE_BAT_BLUE_LEFT_WING_DOWN, 0)
-        frame_bat_blue_right_wing_down = jr.get_sprite_frame(self.SPRITE_BAT_BLUE_RIGHT_WING_DOWN, 0)
-        frame_bat_blue_left_wing_down_2 = jr.get_sprite_frame(self.SPRITE_BAT_BLUE_LEFT_WING_DOWN_2, 0)
-        frame_bat_blue_right_wing_down_2 = jr.get_sprite_frame(self.SPRITE_BAT_BLUE_RIGHT_WING_DOWN_2, 0)
-        frame_bat_blue_death_1 = jr.get_sprite_frame(self.SPRITE_BAT_BLUE_DEATH_1, 0)
-        frame_bat_blue_death_2 = jr.get_sprite_frame(self.SPRITE_BAT_BLUE_DEATH_2, 0)
-        frame_bat_blue_death_3 = jr.get_sprite_frame(self.SPRITE_BAT_BLUE_DEATH_3, 0)
-
-        # Render enemy bats red
-        frame_bat_red_main = jr.get_sprite_frame(self.SPRITE_BAT_RED_MAIN, 0)
-        frame_bat_red_left_wing_middle = jr.get_sprite_frame(self.SPRITE_BAT_RED_LEFT_WING_MIDDLE, 0)
-        frame_bat_red_right_wing_middle = jr.get_sprite_frame(self.SPRITE_BAT_RED_RIGHT_WING_MIDDLE, 0)
-        frame_bat_red_left_wing_up = jr.get_sprite_frame(self.SPRITE_BAT_RED_LEFT_WING_UP, 0)
-        frame_bat_red_right_wing_up = jr.get_sprite_frame(self.SPRITE_BAT_RED_RIGHT_WING_UP, 0)
-        frame_bat_red_left_wing_down = jr.get_sprite_frame(self.SPRITE_BAT_RED_LEFT_WING_DOWN, 0)
-        frame_bat_red_right_wing_down = jr.get_sprite_frame(self.SPRITE_BAT_RED_RIGHT_WING_DOWN, 0)
-        frame_bat_red_left_wing_down_2 = jr.get_sprite_frame(self.SPRITE_BAT_RED_LEFT_WING_DOWN_2, 0)
-        frame_bat_red_right_wing_down_2 = jr.get_sprite_frame(self.SPRITE_BAT_RED_RIGHT_WING_DOWN_2, 0)
-        frame_bat_red_death_1 = jr.get_sprite_frame(self.SPRITE_BAT_RED_DEATH_1, 0)
-        frame_bat_red_death_2 = jr.get_sprite_frame(self.SPRITE_BAT_RED_DEATH_2, 0)
-        frame_bat_red_death_3 = jr.get_sprite_frame(self.SPRITE_BAT_RED_DEATH_3, 0)
-
-        # Render boss
-        frame_boss = jr.get_sprite_frame(self.SPRITE_BOSS, 0)
+        frame_projectile = jr.get_sprite_frame(sprite_player_projectile, 0)
 
         player_death_sprite_duration = self.consts.PLAYER_DEATH_DURATION // 3  # Duration for each player death sprite frame
 
@@ -1548,156 +1615,15 @@ class PhoenixRenderer(JAXGameRenderer):
 
         raster = jax.lax.cond(
             jnp.logical_or(state.player_dying, state.player_respawn_timer <= 0),
-            lambda r: jr.render_at(r, state.player_x, state.player_y, frame_player_used),
+            lambda r: jr.blit(r, state.player_x, state.player_y, frame_player_used),
             lambda r: r,
             operand=raster
         )
 
 
-        # Phoenix attack rendering logic
-        tol = 0.5
-        going_down = state.phoenix_do_attack & (state.enemies_y < state.phoenix_attack_target_y - tol)
-        going_up = state.phoenix_do_attack & (state.enemies_y > state.phoenix_attack_target_y + tol)
-        returning_moving = state.phoenix_returning & (jnp.abs(state.enemies_y - state.phoenix_original_y) > tol)
-        is_moving_vert = going_down | going_up | returning_moving
-
-        # Phoenix death rendering logic
-        death_flags = state.phoenix_dying
-        death_phase = (state.phoenix_death_timer <= self.consts.ENEMY_DEATH_DURATION // 2).astype(jnp.int32)  # 0 for first half, 1 for second half
-
-
-        def render_enemy(raster, input):
-            enemy_pos, wings, moving_vert, enemy_dying, enemy_phase = input
-            x, y = enemy_pos
-            anim_toggle = ((state.step_counter // self.consts.ENEMY_ANIMATION_SPEED) % 2) == 0  # toggle every 32 steps
-
-            def pick_phoenix_death_sprite():
-                return jax.lax.cond(
-                    enemy_phase == 0,
-                    lambda: frame_phoenix_death_1,
-                    lambda: frame_phoenix_death_2
-                )
-
-            def pick_phoenix_alive_sprite():
-                return jax.lax.cond(
-                    moving_vert,
-                    lambda: frame_phoenix_attack,
-                    lambda: jax.lax.cond(
-                        anim_toggle,
-                        lambda: frame_phoenix_1,
-                        lambda: frame_phoenix_2
-                    )
-                )
-
-            def render_level1(r):
-                #phoenix_anim = jax.lax.select(anim_toggle, frame_phoenix_1, frame_phoenix_2)
-                #phoenix_frame = jax.lax.select(moving_vert, frame_phoenix_attack, phoenix_anim)
-                phoenix_frame = jax.lax.cond(
-                    enemy_dying,
-                    pick_phoenix_death_sprite,
-                    pick_phoenix_alive_sprite
-                )
-                return jr.render_at(r, x, y, phoenix_frame)
-                #return jr.render_at(r, x, y, frame_phoenix_1) # OLD OLD OLD
-
-            def render_level2(r):
-                #phoenix_anim = jax.lax.select(anim_toggle, frame_phoenix_1, frame_phoenix_2)
-                #phoenix_frame = jax.lax.select(moving_vert, frame_phoenix_attack, phoenix_anim)
-                phoenix_frame = jax.lax.cond(
-                    enemy_dying,
-                    pick_phoenix_death_sprite,
-                    pick_phoenix_alive_sprite
-                )
-                return jr.render_at(r, x, y, phoenix_frame)
-                #return jr.render_at(r, x, y, frame_phoenix_1) # OLD OLD OLD
-            def render_level3(r):
-                r = jr.render_at(r, x, y, frame_main_bat)
-
-                def no_wings(r):
-                    return r
-
-                def left_wing_only(r):
-                    return jr.render_at(r, x - 5, y+2, frame_left_wing_bat_1)
-
-                def right_wing_only(r):
-                    return jr.render_at(r, x + 4, y+2, frame_right_wing_bat_1)
-
-                def both_wings(r):
-                    r = jr.render_at(r, x - 5, y+2, frame_left_wing_bat_1)
-                    r = jr.render_at(r, x + 4, y+2, frame_right_wing_bat_1)
-                    return r
-                wing_idx = wings + 1
-                r = jax.lax.switch(
-                    wing_idx,
-                    [
-                        left_wing_only,  # 0: no wings
-                        no_wings,  # 1: left wing only
-                        right_wing_only,  # 2: right wing only
-                        both_wings,  # 3: both wings
-                    ], r
-                )
-                return r
-            def render_level4(r):
-                r = jr.render_at(r, x, y, frame_main_bat_2)
-
-                def no_wings(r):
-                    return r
-
-                def left_wing_only(r):
-                    return jr.render_at(r, x - 5, y + 2, frame_left_wing_bat_2)
-
-                def right_wing_only(r):
-                    return jr.render_at(r, x + 5, y + 2, frame_right_wing_bat_2)
-
-                def both_wings(r):
-                    r = jr.render_at(r, x - 5, y + 2, frame_left_wing_bat_2)
-                    r = jr.render_at(r, x + 5, y + 2, frame_right_wing_bat_2)
-                    return r
-
-                wing_idx = wings + 1
-                r = jax.lax.switch(
-                    wing_idx,
-                    [
-                        left_wing_only,  # 0: no wings
-                        no_wings,  # 1: left wing only
-                        right_wing_only,  # 2: right wing only
-                        both_wings,  # 3: both wings
-                    ], r
-                )
-                return r
-            def render_level5(r):
-                return jr.render_at(r, x, y, frame_boss)
-
-            def render_if_active(r):
-                return jax.lax.switch(
-                    state.level - 1,
-                    [
-                        render_level1,
-                        render_level2,
-                        render_level3,
-                        render_level4,
-                        render_level5,
-                    ],
-                    r
-                )
-
-            raster = jax.lax.cond(x > -1, render_if_active, lambda r: r, raster)
-
-            return raster, None
-
-        # Update the raster
-        enemy_positions = jnp.stack((state.enemies_x, state.enemies_y), axis=1)
-        wings_array = jnp.full((enemy_positions.shape[0],), state.bat_wings)
-        moving_flags = is_moving_vert
-        death_flags = jnp.full((enemy_positions.shape[0],), death_flags)
-        death_phase = jnp.full((enemy_positions.shape[0],), death_phase)
-        inputs = (enemy_positions, wings_array, moving_flags, death_flags, death_phase)
-        def draw_phoenix(rr):
-            return jax.lax.scan(render_enemy, rr, inputs)[0]
-
         # Render player projectiles
         def render_player_projectile(r):
-            return jr.render_at(r, state.projectile_x, state.projectile_y, frame_projectile)
+            return jr.blit(r, state.projectile_x, state.projectile_y, frame_projectile)
 
         raster = jax.lax.cond(
             state.projectile_x > -1,
@@ -1706,110 +1632,51 @@ class PhoenixRenderer(JAXGameRenderer):
             raster
         )
 
-        # Render enemy bats
-        is_blue_level = (state.level % 5) == 3
-        is_red_level = (state.level % 5) == 4
-        is_bat_level = is_blue_level | is_red_level
+        # Enemies: pick every enemy's sprite from the pre-composited bank, see build_enemy_bank
+        kind = state.level % 5
+        is_bat_level = (kind == 3) | (kind == 4)
 
-        raster = jax.lax.cond(jnp.logical_not(is_bat_level), draw_phoenix, lambda rr: rr, raster)
+        tol = 0.5
+        going_down = state.phoenix_do_attack & (state.enemies_y < state.phoenix_attack_target_y - tol)
+        going_up = state.phoenix_do_attack & (state.enemies_y > state.phoenix_attack_target_y + tol)
+        returning_moving = state.phoenix_returning & (jnp.abs(state.enemies_y - state.phoenix_original_y) > tol)
+        is_moving_vert = going_down | going_up | returning_moving
+        anim_toggle = ((state.step_counter // self.consts.ENEMY_ANIMATION_SPEED) % 2) == 0
+        phoenix_death_phase = (state.phoenix_death_timer <= self.consts.ENEMY_DEATH_DURATION // 2).astype(jnp.int32)
+        phoenix_index = jnp.where(
+            state.phoenix_dying,
+            3 + phoenix_death_phase,
+            jnp.where(is_moving_vert, 2, jnp.where(anim_toggle, 0, 1)),
+        )
 
         seg = jnp.maximum(1, self.consts.ENEMY_DEATH_DURATION // 3)
+        bat_death_phase = jnp.where(state.bat_death_timer > 2 * seg, 0, jnp.where(state.bat_death_timer > seg, 1, 2))
+        left_wing = (state.bat_wings == 2) | (state.bat_wings == -1)
+        right_wing = (state.bat_wings == 2) | (state.bat_wings == 1)
+        bat_index = jnp.where(kind == 3, 5, 12) + jnp.where(
+            state.bat_dying,
+            4 + bat_death_phase,
+            left_wing.astype(jnp.int32) + 2 * right_wing.astype(jnp.int32),
+        )
 
-        def pick_death_frame(t: jnp.int32):
-            def blue():
-                return jax.lax.cond(
-                    t > 2 * seg,
-                    lambda: frame_bat_blue_death_1,
-                    lambda: jax.lax.cond(
-                        t > seg,
-                        lambda: frame_bat_blue_death_2,
-                        lambda: frame_bat_blue_death_3
-                    )
-                )
-
-            def red():
-                return jax.lax.cond(
-                    t > 2 * seg,
-                    lambda: frame_bat_red_death_1,
-                    lambda: jax.lax.cond(
-                        t > seg,
-                        lambda: frame_bat_red_death_2,
-                        lambda: frame_bat_red_death_3
-                    )
-                )
-
-            return jax.lax.cond(is_blue_level, blue, red)
-
-        def pick_alive_body():
-            return jax.lax.cond(is_blue_level, lambda: frame_bat_blue_main, lambda: frame_bat_red_main)
-
-        def pick_middle_wings():
-            def blue():
-                return frame_bat_blue_left_wing_middle, frame_bat_blue_right_wing_middle
-
-            def red():
-                return frame_bat_red_left_wing_middle, frame_bat_red_right_wing_middle
-
-            return jax.lax.cond(is_blue_level, blue, red)
-
-        def body(i, r):
-            x = state.enemies_x[i].astype(jnp.int32)
-            y = state.enemies_y[i].astype(jnp.int32)
-            active = (x > -1) & (y < self.consts.HEIGHT + 10) & is_bat_level
-            dying = state.bat_dying[i] & is_bat_level
-            t = state.bat_death_timer[i].astype(jnp.int32)
-
-            def draw_death(rr):
-                # Death-Sprite zentriert auf den Körper-Anker ausrichten
-                frame = pick_death_frame(t)
-                body_frame = pick_alive_body()
-                bh, bw = body_frame.shape[:2]
-                dh, dw = frame.shape[:2]
-                ox = x + (bw - dw) // 2 - 5
-                oy = y + (bh - dh) // 2
-                return jr.render_at(rr, ox, oy, frame)
-
-            def draw_alive(rr):
-                # Körper
-                rr = jr.render_at(rr, x, y, pick_alive_body())
-
-                # Flügel (mittlere) mit korrekt horizontalem Versatz und vertikal +1px
-                left_frame, right_frame = pick_middle_wings()
-                wing_state = state.bat_wings[i].astype(jnp.int32)
-                draw_left = (wing_state == 2) | (wing_state == -1)
-                draw_right = (wing_state == 2) | (wing_state == 1)
-
-                x_left = x - self.consts.WING_WIDTH
-                x_right = x + self.consts.ENEMY_WIDTH - 1  # rechter Flügel 1px weiter links
-                y_wings = y + 2  # beide Flügel 1px tiefer
-
-                rr = jax.lax.cond(
-                    draw_left,
-                    lambda r2: jr.render_at(r2, x_left, y_wings, left_frame),
-                    lambda r2: r2,
-                    rr
-                )
-                rr = jax.lax.cond(
-                    draw_right,
-                    lambda r2: jr.render_at(r2, x_right, y_wings, right_frame),
-                    lambda r2: r2,
-                    rr
-                )
-                return rr
-
-            def draw_one(rr):
-                return jax.lax.cond(dying, draw_death, draw_alive, rr)
-
-            return jax.lax.cond(active, draw_one, lambda rr: rr, r)
-
-        raster = jax.lax.fori_loop(0, state.enemies_x.shape[0], body, raster)
+        enemy_index = jnp.where(kind == 0, 19, jnp.where(is_bat_level, bat_index, phoenix_index))
+        offsets = self.ENEMY_BANK_OFFSETS[enemy_index]
+        raster = jr.render_many(
+            raster,
+            state.enemies_x.astype(jnp.int32) + offsets[:, 0],
+            state.enemies_y.astype(jnp.int32) + offsets[:, 1],
+            enemy_index,
+            enemy_bank,
+            False,
+            (state.enemies_x > -1) & (state.enemies_y < self.consts.HEIGHT + 10),
+        )
 
         def render_ability(r):
             ah, aw = frame_player_ability.shape[:2]
             ph, pw = frame_player_used.shape[:2]
             ax = state.player_x + (pw - aw) // 2
             ay = state.player_y + (ph - ah) // 2
-            return jr.render_at(r, ax, ay, frame_player_ability)
+            return jr.blit(r, ax, ay, frame_player_ability)
 
         ability_visible = state.invincibility & ((state.step_counter % 4) == 0) # Zeige ability nur jeden vierten Frame
 
@@ -1819,102 +1686,37 @@ class PhoenixRenderer(JAXGameRenderer):
             lambda r: r,
             raster
         )
-        def render_enemy_projectile(raster, projectile_pos):
-            x, y = projectile_pos
-            return jax.lax.cond(
-                y > -1,
-                lambda r: jr.render_at(r, x, y, frame_enemy_projectile),
-                lambda r: r,
-                raster
-            ), None
-        def render_boss_block_blue(raster, block_pos):
-            x,y = block_pos
-            return jax.lax.cond(
-                state.level% 5 == 0,
-                lambda r: jr.render_at(r, x, y, self.SPRITE_BLUE_BLOCK),
-                lambda r:r,
-                raster
-            ), None
-        def render_boss_block_red(raster, block_pos):
-            x,y = block_pos
-            return jax.lax.cond(
-                state.level% 5 == 0,
-                lambda r: jr.render_at(r, x, y, self.SPRITE_RED_BLOCK),
-                lambda r:r,
-                raster
-            ), None
-
-        def render_boss_block_green(raster, block_pos):
-            x, y = block_pos
-            return jax.lax.cond(
-                state.level % 5 == 0,
-                lambda r: jr.render_at(r, x, y, self.SPRITE_GREEN_BLOCK),
-                lambda r: r,
-                raster
-            ), None
-
-        blue_block_positions = state.blue_blocks
-        raster, _ = jax.lax.scan(render_boss_block_blue, raster, blue_block_positions)
-        red_block_positions = state.red_blocks
-        raster, _ = jax.lax.scan(render_boss_block_red, raster, red_block_positions)
-        green_block_positions = state.green_blocks
-        raster, _ = jax.lax.scan(render_boss_block_green, raster, green_block_positions)
-        enemy_proj_positions = jnp.stack((state.enemy_projectile_x, state.enemy_projectile_y), axis=1)
-        raster, _ = jax.lax.scan(render_enemy_projectile, raster, enemy_proj_positions)
-
-        # render score
-        #score_array = jr.int_to_digits(state.score, max_digits=5)  # 5 for now
-        #raster = jr.render_label(raster, 60, 10, score_array, self.DIGITS, spacing=8)
-        # render lives
-        #lives_value = jnp.sum(jr.int_to_digits(state.lives, max_digits=2))
-        #raster = jr.render_indicator(raster, 70, 20, lives_value, self.LIFE_INDICATOR, spacing=4)
+        raster = self.render_shield(raster, state)
+
+        # Enemy projectiles
+        raster = jr.render_many(
+            raster,
+            state.enemy_projectile_x,
+            state.enemy_projectile_y,
+            jnp.zeros_like(state.enemy_projectile_x, dtype=jnp.int32),
+            sprite_enemy_projectile,
+            False,
+            state.enemy_projectile_y > -1,
+        )
 
         # --- Score: wächst nach links, rechte Kante konstant ---
-        max_digits = jnp.int32(5)
-        spacing = jnp.int32(8)
-        digit_w = jnp.int32(self.DIGITS[0].shape[1])
+        max_digits = 5
+        spacing = 8
+        digit_w = digits.shape[2]
 
         # Fixes 5er-Feld horizontal zentrieren (Score selbst NICHT neu zentrieren)
-        field_total_w = max_digits * spacing
-        base_left = (self.consts.WIDTH - field_total_w) // 2
-        y = jnp.int32(10)
-
-        score = jnp.clip(state.score.astype(jnp.int32), 0, 99999)
-        places = jnp.array([10000, 1000, 100, 10, 1], dtype=jnp.int32)
-        digits = (score // places) % 10
-
-        has_nonzero = jnp.any(digits != 0)
-        first_idx = jnp.where(has_nonzero, jnp.argmax(digits != 0), 4)  # bei 0: nur letzte Stelle sichtbar
-        count = jnp.where(has_nonzero, 5 - first_idx, 1)
-
-        # Feste rechte Kante des Score-Feldes
-        score_right = base_left + (max_digits - 1) * spacing + digit_w
-
-        def body(i, rr):
-            d = digits[i].astype(jnp.int32)
-            visible = i >= first_idx
-            x = base_left + i * spacing
-
-            def draw(r):
-                sprite = self.DIGITS[d]
-                return jr.render_at(r, x, y, sprite)
-
-            return jax.lax.cond(visible, draw, lambda r: r, rr)
-
-        raster = jax.lax.fori_loop(0, 5, body, raster)
+        base_left = (self.consts.WIDTH - max_digits * spacing) // 2
+        raster = jr.render_number(
+            raster, base_left, 10, state.score, digits, max_digits, spacing, hide_leading_zeros=True
+        )
 
         # --- Leben: rechts am festen Score-Ende ausrichten ---
-        life_w = jnp.int32(self.LIFE_INDICATOR.shape[1])
-        life_spacing = jnp.int32(4)
-        lives_count = jnp.clip(state.lives.astype(jnp.int32), 0, 99)
-
-        total_lives_w = jnp.where(lives_count > 0, (lives_count - 1) * life_spacing + life_w, 0)
-        lives_x = score_right - total_lives_w
-        lives_y = jnp.int32(20)
-
-        def draw_lives(r):
-            return jr.render_indicator(r, lives_x, lives_y, lives_count, self.LIFE_INDICATOR, spacing=life_spacing)
-
-        raster = jax.lax.cond(lives_count > 0, draw_lives, lambda r: r, raster)
+        score_right = base_left + (max_digits - 1) * spacing + digit_w
+        max_lives = 9
+        life_spacing = 4
+        lives_x = score_right - ((max_lives - 1) * life_spacing + life_indicator.shape[1])
+        raster = jr.render_indicator_strip(
+            raster, lives_x, 20, state.lives, life_indicator, max_lives, life_spacing, align_right=True
+        )
 
         return raster
\ No newline at end of file
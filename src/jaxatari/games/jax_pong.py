@@ -9,6 +9,7 @@ import jaxatari.spaces as spaces
 from jaxatari.renderers import JAXGameRenderer
 from jaxatari.rendering import jax_rendering_utils as jr
 from jaxatari.environment import JaxEnvironment, JAXAtariAction as Action
+from jaxatari.profile import stage
 
 class PongConstants(NamedTuple):
     MAX_SPEED: int = 12
@@ -80,7 +81,6 @@ class JaxPong(JaxEnvironment[PongState, PongObservation, PongInfo, PongConstants
     def __init__(self, consts: PongConstants = None, reward_funcs: list[callable]=None):
         consts = consts or PongConstants()
         super().__init__(consts)
-        self.renderer = PongRenderer(self.consts)
         if reward_funcs is not None:
             reward_funcs = tuple(reward_funcs)
         self.reward_funcs = reward_funcs
@@ -95,6 +95,7 @@ class JaxPong(JaxEnvironment[PongState, PongObservation, PongInfo, PongConstants
         self.obs_size = 3*4+1+1
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("player_step")
     def _player_step(self, state_player_y, state_player_speed, acceleration_counter, action: chex.Array):
         up = jnp.logical_or(action == Action.LEFT, action == Action.LEFTFIRE)
         down = jnp.logical_or(action == Action.RIGHT, action == Action.RIGHTFIRE)
@@ -167,6 +168,7 @@ class JaxPong(JaxEnvironment[PongState, PongObservation, PongInfo, PongConstants
         )
         return player_y, player_speed, new_acceleration_counter
 
+    @stage("ball_step")
     def _ball_step(self, state: PongState, action):
         ball_x = state.ball_x + state.ball_vel_x
         ball_y = state.ball_y + state.ball_vel_y
@@ -284,6 +286,7 @@ class JaxPong(JaxEnvironment[PongState, PongObservation, PongInfo, PongConstants
 
         return ball_x, ball_y, ball_vel_x, ball_vel_y
 
+    @stage("enemy_step")
     def _enemy_step(self, state, step_counter, ball_y, ball_speed_y):
         should_move = step_counter % 8 != 0
 
@@ -295,6 +298,7 @@ class JaxPong(JaxEnvironment[PongState, PongObservation, PongInfo, PongConstants
         )
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("reset_ball_after_goal")
     def _reset_ball_after_goal(self, state_and_goal: Tuple[PongState, bool]) -> Tuple[chex.Array, chex.Array, chex.Array, chex.Array]:
         state, scored_right = state_and_goal
 
@@ -315,6 +319,9 @@ class JaxPong(JaxEnvironment[PongState, PongObservation, PongInfo, PongConstants
             ball_vel_y.astype(jnp.int32),
         )
 
+    def _create_renderer(self):
+        return PongRenderer(self.consts)
+
     def reset(self, key=None) -> Tuple[PongObservation, PongState]:
         state = PongState(
             player_y=jnp.array(96).astype(jnp.int32),
@@ -446,6 +453,7 @@ class JaxPong(JaxEnvironment[PongState, PongObservation, PongInfo, PongConstants
         return self.renderer.render(state)
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_observation")
     def _get_observation(self, state: PongState):
         player = EntityPosition(
             x=jnp.array(self.consts.PLAYER_X),
@@ -531,16 +539,19 @@ class JaxPong(JaxEnvironment[PongState, PongObservation, PongInfo, PongConstants
         )
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_info")
     def _get_info(self, state: PongState, all_rewards: chex.Array = None) -> PongInfo:
         return PongInfo(time=state.step_counter, all_rewards=all_rewards)
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_reward")
     def _get_reward(self, previous_state: PongState, state: PongState):
         return (state.player_score - state.enemy_score) - (
             previous_state.player_score - previous_state.enemy_score
         )
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_all_reward")
     def _get_all_reward(self, previous_state: PongState, state: PongState):
         if self.reward_funcs is None:
             return jnp.zeros(1)
@@ -550,6 +561,7 @@ class JaxPong(JaxEnvironment[PongState, PongObservation, PongInfo, PongConstants
         return rewards
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_done")
     def _get_done(self, state: PongState) -> bool:
         return jnp.logical_or(
             jnp.greater_equal(state.player_score, 21),
@@ -569,6 +581,26 @@ class PongRenderer(JAXGameRenderer):
             self.PLAYER_DIGIT_SPRITES,
             self.ENEMY_DIGIT_SPRITES,
         ) = self.load_sprites()
+        # palette-index versions of all sprites for render_indexed
+        (
+            self.INDEXED_BG,
+            self.INDEXED_PLAYER,
+            self.INDEXED_ENEMY,
+            self.INDEXED_BALL,
+            self.INDEXED_PLAYER_DIGITS,
+            self.INDEXED_ENEMY_DIGITS,
+        ) = [
+            jr.index_sprite(sprite, self.palette)
+            for sprite in (
+                self.SPRITE_BG,
+                self.SPRITE_PLAYER,
+                self.SPRITE_ENEMY,
+                self.SPRITE_BALL,
+                self.PLAYER_DIGIT_SPRITES,
+                self.ENEMY_DIGIT_SPRITES,
+            )
+        ]
+        self.INDEXED_WALL_COLOR = jr.rgb_to_palette_index(jnp.array(self.consts.WALL_COLOR, dtype=jnp.uint8), self.palette)
 
     def load_sprites(self):
         MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -602,57 +634,73 @@ class PongRenderer(JAXGameRenderer):
             ENEMY_DIGIT_SPRITES
         )
 
+    def palette_sources(self):
+        sprites = [
+            self.SPRITE_BG,
+            self.SPRITE_PLAYER,
+            self.SPRITE_ENEMY,
+            self.SPRITE_BALL,
+            self.PLAYER_DIGIT_SPRITES,
+            self.ENEMY_DIGIT_SPRITES,
+        ]
+        return sprites, [self.consts.WALL_COLOR]
+
     @partial(jax.jit, static_argnums=(0,))
     def render(self, state):
         raster = jr.create_initial_frame(width=160, height=210)
+        sprites = (
+            self.SPRITE_BG,
+            self.SPRITE_PLAYER,
+            self.SPRITE_ENEMY,
+            self.SPRITE_BALL,
+            self.PLAYER_DIGIT_SPRITES,
+            self.ENEMY_DIGIT_SPRITES,
+        )
+        wall_color = jnp.array(self.consts.WALL_COLOR, dtype=jnp.uint8)
+        return self._draw(raster, state, sprites, wall_color)
 
-        frame_bg = jr.get_sprite_frame(self.SPRITE_BG, 0)
-        raster = jr.render_at(raster, 0, 0, frame_bg)
+    @partial(jax.jit, static_argnums=(0,))
+    def render_indexed(self, state):
+        raster = jr.create_initial_index_frame(width=160, height=210)
+        sprites = (
+            self.INDEXED_BG,
+            self.INDEXED_PLAYER,
+            self.INDEXED_ENEMY,
+            self.INDEXED_BALL,
+            self.INDEXED_PLAYER_DIGITS,
+            self.INDEXED_ENEMY_DIGITS,
+        )
+        return self._draw(raster, state, sprites, self.INDEXED_WALL_COLOR)
 
-        frame_player = jr.get_sprite_frame(self.SPRITE_PLAYER, 0)
-        raster = jr.render_at(raster, self.consts.PLAYER_X, state.player_y, frame_player)
+    def _draw(self, raster, state, sprites, wall_color):
+        """Draws the game onto an RGB or palette-index raster with the matching sprites."""
+        sprite_bg, sprite_player, sprite_enemy, sprite_ball, player_digit_sprites, enemy_digit_sprites = sprites
 
-        frame_enemy = jr.get_sprite_frame(self.SPRITE_ENEMY, 0)
-        raster = jr.render_at(raster, self.consts.ENEMY_X, state.enemy_y, frame_enemy)
+        frame_bg = jr.get_sprite_frame(sprite_bg, 0)
+        raster = jr.blit(raster, 0, 0, frame_bg)
 
-        frame_ball = jr.get_sprite_frame(self.SPRITE_BALL, 0)
-        raster = jr.render_at(raster, state.ball_x, state.ball_y, frame_ball)
+        frame_player = jr.get_sprite_frame(sprite_player, 0)
+        raster = jr.blit(raster, self.consts.PLAYER_X, state.player_y, frame_player)
 
-        # Direct wall rendering with HWC indexing
-        wall_color = jnp.array(self.consts.WALL_COLOR, dtype=jnp.uint8)
+        frame_enemy = jr.get_sprite_frame(sprite_enemy, 0)
+        raster = jr.blit(raster, self.consts.ENEMY_X, state.enemy_y, frame_enemy)
+
+        frame_ball = jr.get_sprite_frame(sprite_ball, 0)
+        raster = jr.blit(raster, state.ball_x, state.ball_y, frame_ball)
+
+        # Direct wall rendering, rows are the first axis for RGB and index rasters
         top_wall_y_start = self.consts.WALL_TOP_Y
         top_wall_y_end = self.consts.WALL_TOP_Y + self.consts.WALL_TOP_HEIGHT
-        raster = raster.at[top_wall_y_start:top_wall_y_end, :, :].set(wall_color)
+        raster = raster.at[top_wall_y_start:top_wall_y_end].set(wall_color)
 
         bottom_wall_y_start = self.consts.WALL_BOTTOM_Y
         bottom_wall_y_end = self.consts.WALL_BOTTOM_Y + self.consts.WALL_BOTTOM_HEIGHT
-        raster = raster.at[bottom_wall_y_start:bottom_wall_y_end, :, :].set(wall_color)
-
-        player_score_digits = jr.int_to_digits(state.player_score, max_digits=2)
-        enemy_score_digits = jr.int_to_digits(state.enemy_score, max_digits=2)
-
-        is_player_single_digit = state.player_score < 10
-        player_start_index = jax.lax.select(is_player_single_digit, 1, 0)
-        player_num_to_render = jax.lax.select(is_player_single_digit, 1, 2)
-        player_render_x = jax.lax.select(is_player_single_digit,
-                                         120 + 16 // 2,
-                                         120)
-
-        raster = jr.render_label_selective(raster, player_render_x, 3,
-                                            player_score_digits, self.PLAYER_DIGIT_SPRITES,
-                                            player_start_index, player_num_to_render,
-                                            spacing=16)
-
-        is_enemy_single_digit = state.enemy_score < 10
-        enemy_start_index = jax.lax.select(is_enemy_single_digit, 1, 0)
-        enemy_num_to_render = jax.lax.select(is_enemy_single_digit, 1, 2)
-        enemy_render_x = jax.lax.select(is_enemy_single_digit,
-                                        10 + 16 // 2,
-                                        10)
-
-        raster = jr.render_label_selective(raster, enemy_render_x, 3,
-                                           enemy_score_digits, self.ENEMY_DIGIT_SPRITES,
-                                           enemy_start_index, enemy_num_to_render,
-                                           spacing=16)
+        raster = raster.at[bottom_wall_y_start:bottom_wall_y_end].set(wall_color)
+
+        # scores below 10 are drawn as one digit centered in the two-digit field
+        raster = jr.render_number(raster, 120, 3, state.player_score, player_digit_sprites, 2, 16,
+                                  hide_leading_zeros=True, align=0.5)
+        raster = jr.render_number(raster, 10, 3, state.enemy_score, enemy_digit_sprites, 2, 16,
+                                  hide_leading_zeros=True, align=0.5)
 
         return raster
@@ -7,6 +7,7 @@ import chex
 
 import jaxatari.spaces as spaces
 from jaxatari.environment import JaxEnvironment, JAXAtariAction as Action
+from jaxatari.profile import stage
 from jaxatari.renderers import JAXGameRenderer
 import jaxatari.rendering.jax_rendering_utils as jr
 
@@ -166,128 +167,6 @@ class CarryState(NamedTuple):
     score: chex.Array
 
 
-# RENDER CONSTANTS
-def load_sprites():
-    MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
-    # Load sprites - no padding needed for background since it's already full size
-    bg1 = jr.loadFrame(os.path.join(MODULE_DIR, "sprites/seaquest/bg/1.npy"))
-    pl_sub1 = jr.loadFrame(os.path.join(MODULE_DIR, "sprites/seaquest/player_sub/1.npy"))
-    pl_sub2 = jr.loadFrame(os.path.join(MODULE_DIR, "sprites/seaquest/player_sub/2.npy"))
-    pl_sub3 = jr.loadFrame(os.path.join(MODULE_DIR, "sprites/seaquest/player_sub/3.npy"))
-    diver1 = jr.loadFrame(os.path.join(MODULE_DIR, "sprites/seaquest/diver/1.npy"))
-    diver2 = jr.loadFrame(os.path.join(MODULE_DIR, "sprites/seaquest/diver/2.npy"))
-    shark1 = jr.loadFrame(os.path.join(MODULE_DIR, "sprites/seaquest/shark/1.npy"))
-    shark2 = jr.loadFrame(os.path.join(MODULE_DIR, "sprites/seaquest/shark/2.npy"))
-    enemy_sub1 = jr.loadFrame(os.path.join(MODULE_DIR, "sprites/seaquest/enemy_sub/1.npy"))
-    enemy_sub2 = jr.loadFrame(os.path.join(MODULE_DIR, "sprites/seaquest/enemy_sub/2.npy"))
-    enemy_sub3 = jr.loadFrame(os.path.join(MODULE_DIR, "sprites/seaquest/enemy_sub/3.npy"))
-    pl_torp = jr.loadFrame(os.path.join(MODULE_DIR, "sprites/seaquest/player_torp/1.npy"))
-    en_torp = jr.loadFrame(os.path.join(MODULE_DIR, "sprites/seaquest/enemy_torp/1.npy"))
-
-    # Pad player submarine sprites to match each other
-    pl_sub_sprites, pl_sub_offsets = jr.pad_to_match([pl_sub1, pl_sub2, pl_sub3])
-    pl_sub_offsets = jnp.array(pl_sub_offsets)
-    # Pad diver sprites to match each other
-    diver_sprites, diver_offsets = jr.pad_to_match([diver1, diver2])
-    diver_offsets = jnp.array(diver_offsets)
-
-    # Pad shark sprites to match each other
-    shark_sprites, shark_offsets = jr.pad_to_match([shark1, shark2])
-    shark_offsets = jnp.array(shark_offsets)
-
-    # Pad enemy submarine sprites to match each other
-    enemy_sub_sprites, enemy_sub_offsets = jr.pad_to_match([enemy_sub1, enemy_sub2, enemy_sub3])
-    enemy_sub_offsets = jnp.array(enemy_sub_offsets)
-
-    # Pad player torpedo sprites to match each other
-    pl_torp_sprites = [pl_torp]
-
-    # Pad enemy torpedo sprites to match each other
-    en_torp_sprites = [en_torp]
-
-    # Background sprite (no padding needed)
-    SPRITE_BG = jnp.expand_dims(bg1, axis=0)
-
-    # Player submarine sprites
-    SPRITE_PL_SUB = jnp.concatenate(
-        [
-            jnp.repeat(pl_sub_sprites[0][None], 4, axis=0),
-            jnp.repeat(pl_sub_sprites[1][None], 4, axis=0),
-            jnp.repeat(pl_sub_sprites[2][None], 4, axis=0),
-        ]
-    )
-
-    # Diver sprites
-    SPRITE_DIVER = jnp.concatenate(
-        [
-            jnp.repeat(diver_sprites[0][None], 16, axis=0),
-            jnp.repeat(diver_sprites[1][None], 4, axis=0),
-        ]
-    )
-
-    # Shark sprites
-    SPRITE_SHARK = jnp.concatenate(
-        [
-            jnp.repeat(shark_sprites[0][None], 16, axis=0),
-            jnp.repeat(shark_sprites[1][None], 8, axis=0),
-        ]
-    )
-
-    # Enemy submarine sprites
-    SPRITE_ENEMY_SUB = jnp.concatenate(
-        [
-            jnp.repeat(enemy_sub_sprites[0][None], 4, axis=0),
-            jnp.repeat(enemy_sub_sprites[1][None], 4, axis=0),
-            jnp.repeat(enemy_sub_sprites[2][None], 4, axis=0),
-        ]
-    )
-
-    DIGITS = jr.load_and_pad_digits(os.path.join(MODULE_DIR, "./sprites/seaquest/digits/{}.npy"))
-    LIFE_INDICATOR = jr.loadFrame(os.path.join(MODULE_DIR, "sprites/seaquest/life_indicator/1.npy"))
-    DIVER_INDICATOR = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/seaquest/diver_indicator/1.npy"))
-
-    # Player torpedo sprites
-    SPRITE_PL_TORP = jnp.repeat(pl_torp_sprites[0][None], 1, axis=0)
-
-    # Enemy torpedo sprites
-    SPRITE_EN_TORP = jnp.repeat(en_torp_sprites[0][None], 1, axis=0)
-    # Return all sprites and all offsets for future use
-    return (
-        SPRITE_BG,
-        SPRITE_PL_SUB,
-        SPRITE_DIVER,
-        SPRITE_SHARK,
-        SPRITE_ENEMY_SUB,
-        SPRITE_PL_TORP,
-        SPRITE_EN_TORP,
-        DIGITS,
-        LIFE_INDICATOR,
-        DIVER_INDICATOR,
-        pl_sub_offsets,
-        diver_offsets,
-        shark_offsets,
-        enemy_sub_offsets,
-    )
-
-# Load sprites once at module level
-(
-    SPRITE_BG,
-    SPRITE_PL_SUB,
-    SPRITE_DIVER,
-    SPRITE_SHARK,
-    SPRITE_ENEMY_SUB,
-    SPRITE_PL_TORP,
-    SPRITE_EN_TORP,
-    DIGITS,
-    LIFE_INDICATOR,
-    DIVER_INDICATOR,
-    PL_SUB_OFFSETS,
-    DIVER_OFFSETS,
-    SHARK_OFFSETS,
-    ENEMY_SUB_OFFSETS,
-) = load_sprites()
-
-
 class JaxSeaquest(JaxEnvironment[SeaquestState, SeaquestObservation, SeaquestInfo, SeaquestConstants]):
     def initialize_spawn_state(self) -> SpawnState:
         """Initialize spawn state with first wave matching original game."""
@@ -378,6 +257,7 @@ class JaxSeaquest(JaxEnvironment[SeaquestState, SeaquestObservation, SeaquestInf
         return jnp.any(collisions)
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("check_missile_collisions")
     def check_missile_collisions(
         self,
         missile_pos: chex.Array,
@@ -511,6 +391,7 @@ class JaxSeaquest(JaxEnvironment[SeaquestState, SeaquestObservation, SeaquestInf
         )
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("check_player_collision")
     def check_player_collision(
         self,
         player_x,
@@ -671,6 +552,7 @@ class JaxSeaquest(JaxEnvironment[SeaquestState, SeaquestObservation, SeaquestInf
         return base_pattern
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("update_enemy_spawns")
     def update_enemy_spawns(
         self,
         spawn_state: SpawnState,
@@ -1030,6 +912,7 @@ class JaxSeaquest(JaxEnvironment[SeaquestState, SeaquestObservation, SeaquestInf
         return final_state, final_shark_positions, final_sub_positions, final_rng
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("step_enemy_movement")
     def step_enemy_movement(
         self,
         spawn_state: SpawnState,
@@ -1466,6 +1349,7 @@ class JaxSeaquest(JaxEnvironment[SeaquestState, SeaquestObservation, SeaquestInf
         return new_shark_positions, new_sub_positions, new_spawn_state, direction_rng
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("spawn_divers")
     def spawn_divers(
         self,
         spawn_state: SpawnState,
@@ -1611,6 +1495,7 @@ class JaxSeaquest(JaxEnvironment[SeaquestState, SeaquestObservation, SeaquestInf
         return new_diver_positions, spawn_state._replace(diver_array=new_diver_array)
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("step_diver_movement")
     def step_diver_movement(
         self,
         diver_positions: chex.Array,
@@ -1957,6 +1842,7 @@ class JaxSeaquest(JaxEnvironment[SeaquestState, SeaquestObservation, SeaquestInf
         return final_positions, final_collected, updated_spawn_state, rng
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("spawn_step")
     def spawn_step(
         self,
         state,
@@ -2004,6 +1890,7 @@ class JaxSeaquest(JaxEnvironment[SeaquestState, SeaquestObservation, SeaquestInf
         )
 
 
+    @stage("surface_sub_step")
     def surface_sub_step(self, state: SeaquestState) -> chex.Array:
         # Check direction value specifically to get scalar boolean
         sub_exists = state.surface_sub_position[2] != 0
@@ -2045,6 +1932,7 @@ class JaxSeaquest(JaxEnvironment[SeaquestState, SeaquestObservation, SeaquestInf
         return jnp.where(should_spawn, temp1, temp2)
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("enemy_missiles_step")
     def enemy_missiles_step(
         self, curr_sub_positions, curr_enemy_missile_positions, step_counter, difficulty
     ) -> chex.Array:
@@ -2185,6 +2073,7 @@ class JaxSeaquest(JaxEnvironment[SeaquestState, SeaquestObservation, SeaquestInf
         return new_missile_positions
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("player_missile_step")
     def player_missile_step(
         self, state: SeaquestState, curr_player_x, curr_player_y, action: chex.Array
     ) -> chex.Array:
@@ -2241,6 +2130,7 @@ class JaxSeaquest(JaxEnvironment[SeaquestState, SeaquestObservation, SeaquestInf
         return new_missile
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("update_oxygen")
     def update_oxygen(self, state, player_x, player_y, player_missile_position):
         """Update oxygen levels and handle surfacing mechanics with proper surfacing detection"""
         PLAYER_BREATHING_Y = [47, 52]  # Range where oxygen neither increases nor decreases
@@ -2366,6 +2256,7 @@ class JaxSeaquest(JaxEnvironment[SeaquestState, SeaquestObservation, SeaquestInf
         )
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("player_step")
     def player_step(
         self, state: SeaquestState, action: chex.Array
     ) -> tuple[chex.Array, chex.Array, chex.Array]:
@@ -2491,7 +2382,6 @@ class JaxSeaquest(JaxEnvironment[SeaquestState, SeaquestObservation, SeaquestInf
         ]
         self.frame_stack_size = 4
         self.obs_size = 6 + 12 * 5 + 12 * 5 + 4 * 5 + 4 * 5 + 5 + 5 + 4
-        self.renderer = SeaquestRenderer(self.consts)
 
     @partial(jax.jit, static_argnums=(0,))
     def render(self, state: SeaquestState) -> jnp.ndarray:
@@ -2584,6 +2474,7 @@ class JaxSeaquest(JaxEnvironment[SeaquestState, SeaquestObservation, SeaquestInf
         )
 
     @partial(jax.jit, static_argnums=(0, ))
+    @stage("get_observation")
     def _get_observation(self, state: SeaquestState) -> SeaquestObservation:
         # Create player (already scalar, no need for vectorization)
         player = PlayerEntity(
@@ -2663,6 +2554,7 @@ class JaxSeaquest(JaxEnvironment[SeaquestState, SeaquestObservation, SeaquestInf
         )
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_info")
     def _get_info(self, state: SeaquestState, all_rewards: jnp.ndarray) -> SeaquestInfo:
         return SeaquestInfo(
             successful_rescues=state.successful_rescues,
@@ -2672,10 +2564,12 @@ class JaxSeaquest(JaxEnvironment[SeaquestState, SeaquestObservation, SeaquestInf
         )
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_env_reward")
     def _get_env_reward(self, previous_state: SeaquestState, state: SeaquestState):
         return state.score - previous_state.score
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_all_rewards")
     def _get_all_rewards(self, previous_state: SeaquestState, state: SeaquestState) -> jnp.ndarray:
         if self.reward_funcs is None:
             return jnp.zeros(1)
@@ -2683,9 +2577,13 @@ class JaxSeaquest(JaxEnvironment[SeaquestState, SeaquestObservation, SeaquestInf
         return rewards
 
     @partial(jax.jit, static_argnums=(0,))
+    @stage("get_done")
     def _get_done(self, state: SeaquestState) -> bool:
         return state.lives < 0
 
+    def _create_renderer(self):
+        return SeaquestRenderer(self.consts)
+
     @partial(jax.jit, static_argnums=(0,))
     def reset(self, key: jax.random.PRNGKey = jax.random.PRNGKey(42)) -> Tuple[SeaquestObservation, SeaquestState]:
         """Initialize game state"""
@@ -3081,25 +2979,219 @@ class JaxSeaquest(JaxEnvironment[SeaquestState, SeaquestObservation, SeaquestInf
 class SeaquestRenderer(JAXGameRenderer):
     def __init__(self, consts: SeaquestConstants = None):
         super().__init__()
-        self.offset_length = len(PL_SUB_OFFSETS)
-        self.diver_offset_length = len(DIVER_OFFSETS)
-        self.shark_offset_length = len(SHARK_OFFSETS)
-        self.enemy_sub_offset_length = len(ENEMY_SUB_OFFSETS)
         self.consts = consts or SeaquestConstants()
+        (
+            self.SPRITE_BG,
+            self.SPRITE_PL_SUB,
+            self.SPRITE_DIVER,
+            self.SPRITE_SHARK,
+            self.SPRITE_ENEMY_SUB,
+            self.SPRITE_PL_TORP,
+            self.SPRITE_EN_TORP,
+            self.DIGITS,
+            self.LIFE_INDICATOR,
+            self.DIVER_INDICATOR,
+            self.PL_SUB_OFFSETS,
+            self.DIVER_OFFSETS,
+            self.SHARK_OFFSETS,
+            self.ENEMY_SUB_OFFSETS,
+        ) = self.load_sprites()
+        self.offset_length = len(self.PL_SUB_OFFSETS)
+        self.diver_offset_length = len(self.DIVER_OFFSETS)
+        self.shark_offset_length = len(self.SHARK_OFFSETS)
+        self.enemy_sub_offset_length = len(self.ENEMY_SUB_OFFSETS)
+        # palette-index versions of all sprites for render_indexed
+        (
+            self.INDEXED_BG,
+            self.INDEXED_PL_SUB,
+            self.INDEXED_DIVER,
+            self.INDEXED_SHARK,
+            self.INDEXED_ENEMY_SUB,
+            self.INDEXED_PL_TORP,
+            self.INDEXED_EN_TORP,
+            self.INDEXED_DIGITS,
+            self.INDEXED_LIFE_INDICATOR,
+            self.INDEXED_DIVER_INDICATOR,
+        ) = [jr.index_sprite(sprite, self.palette) for sprite in self.palette_sources()[0]]
+        self.INDEXED_OXYGEN_BAR_COLOR = jr.rgb_to_palette_index(
+            jnp.array(self.consts.OXYGEN_BAR_COLOR[:3], dtype=jnp.uint8), self.palette
+        )
+
+    def load_sprites(self):
+        MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+        # Load sprites - no padding needed for background since it's already full size
+        bg1 = jr.loadFrame(os.path.join(MODULE_DIR, "sprites/seaquest/bg/1.npy"))
+        pl_sub1 = jr.loadFrame(os.path.join(MODULE_DIR, "sprites/seaquest/player_sub/1.npy"))
+        pl_sub2 = jr.loadFrame(os.path.join(MODULE_DIR, "sprites/seaquest/player_sub/2.npy"))
+        pl_sub3 = jr.loadFrame(os.path.join(MODULE_DIR, "sprites/seaquest/player_sub/3.npy"))
+        diver1 = jr.loadFrame(os.path.join(MODULE_DIR, "sprites/seaquest/diver/1.npy"))
+        diver2 = jr.loadFrame(os.path.join(MODULE_DIR, "sprites/seaquest/diver/2.npy"))
+        shark1 = jr.loadFrame(os.path.join(MODULE_DIR, "sprites/seaquest/shark/1.npy"))
+        shark2 = jr.loadFrame(os.path.join(MODULE_DIR, "sprites/seaquest/shark/2.npy"))
+        enemy_sub1 = jr.loadFrame(os.path.join(MODULE_DIR, "sprites/seaquest/enemy_sub/1.npy"))
+        enemy_sub2 = jr.loadFrame(os.path.join(MODULE_DIR, "sprites/seaquest/enemy_sub/2.npy"))
+        enemy_sub3 = jr.loadFrame(os.path.join(MODULE_DIR, "sprites/seaquest/enemy_sub/3.npy"))
+        pl_torp = jr.loadFrame(os.path.join(MODULE_DIR, "sprites/seaquest/player_torp/1.npy"))
+        en_torp = jr.loadFrame(os.path.join(MODULE_DIR, "sprites/seaquest/enemy_torp/1.npy"))
+
+        # Pad player submarine sprites to match each other
+        pl_sub_sprites, pl_sub_offsets = jr.pad_to_match([pl_sub1, pl_sub2, pl_sub3])
+        pl_sub_offsets = jnp.array(pl_sub_offsets)
+        # Pad diver sprites to match each other
+        diver_sprites, diver_offsets = jr.pad_to_match([diver1, diver2])
+        diver_offsets = jnp.array(diver_offsets)
+
+        # Pad shark sprites to match each other
+        shark_sprites, shark_offsets = jr.pad_to_match([shark1, shark2])
+        shark_offsets = jnp.array(shark_offsets)
+
+        # Pad enemy submarine sprites to match each other
+        enemy_sub_sprites, enemy_sub_offsets = jr.pad_to_match([enemy_sub1, enemy_sub2, enemy_sub3])
+        enemy_sub_offsets = jnp.array(enemy_sub_offsets)
+
+        # Pad player torpedo sprites to match each other
+        pl_torp_sprites = [pl_torp]
+
+        # Pad enemy torpedo sprites to match each other
+        en_torp_sprites = [en_torp]
+
+        # Background sprite (no padding needed)
+        SPRITE_BG = jnp.expand_dims(bg1, axis=0)
+
+        # Player submarine sprites
+        SPRITE_PL_SUB = jnp.concatenate(
+            [
+                jnp.repeat(pl_sub_sprites[0][None], 4, axis=0),
+                jnp.repeat(pl_sub_sprites[1][None], 4, axis=0),
+                jnp.repeat(pl_sub_sprites[2][None], 4, axis=0),
+            ]
+        )
+
+        # Diver sprites
+        SPRITE_DIVER = jnp.concatenate(
+            [
+                jnp.repeat(diver_sprites[0][None], 16, axis=0),
+                jnp.repeat(diver_sprites[1][None], 4, axis=0),
+            ]
+        )
+
+        # Shark sprites
+        SPRITE_SHARK = jnp.concatenate(
+            [
+                jnp.repeat(shark_sprites[0][None], 16, axis=0),
+                jnp.repeat(shark_sprites[1][None], 8, axis=0),
+            ]
+        )
+
+        # Enemy submarine sprites
+        SPRITE_ENEMY_SUB = jnp.concatenate(
+            [
+                jnp.repeat(enemy_sub_sprites[0][None], 4, axis=0),
+                jnp.repeat(enemy_sub_sprites[1][None], 4, axis=0),
+                jnp.repeat(enemy_sub_sprites[2][None], 4, axis=0),
+            ]
+        )
+
+        DIGITS = jr.load_and_pad_digits(os.path.join(MODULE_DIR, "./sprites/seaquest/digits/{}.npy"))
+        LIFE_INDICATOR = jr.loadFrame(os.path.join(MODULE_DIR, "sprites/seaquest/life_indicator/1.npy"))
+        DIVER_INDICATOR = jr.loadFrame(os.path.join(MODULE_DIR, "./sprites/seaquest/diver_indicator/1.npy"))
+
+        # Player torpedo sprites
+        SPRITE_PL_TORP = jnp.repeat(pl_torp_sprites[0][None], 1, axis=0)
+
+        # Enemy torpedo sprites
+        SPRITE_EN_TORP = jnp.repeat(en_torp_sprites[0][None], 1, axis=0)
+        # Return all sprites and all offsets for future use
+        return (
+            SPRITE_BG,
+            SPRITE_PL_SUB,
+            SPRITE_DIVER,
+            SPRITE_SHARK,
+            SPRITE_ENEMY_SUB,
+            SPRITE_PL_TORP,
+            SPRITE_EN_TORP,
+            DIGITS,
+            LIFE_INDICATOR,
+            DIVER_INDICATOR,
+            pl_sub_offsets,
+            diver_offsets,
+            shark_offsets,
+            enemy_sub_offsets,
+        )
+
+    def palette_sources(self):
+        sprites = [
+            self.SPRITE_BG,
+            self.SPRITE_PL_SUB,
+            self.SPRITE_DIVER,
+            self.SPRITE_SHARK,
+            self.SPRITE_ENEMY_SUB,
+            self.SPRITE_PL_TORP,
+            self.SPRITE_EN_TORP,
+            self.DIGITS,
+            self.LIFE_INDICATOR,
+            self.DIVER_INDICATOR,
+        ]
+        return sprites, [self.consts.OXYGEN_BAR_COLOR[:3]]
 
     @partial(jax.jit, static_argnums=(0,))
     def render(self, state):
         raster = jr.create_initial_frame(width=160, height=210)
+        sprites = (
+            self.SPRITE_BG,
+            self.SPRITE_PL_SUB,
+            self.SPRITE_DIVER,
+            self.SPRITE_SHARK,
+            self.SPRITE_ENEMY_SUB,
+            self.SPRITE_PL_TORP,
+            self.SPRITE_EN_TORP,
+            self.DIGITS,
+            self.LIFE_INDICATOR,
+            self.DIVER_INDICATOR,
+        )
+        return self._draw(raster, state, sprites, self.consts.OXYGEN_BAR_COLOR, (0, 0, 0, 0))
+
+    @partial(jax.jit, static_argnums=(0,))
+    def render_indexed(self, state):
+        raster = jr.create_initial_index_frame(width=160, height=210)
+        sprites = (
+            self.INDEXED_BG,
+            self.INDEXED_PL_SUB,
+            self.INDEXED_DIVER,
+            self.INDEXED_SHARK,
+            self.INDEXED_ENEMY_SUB,
+            self.INDEXED_PL_TORP,
+            self.INDEXED_EN_TORP,
+            self.INDEXED_DIGITS,
+            self.INDEXED_LIFE_INDICATOR,
+            self.INDEXED_DIVER_INDICATOR,
+        )
+        return self._draw(raster, state, sprites, self.INDEXED_OXYGEN_BAR_COLOR, jr.TRANSPARENT_INDEX)
+
+    def _draw(self, raster, state, sprites, oxygen_bar_color, oxygen_bar_background):
+        """Draws the game onto an RGB or palette-index raster with the matching sprites and bar colors."""
+        (
+            sprite_bg,
+            sprite_pl_sub,
+            sprite_diver,
+            sprite_shark,
+            sprite_enemy_sub,
+            sprite_pl_torp,
+            sprite_en_torp,
+            digits,
+            life_indicator,
+            diver_indicator,
+        ) = sprites
 
         # render background
-        frame_bg = jr.get_sprite_frame(SPRITE_BG, 0)
-        raster = jr.render_at(raster, 0, 0, frame_bg)
+        frame_bg = jr.get_sprite_frame(sprite_bg, 0)
+        raster = jr.blit(raster, 0, 0, frame_bg)
 
         # render player submarine
-        frame_pl_sub = jr.get_sprite_frame(SPRITE_PL_SUB, state.step_counter)
+        frame_pl_sub = jr.get_sprite_frame(sprite_pl_sub, state.step_counter)
         idx_pl_sub = state.step_counter % self.offset_length
-        pl_sub_offset = jnp.take(PL_SUB_OFFSETS, idx_pl_sub, axis=0)
-        raster = jr.render_at(
+        pl_sub_offset = jnp.take(self.PL_SUB_OFFSETS, idx_pl_sub, axis=0)
+        raster = jr.blit(
             raster,
             state.player_x,
             state.player_y,
@@ -3108,11 +3200,11 @@ class SeaquestRenderer(JAXGameRenderer):
             flip_offset=pl_sub_offset,
         )
         # Player torpedo
-        frame_pl_torp = jr.get_sprite_frame(SPRITE_PL_TORP, state.step_counter)
+        frame_pl_torp = jr.get_sprite_frame(sprite_pl_torp, state.step_counter)
         should_render = state.player_missile_position[0] > 0
         raster = jax.lax.cond(
             should_render,
-            lambda r: jr.render_at(
+            lambda r: jr.blit(
                 r,
                 state.player_missile_position[0],
                 state.player_missile_position[1],
@@ -3124,136 +3216,81 @@ class SeaquestRenderer(JAXGameRenderer):
         )
 
         # render divers
-        frame_diver = jr.get_sprite_frame(SPRITE_DIVER, state.step_counter)
+        frame_diver = jr.get_sprite_frame(sprite_diver, state.step_counter)
         diver_positions = state.diver_positions
 
-        def render_diver(i, raster_base):
-            should_render = diver_positions[i][0] > 0
-            idx_diver = i % self.diver_offset_length
-            diver_offset = jnp.take(DIVER_OFFSETS, idx_diver, axis=0)
-            return jax.lax.cond(
-                should_render,
-                lambda r: jr.render_at(
-                    r,
-                    diver_positions[i][0],
-                    diver_positions[i][1],
-                    frame_diver,
-                    flip_horizontal=(diver_positions[i][2] == self.consts.FACE_LEFT),
-                    flip_offset=diver_offset,
-                ),
-                lambda r: r,
-                raster_base,
-            )
-
-        raster = jax.lax.fori_loop(0, self.consts.MAX_DIVERS, render_diver, raster)
+        raster = jr.render_many(
+            raster,
+            diver_positions[:, 0],
+            diver_positions[:, 1],
+            jnp.zeros((self.consts.MAX_DIVERS,), dtype=jnp.int32),
+            frame_diver[None],
+            diver_positions[:, 2] == self.consts.FACE_LEFT,
+            diver_positions[:, 0] > 0,
+            flip_offsets=jnp.take(self.DIVER_OFFSETS, jnp.arange(self.consts.MAX_DIVERS) % self.diver_offset_length, axis=0),
+        )
 
         # render sharks
-        frame_shark = jr.get_sprite_frame(SPRITE_SHARK, state.step_counter)
-
-        def render_shark(i, raster_base):
-            should_render = state.shark_positions[i][0] > 0
-            idx_shark = i % self.shark_offset_length
-            shark_offset = jnp.take(SHARK_OFFSETS, idx_shark, axis=0)
-            return jax.lax.cond(
-                should_render,
-                lambda r: jr.render_at(
-                    r,
-                    state.shark_positions[i][0],
-                    state.shark_positions[i][1],
-                    frame_shark,
-                    flip_horizontal=(state.shark_positions[i][2] == self.consts.FACE_LEFT),
-                    flip_offset=shark_offset,
-                ),
-                lambda r: r,
-                raster_base,
-            )
-
-        # Use fori_loop to render all sharks
-        raster = jax.lax.fori_loop(0, self.consts.MAX_SHARKS, render_shark, raster)
-
-        # render enemy subs
-        frame_enemy_sub = jr.get_sprite_frame(SPRITE_ENEMY_SUB, state.step_counter)
-
-        def render_enemy_sub(i, raster_base):
-            should_render = state.sub_positions[i][0] > 0
-            idx_enemy_sub = i % self.enemy_sub_offset_length
-            enemy_sub_offset = jnp.take(ENEMY_SUB_OFFSETS, idx_enemy_sub, axis=0)
-            return jax.lax.cond(
-                should_render,
-                lambda r: jr.render_at(
-                    r,
-                    state.sub_positions[i][0],
-                    state.sub_positions[i][1],
-                    frame_enemy_sub,
-                    flip_horizontal=(state.sub_positions[i][2] == self.consts.FACE_LEFT),
-                    flip_offset=enemy_sub_offset,
-                ),
-                lambda r: r,
-                raster_base,
-            )
-
-        raster = jax.lax.fori_loop(0, self.consts.MAX_SUBS, render_enemy_sub, raster)
-
-        def render_enemy_surface_sub(i, raster_base):
-            should_render = state.surface_sub_position[0] > 0
-            idx_enemy_sub = i % self.enemy_sub_offset_length
-            enemy_sub_offset = jnp.take(ENEMY_SUB_OFFSETS, idx_enemy_sub, axis=0)
-            return jax.lax.cond(
-                should_render,
-                lambda r: jr.render_at(
-                    r,
-                    state.surface_sub_position[0],
-                    state.surface_sub_position[1],
-                    frame_enemy_sub,
-                    flip_horizontal=(state.surface_sub_position[2] == self.consts.FACE_LEFT),
-                    flip_offset=enemy_sub_offset,
-                ),
-                lambda r: r,
-                raster_base,
-            )
-
-        raster = jax.lax.fori_loop(
-            0, self.consts.MAX_SURFACE_SUBS, render_enemy_surface_sub, raster
+        frame_shark = jr.get_sprite_frame(sprite_shark, state.step_counter)
+        raster = jr.render_many(
+            raster,
+            state.shark_positions[:, 0],
+            state.shark_positions[:, 1],
+            jnp.zeros((self.consts.MAX_SHARKS,), dtype=jnp.int32),
+            frame_shark[None],
+            state.shark_positions[:, 2] == self.consts.FACE_LEFT,
+            state.shark_positions[:, 0] > 0,
+            flip_offsets=jnp.take(self.SHARK_OFFSETS, jnp.arange(self.consts.MAX_SHARKS) % self.shark_offset_length, axis=0),
+        )
+
+        # render enemy subs, the surface sub is drawn last
+        frame_enemy_sub = jr.get_sprite_frame(sprite_enemy_sub, state.step_counter)
+        surface_sub_positions = jnp.broadcast_to(
+            state.surface_sub_position, (self.consts.MAX_SURFACE_SUBS, state.surface_sub_position.shape[0])
+        )
+        sub_positions = jnp.concatenate((state.sub_positions, surface_sub_positions), axis=0)
+        sub_offset_idx = jnp.concatenate((
+            jnp.arange(self.consts.MAX_SUBS), jnp.arange(self.consts.MAX_SURFACE_SUBS)
+        )) % self.enemy_sub_offset_length
+        raster = jr.render_many(
+            raster,
+            sub_positions[:, 0],
+            sub_positions[:, 1],
+            jnp.zeros((sub_positions.shape[0],), dtype=jnp.int32),
+            frame_enemy_sub[None],
+            sub_positions[:, 2] == self.consts.FACE_LEFT,
+            sub_positions[:, 0] > 0,
+            flip_offsets=jnp.take(self.ENEMY_SUB_OFFSETS, sub_offset_idx, axis=0),
+        )
+
+        # render enemy torpedos
+        frame_enemy_torp = jr.get_sprite_frame(sprite_en_torp, state.step_counter)
+        raster = jr.render_many(
+            raster,
+            state.enemy_missile_positions[:, 0],
+            state.enemy_missile_positions[:, 1],
+            jnp.zeros((self.consts.MAX_ENEMY_MISSILES,), dtype=jnp.int32),
+            frame_enemy_torp[None],
+            state.enemy_missile_positions[:, 2] == self.consts.FACE_LEFT,
+            state.enemy_missile_positions[:, 0] > 0,
         )
 
-        frame_enemy_torp = jr.get_sprite_frame(SPRITE_EN_TORP, state.step_counter)
-
-        def render_enemy_torp(i, raster_base):
-            should_render = state.enemy_missile_positions[i][0] > 0
-            return jax.lax.cond(
-                should_render,
-                lambda r: jr.render_at(
-                    r,
-                    state.enemy_missile_positions[i][0],
-                    state.enemy_missile_positions[i][1],
-                    frame_enemy_torp,
-                    flip_horizontal=(state.enemy_missile_positions[i][2] == self.consts.FACE_LEFT),
-                ),
-                lambda r: r,
-                raster_base,
-            )
-
-        raster = jax.lax.fori_loop(0, self.consts.MAX_ENEMY_MISSILES, render_enemy_torp, raster)
-
         # show the scores
-        score_array = jr.int_to_digits(state.score, max_digits=8)
-        # convert the score to a list of digits
-        raster = jr.render_label(raster, 10, 10, score_array, DIGITS, spacing=7)
+        raster = jr.render_number(raster, 10, 10, state.score, digits, 8, 7)
         raster = jr.render_indicator(
-            raster, 10, 20, state.lives, LIFE_INDICATOR, spacing=10
+            raster, 10, 20, state.lives, life_indicator, spacing=10
         )
         raster = jr.render_indicator(
-            raster, 49, 178, state.divers_collected, DIVER_INDICATOR, spacing=10
+            raster, 49, 178, state.divers_collected, diver_indicator, spacing=10
         )
 
         raster = jr.render_bar(
-            raster, 49, 170, state.oxygen, 64, 63, 5, self.consts.OXYGEN_BAR_COLOR, (0, 0, 0, 0)
+            raster, 49, 170, state.oxygen, 64, 63, 5, oxygen_bar_color, oxygen_bar_background
         )
 
         # Force the first 8 columns (x=0 to x=7) to be black
         bar_width = 8
-        # Assuming raster shape is (Height, Width, Channels)
-        # Select all rows (:), the first 'bar_width' columns (0:bar_width), and all channels (:)
-        raster = raster.at[:, :bar_width, :].set(0)
+        # Select all rows (:) and the first 'bar_width' columns (0:bar_width), index 0 is black in index rasters
+        raster = raster.at[:, :bar_width].set(0)
 
         return raster
\ No newline at end of file
@@ -1,3 +1,4 @@
+import copy
 import functools
 import jax
 
@@ -6,8 +7,8 @@ from jaxatari.wrappers import JaxatariWrapper
 class SpeedMode(JaxatariWrapper):
     """Increase speed to maximum at all time steps."""
     def __init__(self, env):
-        super().__init__(env)
-        self._env = env
+        # patches a copy, make may hand the same cached env to other callers
+        super().__init__(copy.copy(env))
         # Overrides get_ball_velocity from env
         self._env.get_ball_velocity = self.get_ball_velocity.__get__(self._env, self._env.__class__) 
 
@@ -22,15 +23,11 @@ class SpeedMode(JaxatariWrapper):
 class SmallPaddle(JaxatariWrapper):
     """Always use a small paddle."""
     def __init__(self, env):
-        super().__init__(env)
-        self._env = env
-        self._env.consts.PLAYER_SIZE = (4, 4)
-        self._env.consts.PLAYER_SIZE_SMALL = (4, 4)
+        super().__init__(copy.copy(env))
+        self._env.consts = env.consts._replace(PLAYER_SIZE=(4, 4), PLAYER_SIZE_SMALL=(4, 4))
 
 class BigPaddle(JaxatariWrapper):
     """Always use a bigger paddle."""
     def __init__(self, env):
-        super().__init__(env)
-        self._env = env
-        self._env.consts.PLAYER_SIZE = (40, 4)
-        self._env.consts.PLAYER_SIZE_SMALL = (40, 4)
\ No newline at end of file
+        super().__init__(copy.copy(env))
+        self._env.consts = env.consts._replace(PLAYER_SIZE=(40, 4), PLAYER_SIZE_SMALL=(40, 4))
\ No newline at end of file
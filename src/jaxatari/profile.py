@@ -0,0 +1,254 @@
+"""
+Profiling of game steps, split into the stages the games annotate with `stage`.
+
+Games decorate the subsystems of their step (player, enemies, collisions, spawning, ...) with
+`@stage("name")`, which wraps them in a `jax.named_scope`. The scopes show up in the op names of the
+compiled program and in traces recorded with `trace` (view them in TensorBoard or Perfetto).
+
+Where no profiler UI is available, `stage_costs` times every stage on its own: one step of a copy of
+the game is traced to record the inputs every stage is called with, then each stage is jitted and timed
+separately on them.
+
+Usage:
+    python -m jaxatari.profile seaquest [--steps 100] [--trace-dir /tmp/jaxatari-trace]
+"""
+
+import argparse
+import copy
+import functools
+import statistics
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+
+class _Recorder:
+    """Collects the stage inputs for stage_costs, attached to the copy of the game whose step it traces."""
+
+    def __init__(self):
+        self.recorded: Dict[str, Tuple[Callable, tuple, dict]] = {}
+        # names of the stages currently being traced, outermost first
+        self.active: List[str] = []
+
+
+def stage(name: str) -> Callable:
+    """
+    Marks a function (or method) as a stage of a game step.
+    Its operations are grouped under `jax.named_scope(name)`, and `stage_costs` times it separately
+    if it is a method of the game.
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            recorder = getattr(args[0], "_stage_recorder", None) if args else None
+            if recorder is None:
+                with jax.named_scope(name):
+                    return fn(*args, **kwargs)
+            path = "/".join(recorder.active + [name])
+            if path not in recorder.recorded:
+                _record_inputs(recorder, path, fn, args, kwargs)
+            recorder.active.append(name)
+            try:
+                with jax.named_scope(name):
+                    return fn(*args, **kwargs)
+            finally:
+                recorder.active.pop()
+
+        return wrapper
+
+    return decorator
+
+
+def _record_inputs(recorder: _Recorder, path: str, fn: Callable, args: tuple, kwargs: dict) -> None:
+    """
+    Stores the inputs of the first call of a stage that is actually executed. The traced arguments are
+    sent back from the device with a debug callback, which only runs in the branches that are taken and
+    once per element under `jax.vmap`, everything else is kept as it was passed.
+    """
+    leaves, treedef = jax.tree.flatten((args, kwargs))
+    traced = [i for i, leaf in enumerate(leaves) if isinstance(leaf, jax.core.Tracer)]
+
+    def record(*arrays):
+        if path not in recorder.recorded:
+            filled = list(leaves)
+            for i, array in zip(traced, arrays):
+                filled[i] = np.asarray(array)
+            call_args, call_kwargs = jax.tree.unflatten(treedef, filled)
+            recorder.recorded[path] = (fn, call_args, call_kwargs)
+
+    if traced:
+        jax.debug.callback(record, *[leaves[i] for i in traced])
+    else:
+        record()
+
+
+class StageCost(NamedTuple):
+    name: str # path of the stage, nested stages are joined with "/"
+    seconds: float # median time of one call, jitted on its own
+    compile_seconds: float
+
+
+def _time_call(fn: Callable, args: tuple, kwargs: dict, repeats: int) -> Tuple[float, float]:
+    """Jits fn with the array leaves of its arguments as inputs, everything else is closed over."""
+    leaves, treedef = jax.tree.flatten((args, kwargs))
+    dynamic = [i for i, leaf in enumerate(leaves) if isinstance(leaf, (jax.Array, np.ndarray, np.generic))]
+
+    def call(*arrays):
+        filled = list(leaves)
+        for i, array in zip(dynamic, arrays):
+            filled[i] = array
+        call_args, call_kwargs = jax.tree.unflatten(treedef, filled)
+        return fn(*call_args, **call_kwargs)
+
+    arrays = [jnp.asarray(leaves[i]) for i in dynamic]
+    start = time.perf_counter()
+    compiled = jax.jit(call).lower(*arrays).compile()
+    compile_seconds = time.perf_counter() - start
+
+    jax.block_until_ready(compiled(*arrays))
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        jax.block_until_ready(compiled(*arrays))
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations), compile_seconds
+
+
+def _warm_up(env, key: jax.Array, num_steps: int):
+    """Resets env and plays num_steps random steps. Returns the reset state and the state reached."""
+    reset_key, key = jax.random.split(key)
+    _, reset_state = env.reset(reset_key)
+    num_actions = env.action_space().n
+
+    def body_fn(state, step_key):
+        action = jax.random.randint(step_key, (), 0, num_actions)
+        _, state, _, _, _ = env.step(state, action)
+        return state, None
+
+    run = jax.jit(lambda state, key: jax.lax.scan(body_fn, state, jax.random.split(key, num_steps))[0])
+    return reset_state, run(reset_state, key)
+
+
+def stage_costs(
+    env,
+    key: Optional[jax.Array] = None,
+    warmup_steps: int = 200,
+    action: int = 0,
+    repeats: int = 20,
+    include_render: bool = True,
+) -> List[StageCost]:
+    """
+    Times the full step, every stage reached in it and the renderer, each jitted on its own.
+    The stage inputs are recorded from one step after warmup_steps random steps, so the stages see a
+    typical state. Stages that step did not reach (e.g. because the game was in a death animation) are
+    recorded from the first step after reset instead.
+    Stages called inside `jax.vmap` are timed for a single element. Every time includes the overhead of
+    calling a jitted function, which dominates the smallest stages.
+    Args:
+        env: The game, a JaxEnvironment.
+        key: The key for the reset and the random warm-up steps.
+        warmup_steps: The random steps played before recording.
+        action: The action of the recorded steps.
+        repeats: How often every stage is timed, the median is reported.
+        include_render: Whether to also time `env.render` (which creates the renderer).
+    Returns: The cost of "step", of every stage in the order they were first recorded and of "render".
+    """
+    key = jax.random.PRNGKey(0) if key is None else key
+    reset_state, state = _warm_up(env, key, warmup_steps)
+    action = jnp.asarray(action, dtype=jnp.int32)
+
+    # the stages only record while they are traced. The jitted methods of a copy of the game miss
+    # the traces cached for env, which is their static argument, so the copy's step is traced anew.
+    # It is called from a jit of its own, which leaves the dispatch cache of the step untouched.
+    recording_env = copy.copy(env)
+    recording_env._stage_recorder = recorder = _Recorder()
+    recording_step = jax.jit(lambda state, action: recording_env.step(state, action))
+    jax.block_until_ready(recording_step(state, action))
+    jax.block_until_ready(recording_step(reset_state, action))
+    jax.effects_barrier()
+    # the stages are timed as methods of env, which does not record
+    recorded = {
+        path: (fn, tuple(env if arg is recording_env else arg for arg in args), kwargs)
+        for path, (fn, args, kwargs) in recorder.recorded.items()
+    }
+
+    calls = [("step", type(env).step, (env, state, action), {})]
+    calls += [(path, fn, args, kwargs) for path, (fn, args, kwargs) in recorded.items()]
+    if include_render:
+        calls.append(("render", type(env).render, (env, state), {}))
+    return [StageCost(name, *_time_call(fn, args, kwargs, repeats)) for name, fn, args, kwargs in calls]
+
+
+def format_stage_costs(costs: Sequence[StageCost]) -> str:
+    """Formats stage costs as a table, with every stage also as a share of the full step."""
+    step_seconds = next((cost.seconds for cost in costs if cost.name == "step"), None)
+    width = max([len("stage")] + [len(cost.name) for cost in costs])
+    lines = [f"{'stage':<{width}} {'time (us)':>12} {'% of step':>10} {'compile (s)':>12}"]
+    for cost in costs:
+        share = f"{100 * cost.seconds / step_seconds:.1f}" if step_seconds else "-"
+        lines.append(f"{cost.name:<{width}} {cost.seconds * 1e6:>12.1f} {share:>10} {cost.compile_seconds:>12.2f}")
+    return "\n".join(lines)
+
+
+def trace(
+    env,
+    log_dir: str,
+    num_steps: int = 100,
+    batch_size: Optional[int] = None,
+    key: Optional[jax.Array] = None,
+) -> str:
+    """
+    Records a `jax.profiler` trace of num_steps steps with random actions. The step is compiled before
+    tracing starts, so the trace only holds execution. The stages appear under their named scopes.
+    Args:
+        env: The game, a JaxEnvironment.
+        log_dir: The directory the trace is written to, open it with TensorBoard or Perfetto.
+        num_steps: The steps to trace, each one a separate call of the jitted step.
+        batch_size: If given, batch_size environments are stepped in parallel with `jax.vmap`.
+        key: The key for the reset and the random actions.
+    Returns: log_dir.
+    """
+    key = jax.random.PRNGKey(0) if key is None else key
+    reset_key, key = jax.random.split(key)
+    if batch_size is None:
+        step, action_shape = jax.jit(env.step), ()
+        _, state = env.reset(reset_key)
+    else:
+        step, action_shape = jax.jit(jax.vmap(env.step)), (batch_size,)
+        _, state = jax.vmap(env.reset)(jax.random.split(reset_key, batch_size))
+    actions = jax.random.randint(key, (num_steps,) + action_shape, 0, env.action_space().n)
+
+    jax.block_until_ready(step(state, actions[0]))
+    with jax.profiler.trace(log_dir):
+        for i in range(num_steps):
+            with jax.profiler.StepTraceAnnotation("step", step_num=i):
+                _, state, _, _, _ = step(state, actions[i])
+        jax.block_until_ready(state)
+    return log_dir
+
+
+def main(argv: Optional[Sequence[str]] = None) -> List[StageCost]:
+    import jaxatari
+
+    parser = argparse.ArgumentParser(description="Profile the step of a jaxatari game stage by stage.")
+    parser.add_argument("game", help="The registered name of the game.")
+    parser.add_argument("--steps", type=int, default=100, help="Steps to record with --trace-dir.")
+    parser.add_argument("--batch-size", type=int, default=None, help="Parallel environments in the trace.")
+    parser.add_argument("--trace-dir", help="Also record a jax.profiler trace into this directory.")
+    parser.add_argument("--warmup-steps", type=int, default=200, help="Random steps before the stages are timed.")
+    parser.add_argument("--no-render", action="store_true", help="Do not time the renderer.")
+    args = parser.parse_args(argv)
+
+    env = jaxatari.make(args.game)
+    if args.trace_dir:
+        print(f"Trace written to {trace(env, args.trace_dir, args.steps, args.batch_size)}")
+    costs = stage_costs(env, warmup_steps=args.warmup_steps, include_render=not args.no_render)
+    print(format_stage_costs(costs))
+    return costs
+
+
+if __name__ == "__main__":
+    main()
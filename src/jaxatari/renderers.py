@@ -1,5 +1,9 @@
 from typing import TypeVar
 
+import jax.numpy as jnp
+
+import jaxatari.rendering.jax_rendering_utils as jr
+
 
 class PyGameRenderer:
     def __init__(self):
@@ -12,3 +16,28 @@ class JAXGameRenderer():
 
     def render(self, state):
         pass
+
+    @property
+    def palette(self) -> jnp.ndarray:
+        """
+        The (P, 3) uint8 color palette of this game, built once from `palette_sources`.
+        Index frames from `render_indexed` are turned back into RGB with `jr.palette_lookup(frame, palette)`.
+        """
+        if getattr(self, "_palette", None) is None:
+            sprites, colors = self.palette_sources()
+            self._palette = jr.build_palette(sprites, colors)
+        return jnp.asarray(self._palette)
+
+    def palette_sources(self):
+        """
+        Returns the (sprites, colors) the palette is built from, the RGBA sprites and RGB colors
+        drawn by `render_indexed`. Renderers with a palette-index mode list all of them.
+        """
+        raise NotImplementedError(f"{type(self).__name__} has no palette-indexed mode")
+
+    def render_indexed(self, state) -> jnp.ndarray:
+        """
+        Renders the state to a (H, W) uint8 frame of palette indices, drawn with palette-index sprites.
+        Renderers with a palette-indexed mode override it together with `palette_sources`.
+        """
+        raise NotImplementedError(f"{type(self).__name__} has no palette-indexed mode")
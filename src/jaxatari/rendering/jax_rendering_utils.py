@@ -7,7 +7,11 @@ from functools import partial
 from jax import lax
 from typing import List, Tuple
 
+from jaxatari.rendering.sprite_atlas import load_sprite
+
 BORDER = False
+# Palette index marking transparent pixels in index sprites, palettes hold at most 255 colors.
+TRANSPARENT_INDEX = 255
 
 class AgnosticPath(Path):
     """A class that can handle input with Windows (\\) and/or posix (/) separators for paths"""
@@ -58,6 +62,7 @@ def add_border(frame):
 
 def loadFrame(fileName, transpose=False):
     """Loads a frame from .npy, ensuring output is (Height, Width, Channels).
+    The frame is read from the packed sprite atlas of its directory if there is one (see sprite_atlas).
 
     Args:
         fileName: Path to the .npy file.
@@ -67,7 +72,7 @@ def loadFrame(fileName, transpose=False):
     Returns:
         JAX array of shape (Height, Width, 4).
     """
-    frame = jnp.load(fileName)
+    frame = jnp.asarray(load_sprite(fileName))
     if frame.ndim != 3 or frame.shape[2] != 4:
          raise ValueError(
             f"Invalid frame format in {fileName}. Source .npy must be loadable with 3 dims and 4 channels."
@@ -139,11 +144,8 @@ def get_sprite_frame(frames, frame_idx, loop=True):
     frame_idx_converted = lax.cond(loop, lambda: frame_idx_looped, lambda: frame_idx)
     valid_frame = (frame_idx_converted >= 0) & (frame_idx_converted < num_frames)
 
-    # Get dimensions from input array shape (N, H, W, C)
-    frame_height = frames.shape[1]   # Axis 1 is Height
-    frame_width = frames.shape[2]    # Axis 2 is Width
-    frame_channels = frames.shape[3] # Axis 3 is Channels
-    blank_frame = jnp.zeros((frame_height, frame_width, frame_channels), dtype=frames.dtype)
+    # Get dimensions from input array shape (N, H, W, C), or (N, H, W) for palette-index frames
+    blank_frame = jnp.zeros(frames.shape[1:], dtype=frames.dtype)
 
     return lax.cond(
         valid_frame,
@@ -222,6 +224,173 @@ def render_at(raster, x, y, sprite_frame,
     
     return new_raster_float.astype(raster.dtype)
 
+
+@jax.jit
+def blit(raster, x, y, sprite_frame,
+         flip_horizontal=False,
+         flip_vertical=False,
+         flip_offset: jnp.ndarray = jnp.array([0, 0])):
+    """
+    Renders a sprite like `render_at`, but only touches a sprite-sized window of the raster.
+
+    The window is cut out with `lax.dynamic_slice`, clamped so it always lies inside the raster,
+    composited and written back with `lax.dynamic_update_slice`. Sprite pixels falling outside
+    the raster are clipped. Fully opaque (alpha 255) and fully transparent (alpha 0) pixels are
+    composited with a boolean select; partially transparent pixels use the same float blend as
+    `render_at`, so the output is pixel-identical to `render_at`.
+
+    Palette-index sprites (H, W) are drawn onto index frames (H, W) the same way,
+    skipping pixels that hold `TRANSPARENT_INDEX`.
+
+    Args:
+        raster: JAX array (H, W, C) for the target image, or (H, W) palette indices.
+        x: World x-coordinate for the top-left of the sprite's content.
+        y: World y-coordinate for the top-left of the sprite's content.
+        sprite_frame: JAX array (H, W, 4) with sprite data, or (H, W) palette indices.
+        flip_horizontal: Boolean flag to flip the sprite horizontally.
+        flip_vertical: Boolean flag to flip the sprite vertically.
+        flip_offset: A [dx, dy] array (width, height padding) for flip correction.
+    """
+    raster_height, raster_width = raster.shape[:2]
+    sprite_height, sprite_width = sprite_frame.shape[:2]
+
+    # A window larger than the raster cannot be sliced, use the full-frame path instead.
+    if sprite_height > raster_height or sprite_width > raster_width:
+        if sprite_frame.ndim == 2:
+            # Draw onto a raster padded by the sprite size on every side and crop the result.
+            padding = ((sprite_height, sprite_height), (sprite_width, sprite_width))
+            padded = jnp.pad(raster, padding, constant_values=TRANSPARENT_INDEX)
+            padded = blit(padded, jnp.asarray(x, dtype=jnp.int32) + sprite_width,
+                          jnp.asarray(y, dtype=jnp.int32) + sprite_height,
+                          sprite_frame, flip_horizontal, flip_vertical, flip_offset)
+            return padded[sprite_height:sprite_height + raster_height, sprite_width:sprite_width + raster_width]
+        return render_at(raster, x, y, sprite_frame, flip_horizontal, flip_vertical, flip_offset)
+
+    # --- Position Calculation with Flip Correction (same as render_at) ---
+    x, y = jnp.asarray(x, dtype=jnp.int32), jnp.asarray(y, dtype=jnp.int32)
+    flip_horizontal = jnp.asarray(flip_horizontal, dtype=bool)
+    flip_vertical = jnp.asarray(flip_vertical, dtype=bool)
+    top_left_x = jnp.where(flip_horizontal, (x - flip_offset[0]).astype(jnp.int32), x)
+    top_left_y = jnp.where(flip_vertical, (y - flip_offset[1]).astype(jnp.int32), y)
+
+    # --- Window Selection ---
+    # Clamp the window into the raster, the sprite may still be partially outside of it.
+    window_x = jnp.clip(top_left_x, 0, raster_width - sprite_width)
+    window_y = jnp.clip(top_left_y, 0, raster_height - sprite_height)
+    channel_start = (0,) * (raster.ndim - 2)
+    window = lax.dynamic_slice(
+        raster, (window_y, window_x) + channel_start, (sprite_height, sprite_width) + raster.shape[2:]
+    )
+
+    # Sprite coordinates for every window pixel, flipping is folded into the index.
+    sprite_coord_x = window_x + jnp.arange(sprite_width) - top_left_x
+    sprite_coord_y = window_y + jnp.arange(sprite_height) - top_left_y
+    valid_x = (sprite_coord_x >= 0) & (sprite_coord_x < sprite_width)
+    valid_y = (sprite_coord_y >= 0) & (sprite_coord_y < sprite_height)
+    sprite_coord_x = jnp.clip(sprite_coord_x, 0, sprite_width - 1)
+    sprite_coord_y = jnp.clip(sprite_coord_y, 0, sprite_height - 1)
+    sprite_coord_x = jnp.where(flip_horizontal, sprite_width - 1 - sprite_coord_x, sprite_coord_x)
+    sprite_coord_y = jnp.where(flip_vertical, sprite_height - 1 - sprite_coord_y, sprite_coord_y)
+    sprite = sprite_frame[sprite_coord_y[:, None], sprite_coord_x[None, :]]
+
+    # --- Blending Logic ---
+    in_bounds = valid_y[:, None] & valid_x[None, :]
+    if raster.ndim == 3:
+        in_bounds = in_bounds[..., None]
+    window = jnp.where(in_bounds, _composite(window, sprite), window)
+
+    return lax.dynamic_update_slice(raster, window, (window_y, window_x) + channel_start)
+
+
+def _composite(target, sprite):
+    """Composites an RGBA sprite onto an equally sized (H, W, C) target, pixel-identical to render_at.
+
+    For a palette-index sprite (H, W) every non-transparent index replaces the target index.
+    """
+    if sprite.ndim == target.ndim == 2:
+        return jnp.where(sprite != TRANSPARENT_INDEX, sprite.astype(target.dtype), target)
+    alpha = sprite[..., 3:]
+    sprite_rgb = sprite[..., :3].astype(target.dtype)
+    blended = (
+        sprite[..., :3].astype(jnp.float32) * (alpha.astype(jnp.float32) / 255.0)
+        + target.astype(jnp.float32) * (1.0 - alpha.astype(jnp.float32) / 255.0)
+    ).astype(target.dtype)
+    return jnp.where(alpha == 255, sprite_rgb, jnp.where(alpha == 0, target, blended))
+
+
+@jax.jit
+def render_many(raster, xs, ys, sprite_ids, sprite_atlas, flips, active_mask,
+                flip_offsets: jnp.ndarray = jnp.array([0, 0])):
+    """
+    Composites N sprites from an atlas onto the raster in a single vectorized pass.
+
+    Overlaps are resolved last-writer-wins: where several sprites cover the same pixel,
+    the one with the highest index in the entity arrays is drawn. For sprites with
+    binary alpha (0 or 255) the result is identical to calling `blit` for every active
+    entity in index order; partially transparent pixels are blended with the raster
+    only, not with other sprites underneath them.
+
+    A palette-index atlas (K, H, W) is drawn onto an index frame (H, W), see `blit`.
+
+    Args:
+        raster: JAX array (H, W, C) for the target image, or (H, W) palette indices.
+        xs: (N,) world x-coordinates for the top-left of each sprite's content.
+        ys: (N,) world y-coordinates for the top-left of each sprite's content.
+        sprite_ids: (N,) indices into sprite_atlas.
+        sprite_atlas: JAX array (K, H, W, 4) of equally sized sprites, or (K, H, W) palette indices.
+        flips: (N,) or scalar boolean flags to flip sprites horizontally.
+        active_mask: (N,) or scalar boolean flags, inactive entities are not drawn.
+        flip_offsets: (N, 2) or (2,) [dx, dy] flip corrections, see `render_at`. Only dx is used.
+    """
+    raster_height, raster_width = raster.shape[:2]
+    sprite_height, sprite_width = sprite_atlas.shape[1:3]
+    indexed = sprite_atlas.ndim == 3
+    num_entities = xs.shape[0]
+
+    xs = jnp.asarray(xs, dtype=jnp.int32)
+    ys = jnp.asarray(ys, dtype=jnp.int32)
+    flips = jnp.broadcast_to(jnp.asarray(flips, dtype=bool), (num_entities,))
+    active_mask = jnp.broadcast_to(jnp.asarray(active_mask, dtype=bool), (num_entities,))
+    flip_offsets = jnp.broadcast_to(jnp.asarray(flip_offsets), (num_entities, 2))
+
+    # --- Position Calculation with Flip Correction ---
+    top_left_x = jnp.where(flips, (xs - flip_offsets[:, 0]).astype(jnp.int32), xs)
+
+    # --- Per-Entity Sprites, shape (N, H, W, 4) or (N, H, W) ---
+    sprites = sprite_atlas[sprite_ids]
+    flip_mask = flips.reshape((num_entities,) + (1,) * (sprites.ndim - 1))
+    sprites = jnp.where(flip_mask, jnp.flip(sprites, axis=2), sprites)
+    opaque = sprites != TRANSPARENT_INDEX if indexed else sprites[..., 3] > 0
+
+    # Raster coordinates of every sprite pixel, shape (N, H, W)
+    coord_y = ys[:, None, None] + jnp.arange(sprite_height)[None, :, None]
+    coord_x = top_left_x[:, None, None] + jnp.arange(sprite_width)[None, None, :]
+    coord_y, coord_x = jnp.broadcast_arrays(coord_y, coord_x)
+    in_bounds = (coord_y >= 0) & (coord_y < raster_height) & (coord_x >= 0) & (coord_x < raster_width)
+    visible = in_bounds & opaque & active_mask[:, None, None]
+
+    # --- Z-Buffer: highest visible entity index per pixel (1-based, 0 = empty) ---
+    # Hidden pixels are routed out of bounds and dropped by the scatter.
+    z = jnp.arange(1, num_entities + 1, dtype=jnp.int32)[:, None, None]
+    scatter_y = jnp.where(visible, coord_y, raster_height)
+    scatter_x = jnp.where(visible, coord_x, raster_width)
+    z_buffer = jnp.zeros((raster_height, raster_width), dtype=jnp.int32)
+    z_buffer = z_buffer.at[scatter_y, scatter_x].max(z, mode="drop")
+
+    # --- Scatter the winning sprite pixels into a transparent layer ---
+    winner = visible & (z_buffer[jnp.clip(coord_y, 0, raster_height - 1), jnp.clip(coord_x, 0, raster_width - 1)] == z)
+    layer = jnp.full(
+        (raster_height, raster_width) + sprite_atlas.shape[3:],
+        TRANSPARENT_INDEX if indexed else 0,
+        dtype=sprite_atlas.dtype,
+    )
+    layer = layer.at[jnp.where(winner, coord_y, raster_height), jnp.where(winner, coord_x, raster_width)].set(
+        sprites, mode="drop"
+    )
+
+    # --- Blending Logic ---
+    return _composite(raster, layer)
+
 MAX_LABEL_WIDTH = 100
 MAX_LABEL_HEIGHT = 20
 
@@ -233,7 +402,7 @@ def render_label(raster, x, y, text_digits, char_sprites, spacing=15):
     def render_char(i, current_raster):
         char_x = x + i * spacing
         # Use a (0,0) pivot to maintain top-left rendering for each character
-        return render_at(current_raster, char_x, y, sprites[i], flip_offset=jnp.array([0.0, 0.0]))
+        return blit(current_raster, char_x, y, sprites[i], flip_offset=jnp.array([0.0, 0.0]))
 
     raster = jax.lax.fori_loop(0, sprites.shape[0], render_char, raster)
     return raster
@@ -253,7 +422,7 @@ def render_label_selective(raster, x, y,
         sprite_to_render = char_sprites[digit_value]
         render_x = x + i * spacing
         # Use a (0,0) pivot for top-left rendering
-        return render_at(current_raster, render_x, y, sprite_to_render, flip_offset=jnp.array([0.0, 0.0]))
+        return blit(current_raster, render_x, y, sprite_to_render, flip_offset=jnp.array([0.0, 0.0]))
 
     raster = jax.lax.fori_loop(0, num_to_render, render_char, raster)
     return raster
@@ -265,21 +434,119 @@ def render_indicator(raster, x, y, value, sprite, spacing=15):
     def render_single_indicator(i, current_raster):
         indicator_x = x + i * spacing
         # Use a (0,0) pivot for top-left rendering
-        return render_at(current_raster, indicator_x, y, sprite, flip_offset=jnp.array([0.0, 0.0]))
+        return blit(current_raster, indicator_x, y, sprite, flip_offset=jnp.array([0.0, 0.0]))
 
     return jax.lax.fori_loop(0, value, render_single_indicator, raster)
 
 
+def hud_strip(sprite_atlas, sprite_ids, visible, spacing, shift=0):
+    """
+    Lays sprites out side by side into one strip with a single gather, slot i starting at column i * spacing - shift.
+
+    Where slots overlap, later slots cover earlier ones like consecutive `blit` calls (exact for binary alpha).
+    Pixels of hidden slots and pixels no slot covers are transparent.
+
+    Args:
+        sprite_atlas: JAX array (K, H, W, 4) of equally sized sprites, or (K, H, W) palette indices.
+        sprite_ids: (N,) index into sprite_atlas for every slot.
+        visible: (N,) boolean flags, hidden slots are not drawn.
+        spacing: Static distance between the starts of two slots.
+        shift: Number of columns all slots are moved to the left.
+
+    Returns:
+        The strip, (H, (N - 1) * spacing + W, 4) or (H, (N - 1) * spacing + W) palette indices.
+    """
+    num_slots = sprite_ids.shape[0]
+    sprite_width = sprite_atlas.shape[2]
+    indexed = sprite_atlas.ndim == 3
+    width = (num_slots - 1) * spacing + sprite_width
+
+    # A column is covered by at most `depth` slots, candidates are ordered latest slot first.
+    depth = -(-sprite_width // spacing)
+    column = jnp.arange(width) + shift
+    slot = column[None, :] // spacing - jnp.arange(depth)[:, None]
+    sprite_x = column[None, :] - slot * spacing
+    covered = (slot >= 0) & (slot < num_slots) & (sprite_x < sprite_width)
+    slot = jnp.clip(slot, 0, num_slots - 1)
+    covered = covered & visible[slot]
+
+    # (depth, width, H[, 4]) -> (depth, H, width[, 4])
+    pixels = jnp.moveaxis(sprite_atlas[sprite_ids[slot], :, jnp.clip(sprite_x, 0, sprite_width - 1)], 2, 1)
+    opaque = (pixels != TRANSPARENT_INDEX if indexed else pixels[..., 3] > 0) & covered[:, None, :]
+    top = jnp.argmax(opaque, axis=0)
+    strip = jnp.take_along_axis(pixels, top.reshape((1,) + top.shape + (1,) * (pixels.ndim - 3)), axis=0)[0]
+    drawn = jnp.any(opaque, axis=0)
+    if indexed:
+        return jnp.where(drawn, strip, jnp.asarray(TRANSPARENT_INDEX, dtype=strip.dtype))
+    return jnp.where(drawn[..., None], strip, jnp.zeros_like(strip))
+
+
+@partial(jax.jit, static_argnames=["num_digits", "spacing", "hide_leading_zeros", "align"])
+def render_number(raster, x, y, value, digit_atlas, num_digits, spacing, hide_leading_zeros=False, align=0.0):
+    """
+    Renders `value` as a field of `num_digits` digits at (x, y), gathered into one strip and drawn with one blit.
+
+    Args:
+        raster: JAX array (H, W, C) for the target image, or (H, W) palette indices.
+        x: World x-coordinate of the left edge of the field.
+        y: World y-coordinate of the top of the field.
+        value: The non-negative integer to draw, clipped to the largest number the field can show.
+        digit_atlas: JAX array (10, H, W, 4) of the digit sprites 0-9, or (10, H, W) palette indices.
+        num_digits: Static number of digits of the field.
+        spacing: Static distance between the starts of two digits.
+        hide_leading_zeros: If True, leading zeros are not drawn. The last digit is always drawn.
+        align: Where the drawn digits sit when leading zeros are hidden. 0.0 keeps every digit in its place
+            (right aligned), 0.5 centers them in the field and 1.0 moves them to its left edge.
+    """
+    value = jnp.clip(jnp.asarray(value, dtype=jnp.int32), 0, 10 ** num_digits - 1)
+    digits = (value // 10 ** jnp.arange(num_digits - 1, -1, -1, dtype=jnp.int32)) % 10
+    if hide_leading_zeros:
+        hidden = (jnp.cumsum(digits != 0) == 0).at[-1].set(False)
+    else:
+        hidden = jnp.zeros((num_digits,), dtype=bool)
+    shift = (jnp.sum(hidden) * spacing * align).astype(jnp.int32)
+    return blit(raster, x, y, hud_strip(digit_atlas, digits, ~hidden, spacing, shift))
+
+
+@partial(jax.jit, static_argnames=["max_value", "spacing", "align_right"])
+def render_indicator_strip(raster, x, y, value, sprite, max_value, spacing, align_right=False):
+    """
+    Renders 'value' copies of 'sprite' like `render_indicator`, gathered into one strip and drawn with one blit.
+
+    Args:
+        raster: JAX array (H, W, C) for the target image, or (H, W) palette indices.
+        x: World x-coordinate of the left edge of a field of `max_value` copies.
+        y: World y-coordinate of the top of the field.
+        value: Number of copies, clipped to [0, max_value].
+        sprite: JAX array (H, W, 4) with sprite data, or (H, W) palette indices.
+        max_value: Static number of copies the field holds.
+        spacing: Static distance between the starts of two copies.
+        align_right: If True, the copies end at the right edge of the field instead of starting at its left edge.
+    """
+    value = jnp.clip(jnp.asarray(value, dtype=jnp.int32), 0, max_value)
+    slots = jnp.arange(max_value)
+    visible = slots >= max_value - value if align_right else slots < value
+    strip = hud_strip(sprite[None], jnp.zeros((max_value,), dtype=jnp.int32), visible, spacing)
+    return blit(raster, x, y, strip)
+
+
 @partial(jax.jit, static_argnames=["width", "height"])
 def render_bar(raster, x, y, value, max_value, width, height, color, default_color):
-    """Renders a horizontal progress bar at (x, y) with specified geometry."""
+    """
+    Renders a horizontal progress bar at (x, y) with specified geometry.
+
+    The colors are RGBA, or palette indices when drawing onto an index frame
+    (`TRANSPARENT_INDEX` leaves the raster visible like an alpha of 0).
+    """
     color = jnp.asarray(color, dtype=jnp.uint8)
     default_color = jnp.asarray(default_color, dtype=jnp.uint8)
     
     fill_width = jnp.clip(jnp.nan_to_num((value / max_value) * width), 0, width).astype(jnp.int32)
     # Use 'xy' indexing for an (H, W) grid
     bar_xx, _ = jnp.meshgrid(jnp.arange(width), jnp.arange(height), indexing='xy')
-    fill_mask = (bar_xx < fill_width)[..., None]
+    fill_mask = bar_xx < fill_width
+    if color.ndim:
+        fill_mask = fill_mask[..., None]
     
     bar_content = jnp.where(
         fill_mask,
@@ -288,11 +555,64 @@ def render_bar(raster, x, y, value, max_value, width, height, color, default_col
     )
 
     # Render the generated bar using a (0,0) pivot for top-left behavior
-    raster = render_at(raster, x, y, bar_content, flip_offset=jnp.array([0.0, 0.0]))
+    raster = blit(raster, x, y, bar_content, flip_offset=jnp.array([0.0, 0.0]))
 
     return raster
 
 
+def build_palette(sprites, colors=()) -> np.ndarray:
+    """Builds a palette from the opaque colors of RGBA sprites and additional RGB colors.
+
+    Index 0 is always black, the color `create_initial_frame` starts from.
+
+    Args:
+        sprites: Iterable of RGBA arrays (..., 4), e.g. single sprites or stacked animations.
+        colors: Iterable of additional RGB colors (..., 3), e.g. colors drawn without sprites.
+
+    Returns:
+        NumPy array of shape (P, 3), dtype uint8, with unique colors.
+    """
+    found = [np.zeros((1, 3), dtype=np.uint8)]
+    for sprite in sprites:
+        sprite = np.asarray(sprite).reshape(-1, 4)
+        found.append(sprite[sprite[:, 3] > 0, :3].astype(np.uint8))
+    for color in colors:
+        found.append(np.asarray(color).reshape(-1, 3).astype(np.uint8))
+    palette = np.unique(np.concatenate(found, axis=0), axis=0)
+    # np.unique sorts, so black (0, 0, 0) is already the first entry
+    if palette.shape[0] > TRANSPARENT_INDEX:
+        raise ValueError(f"Palette has {palette.shape[0]} colors, at most {TRANSPARENT_INDEX} are supported.")
+    return palette
+
+
+@jax.jit
+def rgb_to_palette_index(rgb, palette):
+    """Maps RGB pixels (..., 3) to the index of the nearest palette color, returns uint8 (...)."""
+    distance = jnp.sum(
+        (rgb[..., None, :3].astype(jnp.int32) - palette.astype(jnp.int32)) ** 2, axis=-1
+    )
+    return jnp.argmin(distance, axis=-1).astype(jnp.uint8)
+
+
+@jax.jit
+def index_sprite(sprite_frame, palette):
+    """Converts RGBA sprites (..., 4) to palette-index sprites (...), transparent pixels become TRANSPARENT_INDEX."""
+    indices = rgb_to_palette_index(sprite_frame[..., :3], palette)
+    return jnp.where(sprite_frame[..., 3] > 0, indices, jnp.uint8(TRANSPARENT_INDEX))
+
+
+@jax.jit
+def palette_lookup(index_frame, palette):
+    """Recovers RGB frames (..., 3) from palette-index frames (...)."""
+    return jnp.asarray(palette, dtype=jnp.uint8)[index_frame]
+
+
+@partial(jax.jit, static_argnames=["width", "height"])
+def create_initial_index_frame(width=160, height=210):
+    """Creates an initial palette-index frame of shape (height, width) filled with index 0 (black)."""
+    return jnp.zeros((height, width), dtype=jnp.uint8)
+
+
 def _find_content_bbox_np(sprite_frame: np.ndarray) -> tuple[int, int, int, int]:
     """Finds the bounding box of non-transparent content in an HWC NumPy array."""
     alpha_channel = np.asarray(sprite_frame[:, :, 3])
@@ -0,0 +1,134 @@
+"""
+Packed sprite atlases: all .npy sprites of a game in one memory-mappable file.
+
+File layout: the magic bytes, the length of the header as little-endian uint64, a JSON header
+mapping every sprite name (its path relative to the sprite directory without ".npy") to its
+shape, dtype and byte offset, and the raw sprite data, each entry aligned to ALIGNMENT bytes.
+`jr.loadFrame` reads sprites from the atlas of their directory if there is one, only touching
+the bytes of the requested sprite, and falls back to the .npy file otherwise.
+Rebuild the atlases with `python scripts/build_sprite_atlas.py` after changing sprites.
+"""
+
+import json
+import os
+from typing import Dict, Optional
+
+import numpy as np
+
+ATLAS_FILENAME = "sprites.atlas"
+MAGIC = b"JXATLAS1"
+ALIGNMENT = 64
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def build_atlas(sprite_dir: str, out_path: Optional[str] = None) -> str:
+    """
+    Packs all .npy files below sprite_dir into one atlas file.
+    Args:
+        sprite_dir: The sprite directory of a game, e.g. games/sprites/pong.
+        out_path: Where to write the atlas, sprite_dir/ATLAS_FILENAME by default.
+    Returns: The path of the written atlas.
+    """
+    out_path = out_path or os.path.join(sprite_dir, ATLAS_FILENAME)
+    arrays = {}
+    for root, dirs, files in os.walk(sprite_dir):
+        dirs.sort()
+        for file in sorted(files):
+            if file.endswith(".npy"):
+                path = os.path.join(root, file)
+                name = os.path.relpath(path, sprite_dir)[: -len(".npy")].replace(os.sep, "/")
+                arrays[name] = np.ascontiguousarray(np.load(path))
+
+    index, offset = {}, 0
+    for name, array in arrays.items():
+        index[name] = {"shape": list(array.shape), "dtype": array.dtype.str, "offset": offset}
+        offset = _aligned(offset + array.nbytes)
+    header = json.dumps({"sprites": index}, sort_keys=True).encode()
+    data_start = _aligned(len(MAGIC) + 8 + len(header))
+
+    with open(out_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(np.uint64(len(header)).tobytes())
+        f.write(header)
+        for name, array in arrays.items():
+            f.seek(data_start + index[name]["offset"])
+            f.write(array.tobytes())
+        f.truncate(data_start + offset)
+    return out_path
+
+
+class SpriteAtlas:
+    """
+    Read access to an atlas file. The file is memory-mapped on first use and sprites are
+    copied out of the mapping one by one, so unused sprites are never read.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._index: Optional[Dict[str, dict]] = None
+        self._data: Optional[np.memmap] = None
+
+    def _open(self) -> None:
+        with open(self.path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.path} is not a sprite atlas")
+            header_length = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+            self._index = json.loads(f.read(header_length))["sprites"]
+        data_start = _aligned(len(MAGIC) + 8 + header_length)
+        if os.path.getsize(self.path) > data_start:
+            self._data = np.memmap(self.path, dtype=np.uint8, mode="r", offset=data_start)
+        else:
+            self._data = np.zeros(0, dtype=np.uint8)
+
+    @property
+    def index(self) -> Dict[str, dict]:
+        """Maps sprite names to their shape, dtype and offset."""
+        if self._index is None:
+            self._open()
+        return self._index
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        entry = self.index[name]
+        dtype = np.dtype(entry["dtype"])
+        size = int(np.prod(entry["shape"], dtype=np.int64)) * dtype.itemsize
+        raw = self._data[entry["offset"]: entry["offset"] + size]
+        return np.array(raw).view(dtype).reshape(entry["shape"])
+
+
+# atlas (or None) of every directory looked up so far
+_ATLASES: Dict[str, Optional[SpriteAtlas]] = {}
+
+
+def _atlas_of(directory: str) -> Optional[SpriteAtlas]:
+    if directory not in _ATLASES:
+        path = os.path.join(directory, ATLAS_FILENAME)
+        _ATLASES[directory] = SpriteAtlas(path) if os.path.isfile(path) else None
+    return _ATLASES[directory]
+
+
+def load_sprite(path: str) -> np.ndarray:
+    """
+    Loads a .npy sprite, from the atlas of the closest enclosing directory that has one
+    and contains the sprite, or from the file itself otherwise.
+    """
+    path = os.path.abspath(path)
+    directory = os.path.dirname(path)
+    while True:
+        atlas = _atlas_of(directory)
+        if atlas is not None:
+            name = os.path.relpath(path, directory)[: -len(".npy")].replace(os.sep, "/")
+            if name in atlas:
+                return atlas[name]
+            break
+        parent = os.path.dirname(directory)
+        # the atlases live in the sprite directories of the games, don't search above them
+        if parent == directory or os.path.basename(directory) == "sprites":
+            break
+        directory = parent
+    return np.load(path)
@@ -253,4 +253,18 @@ def stack_space(space: Space, stack_size: int) -> Space:
 
     # jax.tree.map can now handle Box, Dict, and Tuple correctly
     # because they are all registered Pytrees (Box is a leaf by default).
-    return jax.tree.map(stack_box, space, is_leaf=lambda n: isinstance(n, Box))
\ No newline at end of file
+    return jax.tree.map(stack_box, space, is_leaf=lambda n: isinstance(n, Box))
+
+
+def batch_space(space: Space, batch_size: int) -> Space:
+    """
+    Recursively wraps a space to add a leading batch dimension.
+    Discrete spaces become integer Box spaces over the same categories.
+    """
+
+    def batch_leaf(leaf: Union[Box, Discrete]) -> Box:
+        if isinstance(leaf, Discrete):
+            return Box(low=0, high=leaf.n - 1, shape=(batch_size,), dtype=leaf.dtype)
+        return Box(low=leaf.low, high=leaf.high, shape=(batch_size,) + tuple(leaf.shape), dtype=leaf.dtype)
+
+    return jax.tree.map(batch_leaf, space, is_leaf=lambda n: isinstance(n, (Box, Discrete)))
@@ -1,13 +1,15 @@
 """Jaxatari Wrappers"""
 
 import functools
-from typing import Any, Dict, Tuple, Union, Optional
+from typing import Any, Callable, Dict, Sequence, Tuple, Union, Optional
 
 import chex
 from flax import struct
 import jax
+from jax.experimental.shard_map import shard_map
 import jax.numpy as jnp
-from jaxatari.environment import EnvState, JAXAtariAction as Action
+from jax.sharding import Mesh, NamedSharding, PartitionSpec as P
+from jaxatari.environment import EnvState, JAXAtariAction as Action, Trajectory, rollout
 import jaxatari.spaces as spaces
 import numpy as np
 
@@ -21,14 +23,66 @@ class JaxatariWrapper(object):
     def __getattr__(self, name):
         return getattr(self._env, name)
 
+    def rollout(
+        self,
+        state: Any,
+        policy_fn: Callable,
+        policy_params: Any,
+        key: chex.PRNGKey,
+        num_steps: int,
+        obs: chex.ArrayTree = None,
+        fields: Sequence[str] = Trajectory._fields,
+    ) -> Tuple[chex.ArrayTree, Any, Trajectory]:
+        """
+        Runs policy_fn(policy_params, obs, key) for num_steps steps of this wrapper in a single `lax.scan`.
+        obs is the observation returned together with state by reset or step, see `jaxatari.environment.rollout`.
+        """
+        return rollout(self, state, policy_fn, policy_params, key, num_steps, obs, tuple(fields))
+
+
+def ordered_stack_view(stack: chex.ArrayTree, stack_index: chex.Array) -> chex.ArrayTree:
+    """
+    Returns the frames of a ring-buffer stack ordered from oldest to newest.
+    `stack` can be a pytree of stacks sharing the same `stack_index`, the index of the oldest frame.
+    """
+    def order(x):
+        size = x.shape[0]
+        return jnp.take(x, (jnp.arange(size) + stack_index) % size, axis=0)
+
+    return jax.tree.map(order, stack)
+
+
+def _push_frame(stack: chex.ArrayTree, frame: chex.ArrayTree, stack_index: chex.Array) -> chex.ArrayTree:
+    """Overwrites the oldest frame of a ring-buffer stack in place with the new frame."""
+    return jax.tree.map(
+        lambda x, f: jax.lax.dynamic_update_index_in_dim(x, f.astype(x.dtype), stack_index, axis=0), stack, frame
+    )
+
+
 @struct.dataclass
 class AtariState:
     env_state: EnvState
     key: chex.PRNGKey
     step: int
     prev_action: int
-    obs_stack: chex.Array
-    
+    obs_stack: chex.Array # ring buffer, see ordered_stack_view
+    stack_index: int # position of the oldest frame in obs_stack
+
+
+# names of the state fields holding PRNG keys, in the games' states and in AtariState
+_PRNG_FIELDS = ("key", "rng_key")
+
+
+def _rekey(state: chex.ArrayTree, key: chex.PRNGKey) -> chex.ArrayTree:
+    """Replaces every PRNG key of an unbatched state, the fields named in _PRNG_FIELDS, with one derived from key."""
+    leaves, treedef = jax.tree_util.tree_flatten_with_path(state)
+    leaves = [
+        jax.random.fold_in(key, i) if path and getattr(path[-1], "name", None) in _PRNG_FIELDS else leaf
+        for i, (path, leaf) in enumerate(leaves)
+    ]
+    return jax.tree_util.tree_unflatten(treedef, leaves)
+
+
 class AtariWrapper(JaxatariWrapper):
     """
     Wrapper for Atari environments that returns the rendered image and object-centric observations unflattened.
@@ -38,8 +92,18 @@ class AtariWrapper(JaxatariWrapper):
         sticky_actions: Whether to use sticky actions.
         frame_stack_size: The number of frames to stack.
         frame_skip: The number of frames to skip.
+        ordered_stack: If False, the stack is returned as the raw ring buffer in which the newest frame
+            replaced the oldest one and info["stack_index"] holds the position of the oldest frame.
+            `ordered_stack_view(obs, info["stack_index"])` restores the oldest-to-newest order.
+        noop_max: Each reset is followed by a random number of up to noop_max NOOP steps to diversify start states.
+        reset_pool_size: If > 0, this many initial states are precomputed at construction and resets,
+            including the automatic ones in `step`, draw one of them instead of resetting the environment.
+            The PRNG keys of a drawn state are replaced, so episodes starting from it still differ.
+            With the default 0, the automatic reset in `step` runs the full reset inside a `lax.cond`,
+            which under `vmap` becomes a select that evaluates it on every step, see `VecEnv`.
+        reset_pool_seed: The seed the initial states of the pool are generated from.
     """
-    def __init__(self, env, sticky_actions: bool = True, frame_stack_size: int = 4, frame_skip: int = 4, max_episode_length: int = 10_000, episodic_life: bool = True, first_fire: bool = True):
+    def __init__(self, env, sticky_actions: bool = True, frame_stack_size: int = 4, frame_skip: int = 4, max_episode_length: int = 10_000, episodic_life: bool = True, first_fire: bool = True, ordered_stack: bool = True, noop_max: int = 0, reset_pool_size: int = 0, reset_pool_seed: int = 0):
         super().__init__(env)
         self._env = env
         self.sticky_actions = sticky_actions
@@ -48,31 +112,69 @@ class AtariWrapper(JaxatariWrapper):
         self.max_episode_length = max_episode_length
         self.episodic_life = episodic_life
         self.first_fire = first_fire
+        self.ordered_stack = ordered_stack
+        self.noop_max = noop_max
+        self.reset_pool_size = reset_pool_size
 
         if not hasattr(env, "lives"):
             self.episodic_life = False
         self._observation_space = spaces.stack_space(self._env.observation_space(), self.frame_stack_size)
 
+        self._reset_pool = None
+        if self.reset_pool_size > 0:
+            self._build_reset_pool(self.reset_pool_size, reset_pool_seed)
+
+    def _build_reset_pool(self, size: int, seed: int) -> None:
+        """Precomputes the size initial states resets draw from."""
+        self.reset_pool_size = size
+        pool_keys = jax.random.split(jax.random.PRNGKey(seed), size)
+        _, self._reset_pool = jax.jit(jax.vmap(self._initial_state))(pool_keys)
+
     def observation_space(self) -> spaces.Space:
         """Returns the stacked observation space."""
         return self._observation_space
 
     @functools.partial(jax.jit, static_argnums=(0,))
     def reset(self, key: chex.PRNGKey) -> Tuple[chex.Array, EnvState]:
+        if self._reset_pool is None:
+            return self._initial_state(key)
+        # pick one of the precomputed initial states and give it fresh PRNG keys, the game's included
+        pool_key, key = jax.random.split(key)
+        index = jax.random.randint(pool_key, (), 0, self.reset_pool_size)
+        state = _rekey(jax.tree.map(lambda x: x[index], self._reset_pool), key)
+        # all frames of a fresh stack are identical, so it is ordered in either mode
+        return state.obs_stack, state
+
+    def _initial_state(self, key: chex.PRNGKey) -> Tuple[chex.Array, AtariState]:
+        """Resets the environment, fires and runs the random no-op start."""
         obs, env_state = self._env.reset(key)
         step = jnp.array(0)
         prev_action = jnp.array(0)
         if self.first_fire:
-            prev_action = Action.FIRE
+            prev_action = jnp.array(Action.FIRE)
             obs, env_state, _, _, _ = self._env.step(env_state, prev_action)
+        if self.noop_max > 0:
+            num_noops = jax.random.randint(jax.random.fold_in(key, 1), (), 0, self.noop_max + 1)
+            obs, env_state = jax.lax.fori_loop(
+                0, num_noops, lambda _, carry: self._env.step(carry[1], Action.NOOP)[:2], (obs, env_state)
+            )
 
         # Create multiple observations directly
         obs = jax.tree.map(lambda x: jnp.stack([x] * self.frame_stack_size), obs)
 
-        return obs, AtariState(env_state, key, step, prev_action, obs)
+        return obs, AtariState(env_state, key, step, prev_action, obs, jnp.array(0))
 
     @functools.partial(jax.jit, static_argnums=(0,))
     def step(self, state: AtariState, action: Union[int, float]) -> Tuple[Tuple[chex.Array, chex.Array], AtariState, float, bool, Dict[Any, Any]]:
+        new_obs, new_state, reward, done, info_dict, _ = self._step(state, action)
+        return new_obs, new_state, reward, done, info_dict
+
+    @functools.partial(jax.jit, static_argnums=(0,))
+    def _step(self, state: AtariState, action: Union[int, float]) -> Tuple[chex.Array, AtariState, float, bool, Dict[Any, Any], EnvState]:
+        """
+        Same as `step`, but additionally returns the env state before the last skipped frame
+        so that the last two frames can be max-pooled. After a reset this is the reset env state.
+        """
         step_key, next_state_key = jax.random.split(state.key)
 
         new_action = action
@@ -81,23 +183,27 @@ class AtariWrapper(JaxatariWrapper):
             repeat_prev_action_mask = jax.random.uniform(step_key, shape=action.shape) < 0.25
             new_action = jnp.where(repeat_prev_action_mask, state.prev_action, action)
 
-        # use scan to step the env for frame_skip times
-        def body_fn(carry, _):
-            env_state, action = carry
-            obs, new_env_state, reward, done, info = self._env.step(env_state, action) 
-            return (new_env_state, action), (obs, reward, done, info)
+        # use scan to step the env for the first frame_skip - 1 frames. Only the env state is carried and
+        # only rewards and dones are collected, so the unused observations are dropped from the loop body.
+        def body_fn(env_state, _):
+            _, new_env_state, reward, done, info = self._env.step(env_state, new_action)
+            return new_env_state, (reward, done, info._asdict().get("all_rewards"))
 
-        (new_env_state, new_action), (obs, rewards, dones, infos) = jax.lax.scan(
+        prev_env_state, (rewards, dones, all_rewards) = jax.lax.scan(
             body_fn,
-            (state.env_state, new_action),
+            state.env_state,
             None,
-            length=self.frame_skip,
+            length=self.frame_skip - 1,
         )
+        # the last frame is stepped outside the scan, its observation and info are the ones returned
+        latest_obs, new_env_state, last_reward, last_done, last_info = self._env.step(prev_env_state, new_action)
+        append_last = lambda xs, x: jnp.concatenate([xs, jnp.expand_dims(jnp.asarray(x, dtype=xs.dtype), axis=0)])
+        rewards = append_last(rewards, last_reward)
+        dones = append_last(dones, last_done)
 
-        # all results are now shaped: (frame_skip, ...)
-        latest_obs = jax.tree.map(lambda x: x[-1], obs)
-        # push latest obs into the stack
-        new_obs_stack = jax.tree.map(lambda stack, obs_leaf: jnp.concatenate([stack[1:], jnp.expand_dims(obs_leaf, axis=0)], axis=0), state.obs_stack, latest_obs)
+        # overwrite the oldest obs in the stack with the latest one
+        new_obs_stack = _push_frame(state.obs_stack, latest_obs, state.stack_index)
+        new_stack_index = (state.stack_index + 1) % self.frame_stack_size
 
         reward = jnp.sum(rewards)
         done = jnp.logical_or(dones.any(), state.step >= self.max_episode_length)
@@ -105,30 +211,28 @@ class AtariWrapper(JaxatariWrapper):
             # If the player has lost a life, we consider the episode done
             done = jnp.logical_or(done, state.env_state.lives > new_env_state.lives)
 
-        def reduce_info(k, v):
-            if k == "all_rewards":
-                return v.sum(axis=0)
-            else:
-                return v[-1]
-
-        # Convert info to dict and reduce values
-        info_dict = {
-            k: reduce_info(k, v) for k, v in infos._asdict().items()
-        }
+        # Convert info to dict, all_rewards are summed over the skipped frames
+        info_dict = last_info._asdict()
+        if all_rewards is not None:
+            info_dict["all_rewards"] = append_last(all_rewards, info_dict["all_rewards"]).sum(axis=0)
 
         # Use jax.lax.cond to correctly handle state and key propagation on reset
         def _reset_fn(_):
             # When done, reset. The new state will contain the properly advanced next_state_key.
-            return self.reset(next_state_key)
+            reset_obs, reset_state = self.reset(next_state_key)
+            return reset_obs, reset_state, reset_state.env_state
 
         def _step_fn(_):
             # When not done, create the next state, passing next_state_key for the *next* step.
-            next_state = AtariState(new_env_state, next_state_key, state.step + 1, new_action, new_obs_stack)
-            return new_obs_stack, next_state
+            next_state = AtariState(new_env_state, next_state_key, state.step + 1, new_action, new_obs_stack, new_stack_index)
+            obs = ordered_stack_view(new_obs_stack, new_stack_index) if self.ordered_stack else new_obs_stack
+            return obs, next_state, prev_env_state
 
-        new_obs, new_state = jax.lax.cond(done, _reset_fn, _step_fn, operand=None)
+        new_obs, new_state, last_prev_env_state = jax.lax.cond(done, _reset_fn, _step_fn, operand=None)
+        if not self.ordered_stack:
+            info_dict["stack_index"] = new_state.stack_index
 
-        return new_obs, new_state, reward, done, info_dict
+        return new_obs, new_state, reward, done, info_dict, last_prev_env_state
 
 class ObjectCentricWrapper(JaxatariWrapper):
     """
@@ -191,225 +295,86 @@ class ObjectCentricWrapper(JaxatariWrapper):
         return flat_obs, state, reward, done, info
     
 
-@struct.dataclass 
-class PixelState:
-    atari_state: AtariState 
-    key: chex.PRNGKey
-    step: int
-    prev_action: int
-    image_stack: chex.Array
-
-class PixelObsWrapper(JaxatariWrapper):
-    """
-    Wrapper for Atari environments that returns the flattened pixel observations.
-    Apply this wrapper after the AtariWrapper!
-    """
-
-    def __init__(self, env):
-        super().__init__(env)
-        # make sure that env is an AtariWrapper
-        assert isinstance(env, AtariWrapper), "PixelObsWrapper has to be applied after AtariWrapper"
-
-        # Calculate observation space once
-        image_space = self._env.image_space()
-        self._observation_space = spaces.stack_space(image_space, self._env.frame_stack_size)
-
-    def observation_space(self) -> spaces.Box:
-        """Returns the stacked image space."""
-        return self._observation_space
-    
-    @functools.partial(jax.jit, static_argnums=(0,))
-    def reset(
-        self, key: chex.PRNGKey
-    ) -> Tuple[chex.Array, EnvState]:
-        obs, atari_state = self._env.reset(key)
-        image = self._env.render(atari_state.env_state)
-        # Create a stack of identical images for the initial state
-        image_stack = jnp.stack([image] * self._env.frame_stack_size)
-        return image_stack, PixelState(atari_state, key, 0, 0, image_stack)
-    
-    @functools.partial(jax.jit, static_argnums=(0,))
-    def step(
-        self,
-        state: PixelState,
-        action: Union[int, float],
-    ) -> Tuple[chex.Array, EnvState, float, bool, Any]:
-        # Pass the AtariState to the AtariWrapper
-        obs, atari_state, reward, done, info = self._env.step(state.atari_state, action)
-        image = self._env.render(atari_state.env_state)
-        # Update the image stack by shifting and adding the new image
-        image_stack = jnp.concatenate([state.image_stack[1:], jnp.expand_dims(image, axis=0)], axis=0)
-        new_state = PixelState(atari_state, state.key, state.step + 1, action, image_stack)
-        return image_stack, new_state, reward, done, info
-    
-
-@struct.dataclass 
-class PixelAndObjectCentricState:
-    atari_state: AtariState 
-    key: chex.PRNGKey
-    step: int
-    prev_action: int
-    image_stack: chex.Array
-    obs_stack: chex.Array
-
-class PixelAndObjectCentricWrapper(JaxatariWrapper):
-    """
-    Wrapper for Atari environments that returns the flattened pixel observations and object-centric observations.
-    Apply this wrapper after the AtariWrapper!
-    """
-    
-    def __init__(self, env):
-        super().__init__(env)
-        assert isinstance(env, AtariWrapper), "PixelAndObjectCentricWrapper must be applied after AtariWrapper"
-        
-        # Part 1: Define the stacked image space. (Correct)
-        stacked_image_space = spaces.stack_space(self._env.image_space(), self._env.frame_stack_size)
-        
-        # Part 2: Define the FLATTENED object space. (This is the FIX)
-        # We borrow the exact same logic from ObjectCentricWrapper to ensure consistency.
-        single_frame_space = self._env._env.observation_space()
-        lows, highs = [], []
-        single_frame_flat_size = 0
-        for leaf_space in jax.tree.leaves(single_frame_space):
-            if isinstance(leaf_space, spaces.Box):
-                low_arr = np.broadcast_to(leaf_space.low, leaf_space.shape)
-                high_arr = np.broadcast_to(leaf_space.high, leaf_space.shape)
-                lows.append(low_arr.flatten())
-                highs.append(high_arr.flatten())
-                single_frame_flat_size += np.prod(leaf_space.shape)
-
-        single_frame_lows = np.concatenate(lows)
-        single_frame_highs = np.concatenate(highs)
-
-        # Create the 2D Box space for the flattened object data.
-        stacked_object_space_flat = spaces.Box(
-            low=single_frame_lows,
-            high=single_frame_highs,
-            shape=(self._env.frame_stack_size, int(single_frame_flat_size)),
-            dtype=single_frame_lows.dtype
-        )
-
-        # Part 3: Combine them into the final Tuple space.
-        self._observation_space = spaces.Tuple((
-            stacked_image_space,
-            stacked_object_space_flat
-        ))
-    
-    
-    def observation_space(self) -> spaces.Tuple:
-        """Returns a Tuple space containing stacked image and object spaces."""
-        return self._observation_space
-    
-    @functools.partial(jax.jit, static_argnums=(0,))
-    def reset(
-        self, key: chex.PRNGKey
-    ) -> Tuple[chex.Array, EnvState]:
-        obs, atari_state = self._env.reset(key)
-
-        # Flatten each frame in the stack
-        flat_obs = jax.vmap(self._env.obs_to_flat_array)(obs)
-
-        image = self._env.render(atari_state.env_state)
-        # Create a stack of identical images for the initial state
-        image_stack = jnp.stack([image] * self._env.frame_stack_size)
-        return (image_stack, flat_obs), PixelAndObjectCentricState(atari_state, key, 0, 0, image_stack, flat_obs)
-    
-    @functools.partial(jax.jit, static_argnums=(0,))
-    def step(
-        self,
-        state: PixelAndObjectCentricState,
-        action: Union[int, float],
-    ) -> Tuple[chex.Array, EnvState, float, bool, Any]:
-        # Pass the AtariState to the AtariWrapper
-        obs, atari_state, reward, done, info = self._env.step(state.atari_state, action)
-
-        # Flatten each observation in the stack
-        flat_obs = jax.vmap(self._env.obs_to_flat_array)(obs)
-
-        image = self._env.render(atari_state.env_state)
-        # Update the image stack by shifting and adding the new image
-        image_stack = jnp.concatenate([state.image_stack[1:], jnp.expand_dims(image, axis=0)], axis=0)
-        new_state = PixelAndObjectCentricState(atari_state, state.key, state.step + 1, action, image_stack, flat_obs)
-        return (image_stack, flat_obs), new_state, reward, done, info
+def _preprocessed_image_space(image_space: spaces.Box, grayscale: bool, resize: Optional[Tuple[int, int]]) -> spaces.Box:
+    """Returns the space of a single frame after grayscale conversion and resizing."""
+    height, width = image_space.shape[:2] if resize is None else resize
+    shape = (height, width) if grayscale else (height, width) + tuple(image_space.shape[2:])
+    return spaces.Box(low=0, high=255, shape=shape, dtype=jnp.uint8)
 
 
-class FlattenObservationWrapper(JaxatariWrapper):
+def _preprocess_image(image: chex.Array, prev_image: Optional[chex.Array], grayscale: bool, resize: Optional[Tuple[int, int]]) -> chex.Array:
     """
-    A wrapper that flattens each leaf array in an observation Pytree.
-
-    Compatible with all the other wrappers, flattens the observations whilst preserving the overarching structure (i.e. if the observation is a tuple of multiple observations, the flattened observation will be a tuple of flattened observations).
+    ALE-style frame preprocessing: converts to grayscale (ITU-R BT.601 luma), takes the
+    pixel-wise maximum with the previous frame if given and resizes to (height, width).
     """
+    def to_gray(frame):
+        luma = jnp.dot(frame[..., :3].astype(jnp.float32), jnp.array([0.299, 0.587, 0.114]))
+        return jnp.round(luma).astype(jnp.uint8)
 
-    def __init__(self, env):
-        super().__init__(env)
-
-        # build the new (flattened) observation space
-        original_space = self._env.observation_space()
-
-        def flatten_space(space: spaces.Box) -> spaces.Box:
-            # Create flattened low/high arrays by broadcasting the original bounds
-            # and then reshaping. This preserves the bounds for each element.
-            flat_low = np.broadcast_to(space.low, space.shape).flatten()
-            flat_high = np.broadcast_to(space.high, space.shape).flatten()
-            
-            return spaces.Box(
-                low=jnp.array(flat_low),
-                high=jnp.array(flat_high),
-                dtype=space.dtype
-            )
-        
-        self._observation_space = jax.tree.map(
-            flatten_space, 
-            original_space,
-            is_leaf=lambda x: isinstance(x, spaces.Box)
-        )
-
-
-    def observation_space(self) -> spaces.Space:
-        """Returns a space where each leaf array is flattened."""
-        return self._observation_space
-
-    def _process_obs(self, obs_tree: chex.ArrayTree) -> chex.ArrayTree:
-        """Applies .flatten() to each leaf array in the pytree."""
-        return jax.tree.map(lambda leaf: leaf.flatten(), obs_tree)
-
-    @functools.partial(jax.jit, static_argnums=(0,))
-    def reset(self, key: chex.PRNGKey) -> Tuple[chex.ArrayTree, Any]:
-        obs, state = self._env.reset(key)
-        processed_obs = self._process_obs(obs)
-        return processed_obs, state # State can be passed through directly
+    if grayscale:
+        image = to_gray(image)
+    if prev_image is not None:
+        image = jnp.maximum(image, to_gray(prev_image) if grayscale else prev_image)
+    if resize is not None:
+        resized = jax.image.resize(image.astype(jnp.float32), tuple(resize) + image.shape[2:], method="linear")
+        image = jnp.clip(jnp.round(resized), 0, 255).astype(jnp.uint8)
+    return image
 
-    @functools.partial(jax.jit, static_argnums=(0,))
-    def step(
-        self,
-        state: Any,
-        action: Union[int, float],
-    ) -> Tuple[chex.ArrayTree, Any, float, bool, Dict[str, Any]]:
-        obs, next_state, reward, done, info = self._env.step(state, action)
-        processed_obs = self._process_obs(obs)
-        return processed_obs, next_state, reward, done, info
 
 @struct.dataclass
 class PixelState:
     # Only store atari_state and the image_stack. Key, step, etc. are in atari_state.
     atari_state: AtariState
-    image_stack: chex.Array
+    image_stack: chex.Array # ring buffer, see ordered_stack_view
+    stack_index: int # position of the oldest frame in image_stack
 
 class PixelObsWrapper(JaxatariWrapper):
     """
     Wrapper for Atari environments that returns the flattened pixel observations.
     Apply this wrapper after the AtariWrapper!
+    Args:
+        env: The AtariWrapper to wrap.
+        indexed: If True, observations are single-channel palette-index frames from `render_indexed`
+            instead of RGB frames. RGB can be recovered with `jr.palette_lookup(obs, env.palette())`.
+            Only games whose renderer draws palette indices natively support it.
+        resize: Optional (height, width) the frames are resized to, e.g. (84, 84).
+        grayscale: If True, frames are converted to single-channel grayscale.
+        max_pool: If True, each frame is the pixel-wise maximum of the last two skipped frames.
+        ordered_stack: If False, the image stack is returned as the raw ring buffer and
+            info["stack_index"] holds the position of the oldest frame (see AtariWrapper).
     """
 
-    def __init__(self, env):
+    def __init__(self, env, indexed: bool = False, resize: Optional[Tuple[int, int]] = None, grayscale: bool = False, max_pool: bool = False, ordered_stack: bool = True):
         super().__init__(env)
         # make sure that env is an AtariWrapper
         assert isinstance(env, AtariWrapper), "PixelObsWrapper has to be applied after AtariWrapper"
+        if indexed and (resize is not None or grayscale or max_pool):
+            raise ValueError("Palette-indexed frames cannot be resized, converted to grayscale or max-pooled.")
+        self.indexed = indexed
+        self.resize = tuple(resize) if resize is not None else None
+        self.grayscale = grayscale
+        self.max_pool = max_pool
+        self.ordered_stack = ordered_stack
 
         # Calculate observation space once
         image_space = self._env.image_space()
+        if self.indexed:
+            image_space = spaces.Box(
+                low=0,
+                high=self._env.palette().shape[0] - 1,
+                shape=image_space.shape[:2],
+                dtype=jnp.uint8
+            )
+        else:
+            image_space = _preprocessed_image_space(image_space, self.grayscale, self.resize)
         self._observation_space = spaces.stack_space(image_space, self._env.frame_stack_size)
 
+    def _render(self, env_state: EnvState, prev_env_state: Optional[EnvState] = None) -> chex.Array:
+        if self.indexed:
+            return self._env.render_indexed(env_state)
+        prev_image = self._env.render(prev_env_state) if prev_env_state is not None else None
+        return _preprocess_image(self._env.render(env_state), prev_image, self.grayscale, self.resize)
+
     def observation_space(self) -> spaces.Box:
         """Returns the stacked image space."""
         return self._observation_space
@@ -420,11 +385,11 @@ class PixelObsWrapper(JaxatariWrapper):
     ) -> Tuple[chex.Array, PixelState]:
         # Get the full initial AtariState
         _, atari_state = self._env.reset(key)
-        image = self._env.render(atari_state.env_state)
+        image = self._render(atari_state.env_state)
         # Create a stack of identical images for the initial state
         image_stack = jnp.stack([image] * self._env.frame_stack_size)
         # Pass the whole atari_state through in the new PixelState
-        return image_stack, PixelState(atari_state, image_stack)
+        return image_stack, PixelState(atari_state, image_stack, jnp.array(0))
 
     @functools.partial(jax.jit, static_argnums=(0,))
     def step(
@@ -433,32 +398,53 @@ class PixelObsWrapper(JaxatariWrapper):
         action: Union[int, float],
     ) -> Tuple[chex.Array, PixelState, float, bool, Any]:
         # Pass the atari_state from the current PixelState to the underlying env
-        _, atari_state, reward, done, info = self._env.step(state.atari_state, action)
-        image = self._env.render(atari_state.env_state)
-        # Update the image stack by shifting and adding the new image
-        image_stack = jnp.concatenate([state.image_stack[1:], jnp.expand_dims(image, axis=0)], axis=0)
+        if self.max_pool:
+            _, atari_state, reward, done, info, prev_env_state = self._env._step(state.atari_state, action)
+        else:
+            _, atari_state, reward, done, info = self._env.step(state.atari_state, action)
+            prev_env_state = None
+        image = self._render(atari_state.env_state, prev_env_state)
+        # Overwrite the oldest image in the stack with the new one
+        image_stack = _push_frame(state.image_stack, image, state.stack_index)
+        stack_index = (state.stack_index + 1) % self._env.frame_stack_size
         # Create the new state with the NEW atari_state. No other args needed.
-        new_state = PixelState(atari_state, image_stack)
-        return image_stack, new_state, reward, done, info
+        new_state = PixelState(atari_state, image_stack, stack_index)
+        if not self.ordered_stack:
+            info["stack_index"] = stack_index
+            return image_stack, new_state, reward, done, info
+        return ordered_stack_view(image_stack, stack_index), new_state, reward, done, info
     
 
 @struct.dataclass
 class PixelAndObjectCentricState:
     atari_state: AtariState
-    image_stack: chex.Array
-    obs_stack: chex.Array # contains the object-centric stack
+    image_stack: chex.Array # ring buffer, see ordered_stack_view
+    obs_stack: chex.Array # contains the object-centric stack, ordered like atari_state.obs_stack
+    stack_index: int # position of the oldest frame in image_stack
 
 class PixelAndObjectCentricWrapper(JaxatariWrapper):
     """
     Wrapper for Atari environments that returns the flattened pixel observations and object-centric observations.
     Apply this wrapper after the AtariWrapper!
+    Args:
+        env: The AtariWrapper to wrap.
+        resize: Optional (height, width) the frames are resized to, e.g. (84, 84).
+        grayscale: If True, frames are converted to single-channel grayscale.
+        max_pool: If True, each frame is the pixel-wise maximum of the last two skipped frames.
+        ordered_stack: If False, both stacks are returned as raw ring buffers and info["stack_index"]
+            holds the (image, object) positions of their oldest frames (see AtariWrapper).
     """
     
-    def __init__(self, env):
+    def __init__(self, env, resize: Optional[Tuple[int, int]] = None, grayscale: bool = False, max_pool: bool = False, ordered_stack: bool = True):
         super().__init__(env)
         assert isinstance(env, AtariWrapper), "PixelAndObjectCentricWrapper must be applied after AtariWrapper"
+        self.resize = tuple(resize) if resize is not None else None
+        self.grayscale = grayscale
+        self.max_pool = max_pool
+        self.ordered_stack = ordered_stack
         # Create the 2D Box space for the image data.
-        stacked_image_space = spaces.stack_space(self._env.image_space(), self._env.frame_stack_size)
+        image_space = _preprocessed_image_space(self._env.image_space(), self.grayscale, self.resize)
+        stacked_image_space = spaces.stack_space(image_space, self._env.frame_stack_size)
 
         # Calculate the bounds and size for a single flattened frame.
         single_frame_space = self._env._env.observation_space()
@@ -492,6 +478,10 @@ class PixelAndObjectCentricWrapper(JaxatariWrapper):
     def observation_space(self) -> spaces.Tuple:
         """Returns a Tuple space containing stacked image and object spaces."""
         return self._observation_space
+
+    def _render(self, env_state: EnvState, prev_env_state: Optional[EnvState] = None) -> chex.Array:
+        prev_image = self._env.render(prev_env_state) if prev_env_state is not None else None
+        return _preprocess_image(self._env.render(env_state), prev_image, self.grayscale, self.resize)
     
     @functools.partial(jax.jit, static_argnums=(0,))
     def reset(
@@ -503,12 +493,12 @@ class PixelAndObjectCentricWrapper(JaxatariWrapper):
         # Flatten each frame in the stack for the object-centric part
         flat_obs = jax.vmap(self._env.obs_to_flat_array)(obs_stack)
 
-        image = self._env.render(atari_state.env_state)
+        image = self._render(atari_state.env_state)
         # Create a stack of identical images for the initial state
         image_stack = jnp.stack([image] * self._env.frame_stack_size)
 
         # Create the new state
-        new_state = PixelAndObjectCentricState(atari_state, image_stack, flat_obs)
+        new_state = PixelAndObjectCentricState(atari_state, image_stack, flat_obs, jnp.array(0))
         return (image_stack, flat_obs), new_state
 
     @functools.partial(jax.jit, static_argnums=(0,))
@@ -518,18 +508,27 @@ class PixelAndObjectCentricWrapper(JaxatariWrapper):
         action: Union[int, float],
     ) -> Tuple[Tuple[chex.Array, chex.Array], PixelAndObjectCentricState, float, bool, Any]:
         # Pass the atari_state from the current state object
-        obs_stack, atari_state, reward, done, info = self._env.step(state.atari_state, action)
-
-        # Flatten each observation in the stack
-        flat_obs = jax.vmap(self._env.obs_to_flat_array)(obs_stack)
-
-        image = self._env.render(atari_state.env_state)
-        # Update the image stack by shifting and adding the new image
-        image_stack = jnp.concatenate([state.image_stack[1:], jnp.expand_dims(image, axis=0)], axis=0)
+        if self.max_pool:
+            _, atari_state, reward, done, info, prev_env_state = self._env._step(state.atari_state, action)
+        else:
+            _, atari_state, reward, done, info = self._env.step(state.atari_state, action)
+            prev_env_state = None
+
+        # Flatten each observation in the (unordered) object stack
+        flat_obs = jax.vmap(self._env.obs_to_flat_array)(atari_state.obs_stack)
+
+        image = self._render(atari_state.env_state, prev_env_state)
+        # Overwrite the oldest image in the stack with the new one
+        image_stack = _push_frame(state.image_stack, image, state.stack_index)
+        stack_index = (state.stack_index + 1) % self._env.frame_stack_size
         
         # Create new state using the new atari_state from the step
-        new_state = PixelAndObjectCentricState(atari_state, image_stack, flat_obs)
-        return (image_stack, flat_obs), new_state, reward, done, info
+        new_state = PixelAndObjectCentricState(atari_state, image_stack, flat_obs, stack_index)
+        if not self.ordered_stack:
+            info["stack_index"] = (stack_index, atari_state.stack_index)
+            return (image_stack, flat_obs), new_state, reward, done, info
+        obs = (ordered_stack_view(image_stack, stack_index), ordered_stack_view(flat_obs, atari_state.stack_index))
+        return obs, new_state, reward, done, info
 
 
 class FlattenObservationWrapper(JaxatariWrapper):
@@ -680,4 +679,176 @@ class MultiRewardLogWrapper(JaxatariWrapper):
             info[f"returned_episode_returns_{i}"] = state.returned_episode_returns[i]
         info["returned_episode_lengths"] = state.returned_episode_lengths
         info["returned_episode"] = done
-        return obs, state, reward, done, info
\ No newline at end of file
+        return obs, state, reward, done, info
+
+
+def _find_atari_wrapper(env) -> Optional[AtariWrapper]:
+    """Returns the AtariWrapper in the wrapper stack, which already resets finished episodes, or None."""
+    while env is not None:
+        if isinstance(env, AtariWrapper):
+            return env
+        env = getattr(env, "_env", None)
+    return None
+
+
+def _select_done(done: chex.Array, on_done: chex.ArrayTree, otherwise: chex.ArrayTree) -> chex.ArrayTree:
+    """Per environment, picks the leaves of `on_done` where done is set and those of `otherwise` elsewhere."""
+    def select(a, b):
+        return jnp.where(done.reshape(done.shape + (1,) * (b.ndim - done.ndim)), a, b)
+
+    return jax.tree.map(select, on_done, otherwise)
+
+
+def _with_reset_pool(env, reset_pool_size: int, reset_pool_seed: int):
+    """Returns a copy of the wrapper stack whose copied AtariWrapper draws its resets from a new pool."""
+    # copied by hand, copy.copy would look up __setstate__ through __getattr__ before _env is set
+    copied = object.__new__(type(env))
+    copied.__dict__.update(env.__dict__)
+    env = copied
+    if isinstance(env, AtariWrapper):
+        env._build_reset_pool(reset_pool_size, reset_pool_seed)
+    else:
+        env._env = _with_reset_pool(env._env, reset_pool_size, reset_pool_seed)
+    return env
+
+
+@struct.dataclass
+class VecEnvState:
+    env_state: Any # batched state of the wrapped environment
+    # the fields below are only used for auto-reset and None for stacks that reset themselves
+    initial_obs: chex.ArrayTree # cached reset observations, one per environment
+    initial_state: Any # cached reset states, one per environment
+    key: chex.PRNGKey # one per environment, split on every step to re-key the cached reset states
+
+class VecEnv(JaxatariWrapper):
+    """
+    Runs num_envs copies of an environment in parallel with batched reset and step.
+    Finished environments are reset to the initial state cached by `reset` with fresh PRNG keys,
+    selected with `jnp.where`, so the reset is not evaluated for the whole batch on every step.
+    Stacks containing an AtariWrapper already reset themselves and are only vectorized. Since its
+    `lax.cond` then evaluates the reset on every step, a stack whose AtariWrapper has no reset pool
+    is copied and the copy's AtariWrapper gets one, the passed stack is left unchanged.
+    Apply this wrapper last!
+    Args:
+        env: The environment to vectorize.
+        num_envs: The number of parallel environments.
+        reset_pool_size: The reset_pool_size of the copied AtariWrapper if the stack's has no reset pool.
+        reset_pool_seed: The seed of that reset pool.
+    """
+
+    def __init__(self, env, num_envs: int, reset_pool_size: int = 64, reset_pool_seed: int = 0):
+        atari_wrapper = _find_atari_wrapper(env)
+        if atari_wrapper is not None and atari_wrapper.reset_pool_size == 0:
+            env = _with_reset_pool(env, reset_pool_size, reset_pool_seed)
+        super().__init__(env)
+        self.num_envs = num_envs
+        self.auto_reset = atari_wrapper is None
+        self._observation_space = spaces.batch_space(self._env.observation_space(), num_envs)
+        self._action_space = spaces.batch_space(self._env.action_space(), num_envs)
+
+    def observation_space(self) -> spaces.Space:
+        """Returns the observation space with a leading num_envs dimension."""
+        return self._observation_space
+
+    def action_space(self) -> spaces.Box:
+        """Returns the action space with a leading num_envs dimension."""
+        return self._action_space
+
+    @functools.partial(jax.jit, static_argnums=(0,))
+    def reset(self, key: chex.PRNGKey) -> Tuple[chex.ArrayTree, VecEnvState]:
+        return self._reset_batch(jax.random.split(key, self.num_envs))
+
+    def _reset_batch(self, keys: chex.PRNGKey) -> Tuple[chex.ArrayTree, VecEnvState]:
+        """Resets one environment per key and caches the initial states for auto-reset."""
+        obs, env_state = jax.vmap(self._env.reset)(keys)
+        if not self.auto_reset:
+            return obs, VecEnvState(env_state, None, None, None)
+        rekey_keys = jax.vmap(lambda key: jax.random.fold_in(key, 1))(keys)
+        return obs, VecEnvState(env_state, obs, env_state, rekey_keys)
+
+    @functools.partial(jax.jit, static_argnums=(0,))
+    def step(
+        self,
+        state: VecEnvState,
+        action: chex.Array,
+    ) -> Tuple[chex.ArrayTree, VecEnvState, chex.Array, chex.Array, Dict[Any, Any]]:
+        obs, env_state, reward, done, info = jax.vmap(self._env.step)(state.env_state, action)
+        if self.auto_reset:
+            # the cached reset states are re-keyed, otherwise every episode would replay the same random stream
+            keys, rekey_keys = jnp.moveaxis(jax.vmap(jax.random.split)(state.key), 1, 0)
+            initial_state = jax.vmap(_rekey)(state.initial_state, rekey_keys)
+            obs = _select_done(done, state.initial_obs, obs)
+            env_state = _select_done(done, initial_state, env_state)
+            state = state.replace(key=keys)
+        return obs, state.replace(env_state=env_state), reward, done, info
+
+
+class ShardedVecEnv(VecEnv):
+    """
+    VecEnv that splits the batch of environments evenly across devices with a 1D `Mesh` over the axis "envs".
+    Every device resets, steps and auto-resets only its own environments, so no data moves between devices.
+    All arrays are sharded along their leading num_envs axis with `self.sharding`.
+    On CPU, XLA_FLAGS=--xla_force_host_platform_device_count=N simulates N devices.
+    Apply this wrapper last!
+    Args:
+        env: The environment to vectorize.
+        num_envs: The total number of parallel environments, a multiple of the number of devices.
+        devices: The devices to shard over, all local devices by default.
+    """
+
+    def __init__(self, env, num_envs: int, devices: Optional[Sequence[jax.Device]] = None, reset_pool_size: int = 64, reset_pool_seed: int = 0):
+        super().__init__(env, num_envs, reset_pool_size, reset_pool_seed)
+        devices = list(devices) if devices is not None else jax.local_devices()
+        if num_envs % len(devices) != 0:
+            raise ValueError(f"num_envs ({num_envs}) must be a multiple of the number of devices ({len(devices)})")
+        self.num_devices = len(devices)
+        self.mesh = Mesh(np.asarray(devices), ("envs",))
+        self.sharding = NamedSharding(self.mesh, P("envs"))
+        # the environments of a single device
+        # self._env already has a reset pool if it needs one
+        self._local_env = VecEnv(self._env, num_envs // self.num_devices)
+
+    def _shard(self, fn, in_specs, out_specs):
+        return shard_map(fn, mesh=self.mesh, in_specs=in_specs, out_specs=out_specs, check_rep=False)
+
+    @functools.partial(jax.jit, static_argnums=(0,))
+    def reset(self, key: chex.PRNGKey) -> Tuple[chex.ArrayTree, VecEnvState]:
+        keys = jax.random.split(key, self.num_envs)
+        return self._shard(self._local_env._reset_batch, P("envs"), P("envs"))(keys)
+
+    @functools.partial(jax.jit, static_argnums=(0,))
+    def step(
+        self,
+        state: VecEnvState,
+        action: chex.Array,
+    ) -> Tuple[chex.ArrayTree, VecEnvState, chex.Array, chex.Array, Dict[Any, Any]]:
+        return self._shard(self._local_env.step, (P("envs"), P("envs")), P("envs"))(state, action)
+
+    def rollout(
+        self,
+        state: VecEnvState,
+        policy_fn: Callable,
+        policy_params: Any,
+        key: chex.PRNGKey,
+        num_steps: int,
+        obs: chex.ArrayTree = None,
+        fields: Sequence[str] = Trajectory._fields,
+    ) -> Tuple[chex.ArrayTree, VecEnvState, Trajectory]:
+        """
+        Runs an independent rollout of num_steps steps on every device, see `jaxatari.environment.rollout`.
+        policy_fn sees the observations of one device's environments and gets a per-device key,
+        policy_params are replicated. The trajectory fields are shaped (num_steps, num_envs, ...).
+        """
+        if obs is None:
+            raise ValueError("Wrapped environments need the observation returned by reset or step as obs")
+        return self._sharded_rollout(state, policy_fn, policy_params, key, num_steps, obs, tuple(fields))
+
+    @functools.partial(jax.jit, static_argnums=(0, 2, 5, 7))
+    def _sharded_rollout(self, state, policy_fn, policy_params, key, num_steps, obs, fields):
+        def local_rollout(state, obs, policy_params, key):
+            key = jax.random.fold_in(key, jax.lax.axis_index("envs"))
+            return rollout(self._local_env, state, policy_fn, policy_params, key, num_steps, obs, fields)
+
+        time_major = P(None, "envs")
+        out_specs = (P("envs"), P("envs"), Trajectory(*[time_major] * len(Trajectory._fields)))
+        return self._shard(local_rollout, (P("envs"), P("envs"), P(), P()), out_specs)(state, obs, policy_params, key)
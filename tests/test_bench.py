@@ -0,0 +1,59 @@
+import csv
+import json
+import os
+
+import jax
+import pytest
+
+from jaxatari.bench import hlo, startup, throughput
+
+
+def test_startup_benchmark(tmp_path):
+    output = tmp_path / "startup.json"
+    results = startup.main(["pong", "--output", str(output)])
+
+    assert json.loads(output.read_text()) == results
+    phases = results["games"]["pong"]
+    assert set(phases) == set(startup.PHASES) | {"total"}
+    assert all(seconds >= 0 for seconds in phases.values())
+    assert abs(phases["total"] - sum(phases[phase] for phase in startup.PHASES)) < 1e-9
+    assert "pong" in startup.format_table(results)
+
+
+def test_throughput_benchmark(tmp_path):
+    results = throughput.run_throughput_benchmark(
+        ["pong"], stacks=["raw", "pixel"], batch_sizes=[2], num_steps=3, repeats=1
+    )
+    rows = results["rows"]
+    # pixel observations are rendered anyway, so that stack is only measured once
+    assert [(row["stack"], row["render"]) for row in rows] == [("raw", False), ("raw", True), ("pixel", True)]
+    for row in rows:
+        assert row["error"] is None
+        assert row["steps_per_second"] > 0 and row["compile_seconds"] > 0
+    assert rows[2]["frames_per_second"] == 4 * rows[2]["steps_per_second"]
+
+    throughput.write_csv(results, str(tmp_path / "throughput.csv"))
+    with open(tmp_path / "throughput.csv") as f:
+        assert len(list(csv.DictReader(f))) == 3
+
+
+def test_hlo_report_within_baseline():
+    """Update the baseline with `python -m jaxatari.bench.hlo --update tests/hlo_baseline.json` when HLO grows on purpose."""
+    with open(os.path.join(os.path.dirname(__file__), "hlo_baseline.json")) as f:
+        baseline = json.load(f)
+    if (baseline["jax"], baseline["backend"]) != (jax.__version__, jax.default_backend()):
+        pytest.skip("the baseline was made with another JAX version or backend")
+
+    report = hlo.run_hlo_report()
+    assert set(baseline["games"]) <= set(report["games"])
+    for functions in report["games"].values():
+        assert set(functions) == set(hlo.FUNCTIONS)
+        assert all(functions["step"][metric] is not None for metric in hlo.METRICS)
+    assert hlo.check(report, baseline) == []
+
+    grown = json.loads(json.dumps(baseline))
+    grown["games"]["pong"]["step"]["conditionals"] -= 5
+    assert hlo.check(report, grown) == [
+        f"pong.step: conditionals grew from {grown['games']['pong']['step']['conditionals']} "
+        f"to {report['games']['pong']['step']['conditionals']}"
+    ]
@@ -1,4 +1,8 @@
 import collections
+import os
+import subprocess
+import sys
+import textwrap
 import jax
 import jax.numpy as jnp
 import pytest
@@ -11,9 +15,13 @@ from jaxatari.wrappers import (
     PixelAndObjectCentricWrapper,
     LogWrapper,
     MultiRewardLogWrapper, 
-    FlattenObservationWrapper
+    FlattenObservationWrapper,
+    VecEnv,
+    ShardedVecEnv,
+    ordered_stack_view
 )
 import jaxatari.spaces as spaces
+import jaxatari.rendering.jax_rendering_utils as jr
 import numpy as np
 
 
@@ -44,6 +52,227 @@ def test_base_jaxatari():
     assert info is not None
 
 
+def test_make_cache():
+    """Test that make returns cached instances for equal configurations."""
+    from jaxatari.games.jax_pong import PongConstants
+
+    env = jaxatari.make("pong")
+    assert jaxatari.make("pong") is env
+    # constants are compared by value, including their array fields
+    custom = jaxatari.make("pong", consts=PongConstants(MAX_SPEED=8, BALL_SPEED=jnp.array([-2, 2])))
+    assert custom is not env
+    assert custom.consts.MAX_SPEED == 8
+    assert jaxatari.make("pong", consts=PongConstants(MAX_SPEED=8, BALL_SPEED=jnp.array([-2, 2]))) is custom
+    assert jaxatari.make("pong", consts=PongConstants(MAX_SPEED=8, BALL_SPEED=jnp.array([-2, 3]))) is not custom
+    assert jaxatari.make("pong", consts=PongConstants()) is not custom
+    assert jaxatari.make("pong", cache=False) is not env
+
+    jaxatari.clear_cache()
+    assert jaxatari.make("pong") is not env
+
+
+
+def test_env_equality_by_value():
+    """Test that uncached environments with equal constants share their compiled functions."""
+    from jaxatari.games.jax_pong import JaxPong, PongConstants
+
+    env, same = JaxPong(), jaxatari.make("pong", cache=False)
+    assert env == same and hash(env) == hash(same)
+    assert env != JaxPong(PongConstants(MAX_SPEED=8))
+    _, state = env.reset(jax.random.PRNGKey(0))
+    env.step(state, 0)
+    cache_size = type(env).step._cache_size()
+    same.step(state, 0)
+    assert type(env).step._cache_size() == cache_size
+
+    # changing an attribute changes the key
+    same.consts = PongConstants(MAX_SPEED=8)
+    assert env != same
+
+
+def test_mod_does_not_leak_into_make_cache():
+    """Test that a mod applied to a cached env leaves later make calls unmodded."""
+    from jaxatari.core import load_mod
+
+    jaxatari.clear_cache()
+    env = jaxatari.make("breakout")
+    sizes = (env.consts.PLAYER_SIZE, env.consts.PLAYER_SIZE_SMALL)
+    modded = load_mod("breakout", "SpeedMode")(jaxatari.make("breakout"))
+    big = load_mod("breakout", "BigPaddle")(jaxatari.make("breakout"))
+    assert "get_ball_velocity" in vars(modded._env)
+    assert big.consts.PLAYER_SIZE == (40, 4)
+
+    again = jaxatari.make("breakout")
+    assert again is env
+    assert "get_ball_velocity" not in vars(again)
+    assert (again.consts.PLAYER_SIZE, again.consts.PLAYER_SIZE_SMALL) == sizes
+
+REGISTRY_SCRIPT = textwrap.dedent("""
+    import sys
+    sys.path.insert(0, sys.argv[1])
+    import jaxatari
+    from jaxatari.core import list_available_mods, load_mod
+
+    games = jaxatari.list_available_games()
+    assert [m for m in sys.modules if m.startswith("jaxatari.games") or m.startswith("myplugin")] == []
+    assert "phoenix" in games and "mypong" in games
+    assert "FastEnemy" in list_available_mods("mypong")
+    env = jaxatari.make("mypong")
+    assert type(env).__name__ == "MyPong"
+    assert load_mod("mypong", "FastEnemy")(env)._env is env
+    print("ok")
+""")
+
+PLUGIN_MODULE = textwrap.dedent("""
+    from jaxatari.games.jax_pong import JaxPong
+    from jaxatari.wrappers import JaxatariWrapper
+
+    class MyPong(JaxPong):
+        pass
+
+    class FastEnemy(JaxatariWrapper):
+        pass
+""")
+
+
+def test_registry_and_entry_points(tmp_path):
+    """Test that games are listed without importing them and that plugins register games and mods."""
+    (tmp_path / "myplugin.py").write_text(PLUGIN_MODULE)
+    dist_info = tmp_path / "myplugin-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text("Metadata-Version: 2.1\nName: myplugin\nVersion: 1.0\n")
+    (dist_info / "entry_points.txt").write_text(
+        "[jaxatari.games]\nmypong = myplugin:MyPong\n\n[jaxatari.mods]\nmypong.FastEnemy = myplugin:FastEnemy\n"
+    )
+    result = subprocess.run([sys.executable, "-c", REGISTRY_SCRIPT, str(tmp_path)], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == "ok"
+
+
+def test_register_game():
+    from jaxatari.core import GAME_REGISTRY, get_env_class, register_game
+    from jaxatari.games.jax_pong import JaxPong
+
+    with pytest.raises(ValueError):
+        register_game("pong", "jaxatari.games.jax_pong:JaxPong")
+    with pytest.raises(NotImplementedError):
+        jaxatari.make("no_such_game")
+    register_game("pong_copy", "jaxatari.games.jax_pong:JaxPong")
+    try:
+        assert get_env_class("pong_copy") is JaxPong
+        assert isinstance(jaxatari.make("pong_copy"), JaxPong)
+    finally:
+        del GAME_REGISTRY["pong_copy"]
+        jaxatari.clear_cache()
+
+
+HEADLESS_SCRIPT = textwrap.dedent("""
+    import jax
+    import jaxatari
+    import jaxatari.rendering.jax_rendering_utils as jr
+
+    def no_sprites(path):
+        raise AssertionError(f"loaded {path}")
+
+    jr.loadFrame = no_sprites
+    for game in jaxatari.list_available_games():
+        env = jaxatari.make(game, render=False)
+        obs, state = env.reset(jax.random.PRNGKey(0))
+        env.step(state, 0)
+        try:
+            env.render(state)
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError(f"{game} rendered without a renderer")
+    print("ok")
+""")
+
+
+def test_headless_make():
+    """Test that importing, resetting and stepping games loads no sprites and headless envs cannot render."""
+    result = subprocess.run([sys.executable, "-c", HEADLESS_SCRIPT], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == "ok"
+
+
+def test_renderer_created_on_first_render():
+    env = jaxatari.make("pong", cache=False)
+    assert env._renderer is None
+    _, state = env.reset(jax.random.PRNGKey(0))
+    assert env.render(state).shape == (210, 160, 3)
+    assert env._renderer is not None
+    assert jaxatari.make("pong", render=False) is not jaxatari.make("pong")
+
+
+PRECOMPILE_SCRIPT = textwrap.dedent("""
+    import sys
+    import jax
+    import jax.numpy as jnp
+    import jaxatari
+    from jaxatari.compilation import cache_stats, precompile
+    from jaxatari.wrappers import AtariWrapper, ObjectCentricWrapper, VecEnv
+
+    env = ObjectCentricWrapper(AtariWrapper(jaxatari.make("pong", compile_cache_dir=sys.argv[1])))
+    compiled, stats = precompile(env, batch_size=2)
+    obs, state = compiled["reset"](jax.random.PRNGKey(0))
+    assert obs.shape[0] == 2
+    # a VecEnv of the same stack dispatches the precompiled executables
+    vec_env = VecEnv(env, 2)
+    obs, state = vec_env.reset(jax.random.PRNGKey(0))
+    before = cache_stats()
+    jax.block_until_ready(vec_env.step(state, jnp.zeros(2, dtype=jnp.int32)))
+    assert cache_stats() - before == (1, 1)
+    print(" ".join(f"{name}:{s.hits}:{s.misses}" for name, s in sorted(stats.items())))
+""")
+
+
+PLAIN_STEP_SCRIPT = textwrap.dedent("""
+    import sys
+    import jax
+    import jax.numpy as jnp
+    import jaxatari
+    from jaxatari.compilation import cache_stats, precompile
+
+    env = jaxatari.make("pong", compile_cache_dir=sys.argv[1])
+    obs, state = env.reset(jax.random.PRNGKey(0))
+    if sys.argv[2] == "precompile":
+        compiled, stats = precompile(env)
+        print(stats["step"].hits, stats["step"].misses)
+    else:
+        before = cache_stats()
+        jax.block_until_ready(env.step(state, jnp.int32(0)))
+        stats = cache_stats() - before
+        print(stats.hits, stats.misses)
+""")
+
+
+def test_precompile_serves_plain_step(tmp_path):
+    """Test that a plain env.step in a second process loads the executable precompile stored."""
+    def run(mode):
+        result = subprocess.run(
+            [sys.executable, "-c", PLAIN_STEP_SCRIPT, str(tmp_path), mode], capture_output=True, text=True
+        )
+        assert result.returncode == 0, result.stderr
+        return result.stdout.strip().splitlines()[-1]
+
+    assert run("precompile") == "0 1"
+    assert run("step") == "1 0"
+
+
+def test_precompile_with_persistent_cache(tmp_path):
+    """Test that a second process loads the precompiled functions from the persistent cache."""
+    def run():
+        result = subprocess.run(
+            [sys.executable, "-c", PRECOMPILE_SCRIPT, str(tmp_path)], capture_output=True, text=True
+        )
+        assert result.returncode == 0, result.stderr
+        return result.stdout.strip().splitlines()[-1]
+
+    assert run() == "render:0:1 reset:0:1 step:0:1"
+    assert run() == "render:1:0 reset:1:0 step:1:0"
+
+
 def test_atari_wrapper():
     """Test the AtariWrapper."""
     base_env = jaxatari.make("pong")
@@ -72,6 +301,66 @@ def test_atari_wrapper():
     assert isinstance(done, (bool, jnp.ndarray))
     assert info is not None
 
+@pytest.mark.parametrize("frame_skip", [1, 4])
+def test_atari_wrapper_frame_skip_matches_base_env(frame_skip):
+    """Test that a skipped step sums the rewards of the base env steps and returns the last observation."""
+    key = jax.random.PRNGKey(0)
+    base_env = jaxatari.make("pong")
+    env = AtariWrapper(base_env, sticky_actions=False, frame_skip=frame_skip, first_fire=False, episodic_life=False)
+    _, state = env.reset(key)
+    env_state = state.env_state
+    for i in range(40):
+        action = jnp.array(i % 6)
+        obs, state, reward, done, info = env.step(state, action)
+        expected_reward, expected_all_rewards = 0.0, 0.0
+        for _ in range(frame_skip):
+            base_obs, env_state, base_reward, _, base_info = base_env.step(env_state, action)
+            expected_reward += base_reward
+            expected_all_rewards += base_info.all_rewards
+        assert reward == expected_reward
+        assert jnp.array_equal(info["all_rewards"], expected_all_rewards)
+        assert jax.tree.all(jax.tree.map(lambda x, y: jnp.array_equal(x[-1], y), obs, base_obs))
+        if done:
+            env_state = state.env_state
+
+def test_atari_wrapper_reset_pool():
+    """Test that resets, including the automatic ones in step, draw from the precomputed pool."""
+    key = jax.random.PRNGKey(0)
+    pool_size = 8
+    # max_episode_length=0 ends every episode after one step
+    env = AtariWrapper(jaxatari.make("pong"), noop_max=30, reset_pool_size=pool_size, max_episode_length=0)
+    pool = env._reset_pool
+    # the no-op starts make the pooled states differ
+    assert len(set(pool.env_state.step_counter.tolist())) > 1
+
+    def pool_index(state):
+        matches = [
+            jax.tree.all(jax.tree.map(lambda x, y: jnp.array_equal(x[i], y), pool.env_state, state.env_state))
+            for i in range(pool_size)
+        ]
+        return matches.index(True) if any(matches) else None
+
+    obs, state = env.reset(key)
+    assert pool_index(state) is not None
+    assert jax.tree.all(jax.tree.map(jnp.array_equal, obs, state.obs_stack))
+
+    keys = set()
+    for _ in range(5):
+        obs, state, reward, done, info = env.step(state, 0)
+        assert done
+        assert state.step == 0
+        assert pool_index(state) is not None
+        keys.add(tuple(state.key.tolist()))
+    # the pooled states keep drawing fresh keys
+    assert len(keys) == 5
+
+    # the game's own PRNG keys are replaced as well, so the pool does not limit the random streams
+    env = AtariWrapper(jaxatari.make("seaquest"), reset_pool_size=1)
+    _, first = env.reset(jax.random.PRNGKey(1))
+    _, second = env.reset(jax.random.PRNGKey(2))
+    assert not jnp.array_equal(first.env_state.rng_key, second.env_state.rng_key)
+    assert not jnp.array_equal(first.env_state.rng_key, env._reset_pool.env_state.rng_key[0])
+
 def test_obs_to_flat_array_with_stacked_observations():
     """Test that obs_to_flat_array works correctly with stacked observations."""
     key = jax.random.PRNGKey(0)
@@ -127,6 +416,227 @@ def test_pixel_obs_wrapper_with_stacked_frames():
     # Verify that frames are in the correct range (0-255 for uint8)
     assert jnp.all(obs >= 0) and jnp.all(obs <= 255), "Pixel values should be in range [0, 255]"
 
+@pytest.mark.parametrize("game_name", ["pong", "seaquest", "kangaroo", "phoenix"])
+def test_pixel_obs_wrapper_indexed(game_name):
+    """Test that PixelObsWrapper returns palette-index frames that map back to the RGB frames."""
+    key = jax.random.PRNGKey(0)
+    rgb_env = PixelObsWrapper(AtariWrapper(jaxatari.make(game_name)))
+    env = PixelObsWrapper(AtariWrapper(jaxatari.make(game_name)), indexed=True)
+    palette = env.palette()
+
+    obs, state = env.reset(key)
+    rgb_obs, rgb_state = rgb_env.reset(key)
+    expected_shape = (env.frame_stack_size, 210, 160)
+    assert obs.shape == expected_shape
+    assert obs.dtype == jnp.uint8
+    assert env.observation_space().shape == expected_shape
+    assert env.observation_space().contains(obs)
+
+    for _ in range(20):
+        obs, state, reward, done, info = env.step(state, 3)
+        rgb_obs, rgb_state, reward, done, info = rgb_env.step(rgb_state, 3)
+    assert jnp.array_equal(jr.palette_lookup(obs, palette), rgb_obs)
+
+def test_pixel_wrappers_preprocessing():
+    """Test resizing, grayscale conversion and max-pooling in the pixel wrappers."""
+    key = jax.random.PRNGKey(0)
+    base_env = jaxatari.make("pong")
+
+    env = PixelObsWrapper(AtariWrapper(base_env), resize=(84, 84), grayscale=True, max_pool=True)
+    obs, state = env.reset(key)
+    assert obs.shape == (env.frame_stack_size, 84, 84)
+    assert obs.dtype == jnp.uint8
+    assert env.observation_space().shape == (env.frame_stack_size, 84, 84)
+    obs, state, reward, done, info = env.step(state, 0)
+    assert env.observation_space().contains(obs)
+
+    env = PixelAndObjectCentricWrapper(AtariWrapper(base_env), resize=(105, 80))
+    (image_obs, object_obs), state = env.reset(key)
+    assert image_obs.shape == (env.frame_stack_size, 105, 80, 3)
+    assert env.observation_space().spaces[0].shape == image_obs.shape
+    (image_obs, object_obs), state, reward, done, info = env.step(state, 0)
+    assert env.observation_space().contains((image_obs, object_obs))
+
+    # max-pooled frames are the pixel-wise maximum of the last two frames, so never darker
+    plain_env = PixelObsWrapper(AtariWrapper(base_env, sticky_actions=False), grayscale=True)
+    pooled_env = PixelObsWrapper(AtariWrapper(base_env, sticky_actions=False), grayscale=True, max_pool=True)
+    _, plain_state = plain_env.reset(key)
+    _, pooled_state = pooled_env.reset(key)
+    for _ in range(30):
+        plain_obs, plain_state, _, _, _ = plain_env.step(plain_state, 3)
+        pooled_obs, pooled_state, _, _, _ = pooled_env.step(pooled_state, 3)
+        assert jnp.all(pooled_obs[-1] >= plain_obs[-1])
+
+    with pytest.raises(ValueError):
+        PixelObsWrapper(AtariWrapper(base_env), indexed=True, grayscale=True)
+
+def test_ring_buffer_frame_stack():
+    """Test that the ring-buffer stacks match shifting stacks and that the raw buffers can be ordered."""
+    key = jax.random.PRNGKey(0)
+    base_env = jaxatari.make("pong")
+    env = PixelAndObjectCentricWrapper(AtariWrapper(base_env))
+    ring_env = PixelAndObjectCentricWrapper(AtariWrapper(base_env, ordered_stack=False), ordered_stack=False)
+    atari_env = AtariWrapper(base_env)
+    ring_atari_env = AtariWrapper(base_env, ordered_stack=False)
+
+    (image_obs, _), state = env.reset(key)
+    _, ring_state = ring_env.reset(key)
+    _, atari_state = atari_env.reset(key)
+    _, ring_atari_state = ring_atari_env.reset(key)
+    expected_images = image_obs
+    for i in range(10):
+        (image_obs, object_obs), state, _, _, _ = env.step(state, i % 6)
+        (ring_images, ring_objects), ring_state, _, _, info = ring_env.step(ring_state, i % 6)
+        atari_obs, atari_state, _, _, _ = atari_env.step(atari_state, i % 6)
+        ring_atari_obs, ring_atari_state, _, _, atari_info = ring_atari_env.step(ring_atari_state, i % 6)
+
+        expected_images = jnp.concatenate([expected_images[1:], image_obs[-1:]], axis=0)
+        assert jnp.array_equal(image_obs, expected_images)
+        image_index, object_index = info["stack_index"]
+        assert jnp.array_equal(ordered_stack_view(ring_images, image_index), image_obs)
+        assert jnp.array_equal(ordered_stack_view(ring_objects, object_index), object_obs)
+        assert jax.tree.all(jax.tree.map(
+            jnp.array_equal, ordered_stack_view(ring_atari_obs, atari_info["stack_index"]), atari_obs
+        ))
+
+def test_vec_env():
+    """Test batched reset/step, batched spaces and auto-reset to the cached initial state."""
+    key = jax.random.PRNGKey(0)
+    num_envs = 3
+    env = VecEnv(jaxatari.make("pong"), num_envs)
+    assert env.auto_reset
+
+    obs, state = env.reset(key)
+    space_shapes = [leaf.shape for leaf in jax.tree.leaves(env.observation_space())]
+    assert [leaf.shape for leaf in jax.tree.leaves(obs)] == space_shapes
+    action = env.action_space().sample(key)
+    assert action.shape == (num_envs,)
+    assert env.action_space().contains(action)
+
+    # put the second environment one point away from the end of the game
+    env_state = state.env_state._replace(player_score=state.env_state.player_score.at[1].set(21))
+    state = state.replace(env_state=env_state)
+    obs, state, reward, done, info = env.step(state, action)
+    assert reward.shape == (num_envs,)
+    assert done.tolist() == [False, True, False]
+    reset_env = jax.tree.map(lambda x: x[1], state.env_state)
+    initial_env = jax.tree.map(lambda x: x[1], state.initial_state)
+    assert jax.tree.all(jax.tree.map(jnp.array_equal, reset_env, initial_env))
+    assert jax.tree.all(jax.tree.map(lambda x, y: jnp.array_equal(x[1], y[1]), obs, state.initial_obs))
+    assert not jnp.array_equal(state.env_state.step_counter[0], state.initial_state.step_counter[0])
+
+    # the cached initial states get fresh PRNG keys on every auto-reset
+    env = VecEnv(jaxatari.make("seaquest"), num_envs)
+    _, state = env.reset(key)
+    rng_keys = {tuple(k) for k in state.initial_state.rng_key.tolist()}
+    for _ in range(3):
+        # a negative number of lives ends the episode of every environment
+        state = state.replace(env_state=state.env_state._replace(lives=jnp.full(num_envs, -1)))
+        _, state, _, done, _ = env.step(state, jnp.zeros(num_envs, dtype=jnp.int32))
+        assert done.all()
+        rng_keys.update(tuple(k) for k in state.env_state.rng_key.tolist())
+    assert len(rng_keys) == 4 * num_envs
+
+    # wrapper stacks with an AtariWrapper reset themselves and are only vectorized, a copy of
+    # the stack gets a reset pool so that its reset is cheap to evaluate on every step
+    atari_env = AtariWrapper(jaxatari.make("pong"))
+    stack = ObjectCentricWrapper(atari_env)
+    env = VecEnv(stack, num_envs, reset_pool_size=4)
+    assert not env.auto_reset
+    assert atari_env._reset_pool is None and atari_env.reset_pool_size == 0
+    assert stack._env is atari_env
+    assert env._env is not stack and env._env._env.reset_pool_size == 4
+    obs, state = env.reset(key)
+    # nothing is cached for stacks that reset themselves
+    assert state.initial_obs is None and state.initial_state is None and state.key is None
+    assert obs.shape == (num_envs,) + env._env.observation_space().shape
+    obs, state, reward, done, info = env.step(state, jnp.zeros(num_envs, dtype=jnp.int32))
+    assert env.observation_space().contains(obs)
+
+def random_policy(params, obs, key):
+    return jax.random.randint(key, (), 0, params)
+
+
+def test_rollout():
+    """Test that rollout matches stepping the environment in a Python loop."""
+    key, policy_key = jax.random.split(jax.random.PRNGKey(0))
+    env = jaxatari.make("pong")
+    num_actions = env.action_space().n
+    obs, state = env.reset(key)
+
+    final_obs, final_state, trajectory = env.rollout(state, random_policy, num_actions, policy_key, 20)
+    assert trajectory.action.shape == (20,)
+    assert trajectory.reward.shape == (20,)
+
+    for t, step_key in enumerate(jax.random.split(policy_key, 20)):
+        action = random_policy(num_actions, obs, step_key)
+        assert jax.tree.all(jax.tree.map(lambda x, y: jnp.array_equal(x[t], y), trajectory.obs, obs))
+        assert trajectory.action[t] == action
+        obs, state, reward, done, info = env.step(state, action)
+        assert trajectory.reward[t] == reward
+        assert trajectory.done[t] == done
+    assert jax.tree.all(jax.tree.map(jnp.array_equal, final_state, state))
+    assert jax.tree.all(jax.tree.map(jnp.array_equal, final_obs, obs))
+
+    # wrappers need the observation and can drop fields
+    env = ObjectCentricWrapper(AtariWrapper(env))
+    obs, state = env.reset(key)
+    with pytest.raises(ValueError):
+        env.rollout(state, random_policy, num_actions, policy_key, 5)
+    _, _, trajectory = env.rollout(state, random_policy, num_actions, policy_key, 5, obs=obs, fields=("reward", "done"))
+    assert trajectory.obs is None and trajectory.info is None
+    assert trajectory.reward.shape == (5,)
+
+    # batched environments roll out all environments at once
+    env = VecEnv(env, 4)
+    obs, state = env.reset(key)
+    batched_policy = jax.vmap(random_policy, in_axes=(None, 0, 0))
+    policy = lambda params, obs, key: batched_policy(params, obs, jax.random.split(key, 4))
+    _, _, trajectory = env.rollout(state, policy, num_actions, policy_key, 5, obs=obs)
+    assert trajectory.obs.shape == (5, 4) + env._env.observation_space().shape
+    assert trajectory.action.shape == (5, 4)
+
+SHARDED_VEC_ENV_SCRIPT = textwrap.dedent("""
+    import jax, jax.numpy as jnp, jaxatari
+    from jaxatari.wrappers import AtariWrapper, ObjectCentricWrapper, VecEnv, ShardedVecEnv
+
+    assert jax.device_count() == 4
+    base_env = ObjectCentricWrapper(AtariWrapper(jaxatari.make("pong")))
+    env, reference = ShardedVecEnv(base_env, 8), VecEnv(base_env, 8)
+    key = jax.random.PRNGKey(0)
+    obs, state = env.reset(key)
+    ref_obs, ref_state = reference.reset(key)
+    assert len(obs.sharding.device_set) == 4
+    action = jnp.arange(8) % 6
+    for _ in range(3):
+        obs, state, reward, done, info = env.step(state, action)
+        ref_obs, ref_state, _, _, _ = reference.step(ref_state, action)
+    assert jnp.array_equal(obs, ref_obs)
+    assert jax.tree.all(jax.tree.map(jnp.array_equal, state, ref_state))
+
+    policy = lambda params, obs, key: jax.random.randint(key, (obs.shape[0],), 0, params)
+    _, _, trajectory = env.rollout(state, policy, 6, key, 10, obs=obs, fields=("action", "reward"))
+    assert trajectory.action.shape == (10, 8)
+    assert len(trajectory.action.sharding.device_set) == 4
+
+    # every device only works on its own environments
+    hlo = ShardedVecEnv.step.lower(env, state, action).compile().as_text()
+    hlo += ShardedVecEnv._sharded_rollout.lower(env, state, policy, 6, key, 10, obs, ("action",)).compile().as_text()
+    for collective in ["all-gather", "all-reduce", "all-to-all", "collective-permute"]:
+        assert collective not in hlo, collective
+""")
+
+
+def test_sharded_vec_env():
+    """Test ShardedVecEnv on simulated CPU devices against the unsharded VecEnv."""
+    # the device count is fixed when jax starts, so the check runs in a fresh interpreter
+    env = dict(os.environ, XLA_FLAGS="--xla_force_host_platform_device_count=4", JAX_PLATFORMS="cpu")
+    result = subprocess.run([sys.executable, "-c", SHARDED_VEC_ENV_SCRIPT], env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+    with pytest.raises(ValueError):
+        ShardedVecEnv(jaxatari.make("pong"), 3, devices=jax.local_devices() * 2)
+
 def test_pixel_and_object_centric_wrapper():
     """Test that PixelAndObjectCentricWrapper returns both pixel and flattened object-centric observations."""
     key = jax.random.PRNGKey(0)
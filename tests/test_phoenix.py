@@ -0,0 +1,168 @@
+import hashlib
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+
+from jaxatari.games.jax_phoenix import JaxPhoenix, PhoenixConstants
+
+
+def level_state(env: JaxPhoenix, level: int):
+    _, state = env.reset(jax.random.PRNGKey(level))
+    formation = (level - 1) % 5
+    return state._replace(
+        level=jnp.array(level),
+        enemies_x=env.consts.ENEMY_POSITIONS_X_LIST[formation](),
+        enemies_y=env.consts.ENEMY_POSITIONS_Y_LIST[formation](),
+    )
+
+
+def test_enemy_step_batched_across_levels():
+    env = JaxPhoenix()
+    states = [level_state(env, level) for level in range(1, 6)]
+    batched = jax.tree.map(lambda *leaves: jnp.stack(leaves), *states)
+    enemy_step = lambda state: env.enemy_step(state, env.random_keys(state)[1])
+    stepped = jax.jit(jax.vmap(enemy_step))(batched)
+
+    for i, state in enumerate(states):
+        expected = jax.jit(enemy_step)(state)
+        for name, leaf in zip(expected._fields, expected):
+            np.testing.assert_array_equal(np.asarray(getattr(stepped, name)[i]), np.asarray(leaf), err_msg=name)
+
+    alive = np.asarray(batched.enemies_x) > -1
+    dx = np.asarray(stepped.enemies_x - batched.enemies_x)
+    # the phoenix formation and the bats fly left at their own speed, the boss only sinks
+    for i, speed in enumerate([0.4, 0.4, 0.5, 0.5, 0.0]):
+        np.testing.assert_allclose(dx[i][alive[i]], -speed, rtol=1e-5)
+    np.testing.assert_array_equal(np.asarray(stepped.bat_y_cooldown[jnp.array([0, 1, 4])]), 0)
+    np.testing.assert_array_equal(np.asarray(stepped.blue_blocks[1:]), np.asarray(batched.blue_blocks[1:]))
+
+
+# sha256 prefixes of the trajectories of GOLDEN_FIELDS, recorded with the separate phoenix_step,
+# bat_step and boss_step that the level table replaced
+GOLDEN_FIELDS = ("player_x", "player_y", "enemies_x", "enemies_y", "projectile_x", "projectile_y",
+                 "enemy_projectile_x", "enemy_projectile_y", "score", "lives", "level", "player_dying")
+GOLDEN_TRAJECTORIES = {
+    1: "c8d55db4fbf407f0",
+    2: "301040e29b5cedcc",
+    3: "95ca93065e922db1",
+    4: "1f1dc97dcc871000",
+    5: "78ac890991bcf5e7",
+}
+
+
+def test_enemy_step_matches_golden_trajectories():
+    env = JaxPhoenix(PhoenixConstants(LEGACY_RNG=True))
+
+    def body(state, action):
+        _, state, _, _, _ = env.step(state, action)
+        return state, tuple(getattr(state, field) for field in GOLDEN_FIELDS)
+
+    run = jax.jit(lambda state, actions: jax.lax.scan(body, state, actions)[1])
+    for level, expected in GOLDEN_TRAJECTORIES.items():
+        actions = jax.random.randint(jax.random.PRNGKey(100 + level), (600,), 0, env.action_space().n)
+        digest = hashlib.sha256()
+        for leaf in run(level_state(env, level), actions):
+            digest.update(np.asarray(leaf).astype(np.float64).tobytes())
+        assert digest.hexdigest()[:16] == expected, f"level {level}"
+
+
+def test_rng_key_decorrelates_batch():
+    def run(env):
+        _, states = jax.vmap(env.reset)(jax.random.split(jax.random.PRNGKey(0), 16))
+
+        def body(states, _):
+            _, states, _, _, _ = jax.vmap(env.step)(states, jnp.zeros(16, dtype=jnp.int32))
+            return states, states.enemy_projectile_y
+
+        return np.asarray(jax.jit(lambda s: jax.lax.scan(body, s, None, length=600)[1])(states))
+
+    shots = run(JaxPhoenix())
+    assert len({shots[:, i].tobytes() for i in range(16)}) > 1
+    # with the legacy randomness every environment fires the same shots
+    legacy_shots = run(JaxPhoenix(PhoenixConstants(LEGACY_RNG=True)))
+    assert all(np.array_equal(legacy_shots[:, i], legacy_shots[:, 0]) for i in range(16))
+
+
+def test_observation_matches_space():
+    env = JaxPhoenix()
+    space = env.observation_space()
+    size = sum(int(np.prod(leaf.shape)) for leaf in jax.tree.leaves(space))
+    for level in range(1, 6):
+        obs = env._get_observation(level_state(env, level))
+        assert space.contains(obs._asdict())
+        assert env.obs_to_flat_array(obs).shape == (size,)
+        # enemies still standing in the formation are reported alive, the boss level reports its shield
+        alive = np.asarray(obs.enemies[:, 2]).astype(bool)
+        np.testing.assert_array_equal(alive, np.asarray(env.consts.ENEMY_POSITIONS_X_LIST[(level - 1) % 5]()) > -1)
+        assert np.all(np.asarray(obs.blue_blocks) == (level % 5 == 0))
+
+
+def boss_state(env: JaxPhoenix, seed: int):
+    """A boss level state with a random part of the blocks destroyed."""
+    state = level_state(env, 5)
+    keys = jax.random.split(jax.random.PRNGKey(seed), 3)
+    return state._replace(
+        step_counter=jnp.array(1),
+        blue_blocks=jax.random.bernoulli(keys[0], 0.7, state.blue_blocks.shape),
+        red_blocks=jax.random.bernoulli(keys[1], 0.7, state.red_blocks.shape),
+        green_blocks=jax.random.bernoulli(keys[2], 0.7, state.green_blocks.shape),
+    )
+
+
+def test_boss_block_lookup_matches_scan():
+    env = JaxPhoenix()
+    state = boss_state(env, 0)
+    xs, ys = np.meshgrid(np.arange(20, 140), np.arange(70, 130))
+    xs, ys = jnp.asarray(xs.ravel(), dtype=jnp.int32), jnp.asarray(ys.ravel(), dtype=jnp.int32)
+    keys = env.random_keys(state)[1]
+    shot = jax.jit(jax.vmap(lambda x, y: env.enemy_step(state._replace(projectile_x=x, projectile_y=y), keys)))(xs, ys)
+
+    for name in ("blue_blocks", "red_blocks", "green_blocks"):
+        positions = np.asarray(getattr(env.consts, name.split("_")[0].upper() + "_BLOCK_POSITIONS"))
+        standing = np.asarray(getattr(state, name))
+        hits = (
+            (np.asarray(xs)[:, None] + env.consts.PROJECTILE_WIDTH > positions[None, :, 0])
+            & (np.asarray(xs)[:, None] < positions[None, :, 0] + env.consts.BLOCK_WIDTH)
+            & (np.asarray(ys)[:, None] + env.consts.PROJECTILE_HEIGHT > positions[None, :, 1])
+            & (np.asarray(ys)[:, None] < positions[None, :, 1] + env.consts.BLOCK_HEIGHT)
+            & standing[None, :]
+        )
+        expected = np.repeat(standing[None, :], len(xs), axis=0)
+        expected[np.nonzero(hits.any(axis=1))[0], hits.argmax(axis=1)[hits.any(axis=1)]] = False
+        np.testing.assert_array_equal(np.asarray(getattr(shot, name)), expected, err_msg=name)
+
+
+def test_shield_render_matches_blocks():
+    import jaxatari.rendering.jax_rendering_utils as jr
+
+    env = JaxPhoenix()
+    renderer = env.renderer
+    state = boss_state(env, 1)
+    raster = jr.create_initial_frame(env.consts.WIDTH, env.consts.HEIGHT)
+    positions = jnp.concatenate([
+        env.consts.BLUE_BLOCK_POSITIONS, env.consts.RED_BLOCK_POSITIONS, env.consts.GREEN_BLOCK_POSITIONS
+    ])
+    ids = jnp.repeat(jnp.arange(3), jnp.array([48, 126, 30]), total_repeat_length=204)
+    standing = jnp.concatenate([state.blue_blocks, state.red_blocks, state.green_blocks])
+    expected = jr.render_many(raster, positions[:, 0], positions[:, 1], ids, renderer.BOSS_BLOCK_ATLAS, False, standing)
+    np.testing.assert_array_equal(np.asarray(renderer.render_shield(raster, state)), np.asarray(expected))
+    # outside the boss level the shield is not drawn
+    hidden = renderer.render_shield(raster, state._replace(level=jnp.array(4)))
+    np.testing.assert_array_equal(np.asarray(hidden), np.asarray(raster))
+
+
+def test_enemy_bank_draws_bat_with_wings():
+    import jaxatari.rendering.jax_rendering_utils as jr
+
+    env = JaxPhoenix()
+    renderer = env.renderer
+    state = level_state(env, 3)
+    empty = state._replace(enemies_x=jnp.full((8,), -1.0))
+    bat = empty._replace(enemies_x=empty.enemies_x.at[0].set(60.0), enemies_y=empty.enemies_y.at[0].set(80.0))
+
+    expected = env.render(empty)
+    expected = jr.blit(expected, 60, 80, renderer.SPRITE_BAT_BLUE_MAIN[0])
+    expected = jr.blit(expected, 60 - env.consts.WING_WIDTH, 82, renderer.SPRITE_BAT_BLUE_LEFT_WING_MIDDLE[0])
+    expected = jr.blit(expected, 60 + env.consts.ENEMY_WIDTH - 1, 82, renderer.SPRITE_BAT_BLUE_RIGHT_WING_MIDDLE[0])
+    np.testing.assert_array_equal(np.asarray(env.render(bat)), np.asarray(expected))
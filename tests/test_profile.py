@@ -0,0 +1,44 @@
+import os
+
+import jax
+import jax.numpy as jnp
+
+import jaxatari
+from jaxatari import profile
+
+
+def test_stage_named_scopes():
+    env = jaxatari.make("pong")
+    _, state = env.reset(jax.random.PRNGKey(0))
+    hlo = jax.jit(env.step).lower(state, jnp.int32(0)).as_text(debug_info=True)
+    for name in ("player_step", "enemy_step", "ball_step", "get_observation"):
+        assert name in hlo
+
+
+def test_stage_costs():
+    env = jaxatari.make("seaquest")
+    # the step is already traced, the stages are still recorded and the trace stays cached
+    _, state = env.reset(jax.random.PRNGKey(1))
+    env.step(state, jnp.int32(0))
+    cache_size = type(env).step._cache_size()
+    costs = profile.stage_costs(env, warmup_steps=5, repeats=1, include_render=False)
+    names = [cost.name for cost in costs]
+    assert names[0] == "step"
+    # nested stages are reported with their path
+    for name in ("player_step", "check_missile_collisions", "spawn_step", "spawn_step/update_enemy_spawns"):
+        assert name in names
+    assert all(cost.seconds > 0 for cost in costs)
+    assert "spawn_step/update_enemy_spawns" in profile.format_stage_costs(costs)
+    # only the copy of the game records, the step of env and its cached trace are unchanged
+    assert not hasattr(env, "_stage_recorder")
+    assert type(env).step._cache_size() == cache_size
+    reference = jaxatari.make("seaquest", cache=False)
+    assert jax.tree.all(jax.tree.map(
+        jnp.array_equal, env.step(state, jnp.int32(0)), reference.step(state, jnp.int32(0))
+    ))
+
+
+def test_trace(tmp_path):
+    env = jaxatari.make("pong")
+    log_dir = profile.trace(env, str(tmp_path / "trace"), num_steps=3, batch_size=2)
+    assert any(files for _, _, files in os.walk(log_dir))
@@ -0,0 +1,278 @@
+import jax
+import jax.numpy as jnp
+import numpy as np
+import pytest
+
+import jaxatari.rendering.jax_rendering_utils as jr
+
+
+def make_sprite(height: int, width: int, seed: int = 0) -> jnp.ndarray:
+    """Random RGBA sprite with transparent, opaque and partially transparent pixels."""
+    rng = np.random.default_rng(seed)
+    rgb = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+    alpha = rng.choice(np.array([0, 255, 128, 37], dtype=np.uint8), size=(height, width, 1))
+    return jnp.asarray(np.concatenate([rgb, alpha], axis=-1))
+
+
+def make_raster(seed: int = 1) -> jnp.ndarray:
+    rng = np.random.default_rng(seed)
+    return jnp.asarray(rng.integers(0, 256, size=(210, 160, 3), dtype=np.uint8))
+
+
+@pytest.mark.parametrize("x, y", [
+    (10, 20),      # fully inside
+    (0, 0),        # top-left corner
+    (-3, -5),      # clipped top-left
+    (155, 205),    # clipped bottom-right
+    (-50, 100),    # fully outside
+    (300, -300),   # fully outside
+])
+@pytest.mark.parametrize("flip_horizontal", [False, True])
+@pytest.mark.parametrize("flip_vertical", [False, True])
+def test_blit_matches_render_at(x, y, flip_horizontal, flip_vertical):
+    raster = make_raster()
+    sprite = make_sprite(8, 11)
+    flip_offset = jnp.array([2, 3])
+
+    expected = jr.render_at(raster, x, y, sprite, flip_horizontal, flip_vertical, flip_offset)
+    actual = jr.blit(raster, x, y, sprite, flip_horizontal, flip_vertical, flip_offset)
+
+    assert actual.dtype == expected.dtype
+    np.testing.assert_array_equal(np.asarray(actual), np.asarray(expected))
+
+
+def test_blit_traced_arguments_under_vmap():
+    raster = make_raster()
+    sprite = make_sprite(5, 4)
+    xs = jnp.array([-2, 0, 40, 157, 80])
+    ys = jnp.array([3, -4, 100, 208, 50])
+    flips = jnp.array([False, True, True, False, True])
+
+    expected = jax.vmap(lambda x, y, f: jr.render_at(raster, x, y, sprite, f, ~f, jnp.array([1, 1])))(xs, ys, flips)
+    actual = jax.vmap(lambda x, y, f: jr.blit(raster, x, y, sprite, f, ~f, jnp.array([1, 1])))(xs, ys, flips)
+
+    np.testing.assert_array_equal(np.asarray(actual), np.asarray(expected))
+
+
+def test_blit_sprite_larger_than_raster():
+    raster = jnp.zeros((6, 6, 3), dtype=jnp.uint8)
+    sprite = make_sprite(9, 9)
+
+    expected = jr.render_at(raster, -1, -2, sprite)
+    actual = jr.blit(raster, -1, -2, sprite)
+
+    np.testing.assert_array_equal(np.asarray(actual), np.asarray(expected))
+
+
+
+def test_render_many_matches_sequential_blit():
+    raster = make_raster()
+    rng = np.random.default_rng(2)
+    atlas = jnp.stack([make_sprite(7, 9, seed=s).at[..., 3].set(
+        jnp.asarray(rng.choice(np.array([0, 255], dtype=np.uint8), size=(7, 9)))) for s in range(3)])
+    num = 16
+    # Overlapping, clipped and fully off-screen entities
+    xs = jnp.asarray(rng.integers(-12, 170, size=num))
+    ys = jnp.asarray(rng.integers(-10, 215, size=num))
+    ids = jnp.asarray(rng.integers(0, 3, size=num))
+    flips = jnp.asarray(rng.integers(0, 2, size=num).astype(bool))
+    active = jnp.asarray(rng.integers(0, 4, size=num) > 0)
+    flip_offsets = jnp.asarray(rng.integers(0, 3, size=(num, 2)))
+    xs = xs.at[1:4].set(xs[0])
+    ys = ys.at[1:4].set(ys[0])
+
+    expected = raster
+    for i in range(num):
+        if bool(active[i]):
+            expected = jr.blit(expected, xs[i], ys[i], atlas[ids[i]], flips[i], False, flip_offsets[i])
+    actual = jr.render_many(raster, xs, ys, ids, atlas, flips, active, flip_offsets=flip_offsets)
+
+    np.testing.assert_array_equal(np.asarray(actual), np.asarray(expected))
+
+
+def test_render_many_under_vmap():
+    atlas = make_sprite(4, 4)[None].at[..., 3].set(255)
+    rasters = jnp.stack([make_raster(seed) for seed in range(3)])
+    xs = jnp.array([[0, 2], [50, 50], [158, -3]])
+    ys = jnp.array([[0, 1], [60, 60], [208, -2]])
+
+    def sequential(raster, x, y):
+        for i in range(x.shape[0]):
+            raster = jr.blit(raster, x[i], y[i], atlas[0])
+        return raster
+
+    expected = jax.vmap(sequential)(rasters, xs, ys)
+    actual = jax.vmap(lambda r, x, y: jr.render_many(r, x, y, jnp.zeros(2, dtype=jnp.int32), atlas, False, True))(
+        rasters, xs, ys
+    )
+
+    np.testing.assert_array_equal(np.asarray(actual), np.asarray(expected))
+
+
+def test_indexed_blit_matches_rgb_blit():
+    rng = np.random.default_rng(4)
+    colors = rng.integers(0, 256, size=(6, 3), dtype=np.uint8)
+    sprite_rgb = colors[rng.integers(0, 6, size=(8, 11))]
+    sprite_alpha = rng.choice(np.array([0, 255], dtype=np.uint8), size=(8, 11, 1))
+    sprite = jnp.asarray(np.concatenate([sprite_rgb, sprite_alpha], axis=-1))
+    background_rgb = colors[rng.integers(0, 6, size=(210, 160))]
+    background = jnp.asarray(np.concatenate([background_rgb, np.full((210, 160, 1), 255, dtype=np.uint8)], axis=-1))
+    palette = jnp.asarray(jr.build_palette([sprite, background]))
+
+    rgb = jr.blit(jr.create_initial_frame(), 0, 0, background)
+    indexed = jr.blit(jr.create_initial_index_frame(), 0, 0, jr.index_sprite(background, palette))
+    for x, y, flip in [(10, 20, False), (-4, 205, True), (155, -3, True)]:
+        rgb = jr.blit(rgb, x, y, sprite, flip, False, jnp.array([2, 0]))
+        indexed = jr.blit(indexed, x, y, jr.index_sprite(sprite, palette), flip, False, jnp.array([2, 0]))
+
+    assert indexed.shape == (210, 160)
+    assert indexed.dtype == jnp.uint8
+    np.testing.assert_array_equal(np.asarray(jr.palette_lookup(indexed, palette)), np.asarray(rgb))
+
+
+def binary_atlas(count: int, height: int, width: int, seed: int = 5) -> jnp.ndarray:
+    rng = np.random.default_rng(seed)
+    return jnp.stack([make_sprite(height, width, seed=seed + s).at[..., 3].set(
+        jnp.asarray(rng.choice(np.array([0, 255], dtype=np.uint8), size=(height, width)))) for s in range(count)])
+
+
+@pytest.mark.parametrize("value", [0, 7, 40, 305, 99999, 123456])
+@pytest.mark.parametrize("spacing", [8, 4])  # 4 is narrower than a digit, the digits overlap
+@pytest.mark.parametrize("hide_leading_zeros, align", [(False, 0.0), (True, 0.0), (True, 0.5), (True, 1.0)])
+def test_render_number_matches_sequential_blit(value, spacing, hide_leading_zeros, align):
+    raster = make_raster()
+    digits = binary_atlas(10, 7, 6)
+    shown = str(min(value, 9999)).zfill(4)
+    if hide_leading_zeros:
+        hidden = len(shown) - len(shown.lstrip("0") or "0")
+        shown = shown[hidden:]
+        x = 150 + hidden * spacing - int(hidden * spacing * align)
+    else:
+        x = 150
+
+    expected = raster
+    for i, digit in enumerate(shown):
+        expected = jr.blit(expected, x + i * spacing, 30, digits[int(digit)])
+    actual = jr.render_number(raster, 150, 30, value, digits, 4, spacing,
+                              hide_leading_zeros=hide_leading_zeros, align=align)
+
+    np.testing.assert_array_equal(np.asarray(actual), np.asarray(expected))
+
+
+def test_render_number_indexed_and_under_vmap():
+    digits = binary_atlas(10, 5, 4)
+    palette = jnp.asarray(jr.build_palette([digits[i] for i in range(10)]))
+    indexed_digits = jr.index_sprite(digits, palette)
+    values = jnp.array([0, 9, 58, 310])
+
+    def sequential(value):
+        raster = jr.create_initial_index_frame()
+        for i, digit in enumerate(str(int(value)).zfill(3)):
+            raster = jr.blit(raster, 20 + i * 5, 5, indexed_digits[int(digit)])
+        return raster
+
+    actual = jax.vmap(lambda v: jr.render_number(jr.create_initial_index_frame(), 20, 5, v, indexed_digits, 3, 5))(values)
+    for value, frame in zip(values, actual):
+        np.testing.assert_array_equal(np.asarray(frame), np.asarray(sequential(value)))
+
+
+@pytest.mark.parametrize("value", [0, 1, 3, 5, 12])
+@pytest.mark.parametrize("align_right", [False, True])
+def test_render_indicator_strip_matches_render_indicator(value, align_right):
+    raster = make_raster()
+    sprite = binary_atlas(1, 5, 3)[0]
+    shown = min(value, 5)
+    x = 40 + (5 - shown) * 4 if align_right else 40
+    expected = jr.render_indicator(raster, x, 20, shown, sprite, spacing=4)
+    actual = jr.render_indicator_strip(raster, 40, 20, value, sprite, 5, 4, align_right=align_right)
+
+    np.testing.assert_array_equal(np.asarray(actual), np.asarray(expected))
+
+
+@pytest.mark.parametrize("game_name", ["pong", "breakout", "freeway", "seaquest", "kangaroo", "phoenix"])
+def test_render_indexed_matches_render(game_name):
+    import jaxatari
+
+    env = jaxatari.make(game_name)
+    key = jax.random.PRNGKey(0)
+    _, state = env.reset(key)
+    step = jax.jit(env.step)
+    for i in range(30):
+        _, state, _, _, _ = step(state, i % env.action_space().n)
+
+    indexed = env.render_indexed(state)
+    assert indexed.shape == (210, 160)
+    assert indexed.dtype == jnp.uint8
+    np.testing.assert_array_equal(
+        np.asarray(jr.palette_lookup(indexed, env.palette())), np.asarray(env.render(state))
+    )
+
+
+@pytest.mark.parametrize("level", [2, 3, 4, 5])
+def test_render_indexed_matches_render_phoenix_levels(level):
+    """Bats and the boss shield only appear in later Phoenix levels."""
+    import jaxatari
+
+    env = jaxatari.make("phoenix")
+    _, state = env.reset(jax.random.PRNGKey(level))
+    state = state._replace(level=jnp.asarray(level, dtype=state.level.dtype))
+    step = jax.jit(env.step)
+    for i in range(30):
+        _, state, _, _, _ = step(state, i % env.action_space().n)
+
+    np.testing.assert_array_equal(
+        np.asarray(jr.palette_lookup(env.render_indexed(state), env.palette())), np.asarray(env.render(state))
+    )
+
+
+def test_render_indexed_requires_native_mode():
+    from jaxatari.renderers import JAXGameRenderer
+
+    renderer = JAXGameRenderer()
+    with pytest.raises(NotImplementedError):
+        renderer.render_indexed(None)
+    with pytest.raises(NotImplementedError):
+        renderer.palette
+
+
+def test_sprite_atlas_round_trip(tmp_path):
+    from jaxatari.rendering import sprite_atlas
+
+    game_dir = tmp_path / "sprites" / "game"
+    (game_dir / "digits").mkdir(parents=True)
+    sprites = {"player": make_sprite(5, 7), "digits/0": make_sprite(3, 2, seed=1), "digits/1": make_sprite(4, 4, seed=2)}
+    for name, sprite in sprites.items():
+        np.save(game_dir / f"{name}.npy", np.asarray(sprite))
+    np.save(game_dir / "extra.npy", np.asarray(make_sprite(2, 2, seed=3)))
+
+    sprite_atlas.build_atlas(str(game_dir))
+    (game_dir / "extra.npy").unlink()
+    np.save(game_dir / "new.npy", np.asarray(make_sprite(6, 1, seed=4)))
+
+    atlas = sprite_atlas.SpriteAtlas(str(game_dir / sprite_atlas.ATLAS_FILENAME))
+    assert sorted(atlas.index) == ["digits/0", "digits/1", "extra", "player"]
+    for name, sprite in sprites.items():
+        np.testing.assert_array_equal(atlas[name], np.asarray(sprite))
+        np.testing.assert_array_equal(np.asarray(jr.loadFrame(str(game_dir / f"{name}.npy"))), np.asarray(sprite))
+    # sprites only in the atlas are read from it, sprites missing from it from their file
+    assert jr.loadFrame(str(game_dir / "extra.npy")).shape == (2, 2, 4)
+    assert jr.loadFrame(str(game_dir / "new.npy")).shape == (6, 1, 4)
+
+
+def test_shipped_sprite_atlases_are_up_to_date():
+    """The atlases must be rebuilt with scripts/build_sprite_atlas.py whenever sprites change."""
+    import os
+    from jaxatari.rendering import sprite_atlas
+
+    sprites_dir = os.path.join(os.path.dirname(jr.__file__), "..", "games", "sprites")
+    for game in os.listdir(sprites_dir):
+        game_dir = os.path.join(sprites_dir, game)
+        atlas = sprite_atlas.SpriteAtlas(os.path.join(game_dir, sprite_atlas.ATLAS_FILENAME))
+        names = set()
+        for root, _, files in os.walk(game_dir):
+            for file in files:
+                if file.endswith(".npy"):
+                    name = os.path.relpath(os.path.join(root, file), game_dir)[:-4].replace(os.sep, "/")
+                    names.add(name)
+                    np.testing.assert_array_equal(atlas[name], np.load(os.path.join(root, file)), err_msg=name)
+        assert names == set(atlas.index), game
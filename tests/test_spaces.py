@@ -142,5 +142,24 @@ def test_tuple_space():
     assert not space.contains((pixel_obs,))
 
 
+def test_batch_space():
+    """Tests that batch_space adds a leading dimension and turns Discrete spaces into integer Boxes."""
+    key = jax.random.PRNGKey(0)
+    action_space = spaces.batch_space(spaces.Discrete(6), 8)
+    assert isinstance(action_space, spaces.Box)
+    assert action_space.shape == (8,)
+    sample = action_space.sample(key)
+    assert sample.dtype == jnp.int32
+    assert action_space.contains(sample)
+    assert not action_space.contains(sample.at[0].set(6))
+
+    tuple_space = spaces.batch_space(
+        spaces.Tuple([spaces.Box(0, 255, (4, 2), jnp.uint8), spaces.Box(-1.0, 1.0, (3,))]), 8
+    )
+    assert tuple_space.spaces[0].shape == (8, 4, 2)
+    assert tuple_space.spaces[1].shape == (8, 3)
+    assert tuple_space.contains(tuple_space.sample(key))
+
+
 if __name__ == "__main__":
     pytest.main([__file__]) 
\ No newline at end of file